@@ -1,14 +1,21 @@
-from flask import Flask
-from .config import Config
-from .extensions import db, login_manager
 import os
 
-def create_app():
+from flask import Flask
+from .config import config_for
+from .extensions import db, login_manager, migrate
+
+def create_app(config_class=None):
     app = Flask(__name__)
-    app.config.from_object(Config)
+    app.config.from_object(config_class or config_for())
+
+    from .services import database
+    if app.config.get('SQLALCHEMY_ENGINE_OPTIONS') is None:
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = database.engine_options(app.config)
 
     # Initialize extensions
     db.init_app(app)
+    migrate.init_app(app, db, directory=os.path.join(os.path.dirname(app.root_path), 'migrations'))
+    database.init_app(app)
     login_manager.init_app(app)
     login_manager.login_view = 'auth.login'
     login_manager.login_message_category = 'info'
@@ -23,6 +30,9 @@ def create_app():
     from .routes.report_routes import report_bp
     from .routes.dashboard_routes import dashboard_bp
     from .routes.attendance_routes import attendance_bp
+    from .routes.api_routes import api_bp
+    from .routes.metrics_routes import metrics_bp
+    from .routes.asset_routes import assets_bp
 
     # Register blueprints
     app.register_blueprint(auth_bp)
@@ -34,20 +44,35 @@ def create_app():
     app.register_blueprint(report_bp)
     app.register_blueprint(dashboard_bp)
     app.register_blueprint(attendance_bp)
+    app.register_blueprint(api_bp)
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(assets_bp)
+
+    from .services import metrics
+    metrics.init_app(app)
 
-    # Tables aur default admin sirf development mein banao
-    # Production mein yeh skip ho jayega (flask-migrate use karo)
-    if os.getenv('FLASK_ENV') == 'development':
+    from .services import assets
+    assets.init_app(app)
+
+    from .services import jobs
+    jobs.init_app(app)
+
+    from .commands import register_commands
+    register_commands(app)
+
+    # Migrations aur default admin sirf local profile mein startup pe (AUTO_CREATE_TABLES);
+    # production mein yeh nahi chalta, deploy pe `flask init-db` chalao
+    if app.config.get('AUTO_CREATE_TABLES'):
+        from .commands import upgrade_database
         with app.app_context():
-            db.create_all()
-            # Default admin user
-            from .models.user import User, Role
-            from werkzeug.security import generate_password_hash
-
-            if not User.query.filter_by(username='admin').first():
-                admin = User(username='admin', role=Role.ADMIN)
-                admin.set_password('admin123')
-                db.session.add(admin)
-                db.session.commit()
+            upgrade_database()
+
+    if app.config.get('TEMPLATE_CACHE_DIR'):
+        from .services.warmup import use_template_cache
+        use_template_cache(app, app.config['TEMPLATE_CACHE_DIR'])
+
+    if app.config.get('WARMUP_ON_START'):
+        from .services.warmup import warm_up
+        warm_up(app)
 
     return app
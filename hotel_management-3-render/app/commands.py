@@ -0,0 +1,150 @@
+import signal
+import threading
+from datetime import datetime, timedelta
+
+import click
+import flask_migrate
+from sqlalchemy import inspect
+
+from .extensions import db
+from .models.billing import Bill
+from .services import daily_sales, invoices, jobs, seed as seeding
+from .services.date_window import DateWindow, local_today
+
+
+# Purane create_all wale database (alembic_version table nahi) is revision pe the
+BASELINE_REVISION = '0001'
+
+
+def upgrade_database():
+    """Run the migrations up to head, plus the default admin (admin / admin123) if it doesn't exist.
+
+    A database made by the old ``db.create_all()`` (tables but no
+    alembic_version) is stamped as the baseline revision first.
+    """
+    from .models.user import Role, User
+
+    tables = set(inspect(db.engine).get_table_names())
+    if tables and 'alembic_version' not in tables:
+        flask_migrate.stamp(revision=BASELINE_REVISION)
+    flask_migrate.upgrade()
+    if not User.query.filter_by(username='admin').first():
+        admin = User(username='admin', role=Role.ADMIN)
+        admin.set_password('admin123')
+        db.session.add(admin)
+        db.session.commit()
+        return True
+    return False
+
+
+def _date(value):
+    return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+
+
+def register_commands(app):
+
+    @app.cli.command('init-db')
+    def init_db():
+        """Migrate the schema to the latest revision and create the default admin user."""
+        created = upgrade_database()
+        click.echo('Schema up to date' + (', admin user created' if created else ''))
+
+
+    @app.cli.command('compile-templates')
+    def compile_templates():
+        """Compile every template into TEMPLATE_CACHE_DIR (run in the build step)."""
+        from .services import warmup
+        if not app.config.get('TEMPLATE_CACHE_DIR'):
+            raise click.ClickException('Set TEMPLATE_CACHE_DIR first')
+        click.echo(f"{warmup.compile_templates(app)} templates compiled into {app.config['TEMPLATE_CACHE_DIR']}")
+
+
+    @app.cli.command('build-assets')
+    def build_assets():
+        """Write .gz / .br copies of the static CSS and JS (run in the build step)."""
+        from .services import assets
+        files, before, after = assets.build(app.static_folder)
+        click.echo(f'{files} assets compressed: {before / 1024:.0f} KB -> {after / 1024:.0f} KB'
+                   + ('' if assets.brotli else ' (gzip only, install brotli for .br)'))
+
+
+    @app.cli.command('worker')
+    @click.option('--threads', type=int, default=1, show_default=True, help='Jobs run at the same time')
+    @click.option('--burst', is_flag=True, help='Exit once the queue is empty (cron / one-off)')
+    def worker(threads, burst):
+        """Run background jobs from the job table until stopped."""
+        runner = jobs.Worker(app, threads)
+        if burst:
+            done = 0
+            while runner.run_once(f'{runner.name}:burst'):
+                done += 1
+            click.echo(f'{done} jobs run, queue empty')
+            return
+        click.echo(f'Worker {runner.name}: {threads} thread(s), tasks: {", ".join(sorted(jobs.TASKS))}')
+        # SIGTERM (deploy / platform restart) aur Ctrl-C: chal rahi jobs poori karke band
+        stopping = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: stopping.set())
+        runner.start()
+        try:
+            while not stopping.wait(1):
+                pass
+        except KeyboardInterrupt:
+            pass
+        click.echo('Stopping: waiting for running jobs ...')
+        runner.stop()
+
+
+    @app.cli.command('rebuild-daily-sales')
+    @click.option('--start', help='YYYY-MM-DD (default: 365 days back)')
+    @click.option('--end', help='YYYY-MM-DD (default: today)')
+    def rebuild_daily_sales(start, end):
+        """Recompute the daily sales rollup from orders and bills."""
+        end_date = _date(end) or local_today()
+        start_date = _date(start) or end_date - timedelta(days=365)
+        written = daily_sales.rebuild(start_date, end_date)
+        click.echo(f'Daily sales rebuilt for {start_date} .. {end_date}: {written} days with sales')
+
+
+    @app.cli.command('export-invoices')
+    @click.option('--start', help='YYYY-MM-DD (default: first day of this month)')
+    @click.option('--end', help='YYYY-MM-DD (default: today)')
+    @click.option('--out', default=None, help='Zip file to write (default: invoices_<range>.zip)')
+    @click.option('--workers', type=int, default=None, help='Render processes (default: CPU count)')
+    def export_invoices(start, end, out, workers):
+        """Render every bill in a date range into one zip of invoice PDFs."""
+        end_date = _date(end) or local_today()
+        start_date = _date(start) or end_date.replace(day=1)
+        window = DateWindow(start_date, end_date)
+        bills = Bill.query.filter(window.filter(Bill.generated_at)).order_by(Bill.generated_at, Bill.id).all()
+        paths, rendered = invoices.render_batch(bills, workers=workers)
+        out = out or f'invoices_{start_date}_{end_date}.zip'
+        with open(out, 'wb') as f:
+            invoices.write_zip(paths, f)
+        click.echo(f'{len(paths)} invoices ({rendered} rendered, {len(paths) - rendered} cached) -> {out}')
+
+
+    @app.cli.command('seed')
+    @click.option('--days', default=365, show_default=True, help='Days of orders, ending today')
+    @click.option('--orders-per-day', default=120, show_default=True, help='Average orders per weekday')
+    @click.option('--menu-items', default=40, show_default=True)
+    @click.option('--employees', default=15, show_default=True)
+    @click.option('--inventory-items', default=12, show_default=True)
+    @click.option('--password', default='seed123', show_default=True,
+                  help='Password for the admin/manager/chef/waiter/cashier logins')
+    @click.option('--seed', 'random_seed', default=42, show_default=True, help='Same seed -> same data')
+    @click.option('--reset', is_flag=True, help='Drop and recreate every table first')
+    @click.option('--yes', is_flag=True, help="Don't ask before --reset")
+    def seed(days, orders_per_day, menu_items, employees, inventory_items, password, random_seed, reset, yes):
+        """Fill a local database with a synthetic restaurant (for testing and benchmarks)."""
+        if reset:
+            if not yes:
+                click.confirm(f'Drop ALL tables in {db.engine.url.render_as_string()} and reseed?', abort=True)
+            db.drop_all()
+            db.create_all()
+        elif not seeding.is_empty():
+            raise click.ClickException('Database already has orders; use --reset to start from scratch')
+
+        counts = seeding.seed(days=days, orders_per_day=orders_per_day, menu_items=menu_items,
+                              employees=employees, inventory_items=inventory_items, password=password,
+                              random_seed=random_seed, progress=click.echo)
+        click.echo(', '.join(f'{name}={count}' for name, count in counts.items()))
@@ -1,18 +1,161 @@
 import os
 
+def _database_url(default=None):
+    url = os.getenv("DATABASE_URL", default)
+    if url and url.startswith("postgres://"):
+        url = url.replace("postgres://", "postgresql://", 1)
+    return url
+
+
 class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
-
-    if SQLALCHEMY_DATABASE_URI and SQLALCHEMY_DATABASE_URI.startswith("postgres://"):
-        SQLALCHEMY_DATABASE_URI = SQLALCHEMY_DATABASE_URI.replace("postgres://", "postgresql://", 1)
-    
-    SQLALCHEMY_ENGINE_OPTIONS = {
-        "pool_pre_ping": True,          
-        "pool_recycle": 300,            
-        "pool_size": 5,
-        "max_overflow": 10,
-        "connect_args": {"sslmode": "require"}  
-    }
+    SQLALCHEMY_DATABASE_URI = _database_url()
+
+    # None = services/database.engine_options() DB_* settings se banata hai
+    SQLALCHEMY_ENGINE_OPTIONS = None
+
+    # Pool sizing: har gunicorn worker process ka apna pool hota hai, aur sab
+    # workers milke DB_MAX_CONNECTIONS (minus reserved) se upar nahi jaane chahiye
+    WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY', 1))          # gunicorn workers
+    GUNICORN_THREADS = int(os.getenv('GUNICORN_THREADS', 1))        # threads per worker
+    DB_MAX_CONNECTIONS = int(os.getenv('DB_MAX_CONNECTIONS', 20))   # server / plan limit
+    DB_RESERVED_CONNECTIONS = int(os.getenv('DB_RESERVED_CONNECTIONS', 3))  # psql, cron, migrations
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 0)) or None        # set karo to formula override
+    DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', 10))  # seconds (engine_from_config int() karta hai)
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 300))
+    DB_POOL_SLOW_CHECKOUT = float(os.getenv('DB_POOL_SLOW_CHECKOUT', 0.5))  # isse zyada wait = warning
+    DB_SSLMODE = os.getenv('DB_SSLMODE')
+    # Server-side limits (PostgreSQL), milliseconds; 0 = off
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 0))
+    DB_IDLE_IN_TRANSACTION_TIMEOUT_MS = int(os.getenv('DB_IDLE_IN_TRANSACTION_TIMEOUT_MS', 0))
+    # SQLite file DBs: WAL journal + tuned pragmas (dev / benchmarks)
+    SQLITE_WAL = os.getenv('SQLITE_WAL', '1') != '0'
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000))
+
+    # Startup: migrations (flask db upgrade) + default admin sirf local mein (production: `flask init-db`).
+    # WARMUP_ON_START: worker traffic lene se pehle pool connections, templates aur
+    # menu catalog garam kar leta hai (gunicorn --preload ke saath mat use karo)
+    AUTO_CREATE_TABLES = os.getenv('AUTO_CREATE_TABLES', '0') == '1'
+    WARMUP_ON_START = os.getenv('WARMUP_ON_START', '0') == '1'
+    WARMUP_CONNECTIONS = int(os.getenv('WARMUP_CONNECTIONS', 0)) or None  # default: pool_size
+    # Compiled Jinja templates on disk (build step mein `flask compile-templates`)
+    TEMPLATE_CACHE_DIR = os.getenv('TEMPLATE_CACHE_DIR')
+    # /assets/<name>.<hash>.<ext>: hash match pe itne seconds ka immutable cache (1 saal)
+    ASSET_MAX_AGE = int(os.getenv('ASSET_MAX_AGE', 31536000))
+    # Conditional GET (invoices, menu): ETag mein release bhi hai; set nahi to templates/static
+    # files ke mtime se banta hai. Shared till / tablet wale roles har view pe revalidate karte hain,
+    # baaki invoices HTTP_CACHE_MAX_AGE seconds tak bina pooche browser cache se dikha sakte hain
+    RELEASE_ID = os.getenv('RELEASE_ID') or os.getenv('RENDER_GIT_COMMIT')
+    HTTP_CACHE_MAX_AGE = int(os.getenv('HTTP_CACHE_MAX_AGE', 300))
+    HTTP_CACHE_SHARED_ROLES = tuple(
+        role.strip() for role in os.getenv('HTTP_CACHE_SHARED_ROLES', 'Cashier,Waiter').split(',') if role.strip()
+    )
 
     SECRET_KEY = os.getenv('SECRET_KEY') or 'fallback-secret-key-for-testing'
+
+    # Din ki boundary (date filters, dashboards) restaurant ke local time se
+    RESTAURANT_TIMEZONE = os.getenv('RESTAURANT_TIMEZONE', 'Asia/Kolkata')
+
+    # Orders / bills / expenses lists: rows per page (?per_page= se override)
+    LIST_PAGE_SIZE = int(os.getenv('LIST_PAGE_SIZE', 50))
+    DASHBOARD_RECENT_ORDERS = int(os.getenv('DASHBOARD_RECENT_ORDERS', 10))
+    # /api/orders?updated_since: cursor se itne seconds peeche tak dobara bhejo (late commits)
+    API_SYNC_OVERLAP_SECONDS = int(os.getenv('API_SYNC_OVERLAP_SECONDS', 30))
+
+    # Rendered invoice PDFs (default: <instance>/invoices); flask export-invoices ka render pool size
+    INVOICE_CACHE_DIR = os.getenv('INVOICE_CACHE_DIR')
+    INVOICE_WORKERS = int(os.getenv('INVOICE_WORKERS', 0)) or None
+
+    # Logged-in user identity cache (per worker); TTL 0 = har request pe DB se
+    USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', 300))
+    USER_CACHE_CHECK_SECONDS = int(os.getenv('USER_CACHE_CHECK_SECONDS', 5))
+    USER_CACHE_SIZE = int(os.getenv('USER_CACHE_SIZE', 1024))
+
+    # Password hashing policy; purane params wale hashes next login pe upgrade
+    PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'scrypt')
+    PASSWORD_SALT_LENGTH = int(os.getenv('PASSWORD_SALT_LENGTH', 16))
+    # Ek saath kitne hashes (baaki wait / busy), aur per-username attempts per minute
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_QUEUE = int(os.getenv('PASSWORD_HASH_QUEUE', 8))
+    PASSWORD_HASH_WAIT = float(os.getenv('PASSWORD_HASH_WAIT', 2))
+    PASSWORD_ATTEMPTS_PER_MINUTE = int(os.getenv('PASSWORD_ATTEMPTS_PER_MINUTE', 5))
+
+    # /metrics (Prometheus). METRICS_DIR set karo to saare gunicorn workers ka total;
+    # scrape ke liye "Authorization: Bearer <METRICS_TOKEN>" chahiye; token set na ho to /metrics
+    # band (404) rehta hai, sirf local profile mein bina token khula (METRICS_REQUIRE_TOKEN)
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', '1') != '0'
+    METRICS_DIR = os.getenv('METRICS_DIR')
+    METRICS_FLUSH_SECONDS = float(os.getenv('METRICS_FLUSH_SECONDS', 5))
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+    METRICS_REQUIRE_TOKEN = True
+    # Ek request mein same statement itni baar chale to N+1 warning (0 = off)
+    METRICS_REPEAT_THRESHOLD = int(os.getenv('METRICS_REPEAT_THRESHOLD', 10))
+
+    # Orders list ka live feed (SSE, services/order_events). Har khula tab ek worker thread
+    # rokta hai: sirf threaded gunicorn (-k gthread --threads N) ke saath on karo
+    ORDER_EVENTS_ENABLED = os.getenv('ORDER_EVENTS_ENABLED', '0') == '1'
+    ORDER_EVENTS_BACKEND = os.getenv('ORDER_EVENTS_BACKEND')  # default: DatabaseBackend
+    ORDER_EVENTS_STREAM_SECONDS = int(os.getenv('ORDER_EVENTS_STREAM_SECONDS', 300))  # phir browser reconnect
+    ORDER_EVENTS_POLL_SECONDS = float(os.getenv('ORDER_EVENTS_POLL_SECONDS', 1))
+    ORDER_EVENTS_OVERLAP_SECONDS = int(os.getenv('ORDER_EVENTS_OVERLAP_SECONDS', 10))
+    ORDER_EVENTS_KEEP_SECONDS = int(os.getenv('ORDER_EVENTS_KEEP_SECONDS', 3600))
+
+    # Background jobs (services/jobs): production mein alag `flask worker` service chalao.
+    # JOB_WORKER_THREADS > 0 = har web process mein itne worker threads bhi (pehli request pe start)
+    JOB_WORKER_THREADS = int(os.getenv('JOB_WORKER_THREADS', 0))
+    JOB_POLL_SECONDS = float(os.getenv('JOB_POLL_SECONDS', 2))
+    JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 5))
+    JOB_RETRY_BASE_SECONDS = float(os.getenv('JOB_RETRY_BASE_SECONDS', 5))   # 5s, 10s, 20s, ...
+    JOB_RETRY_MAX_SECONDS = float(os.getenv('JOB_RETRY_MAX_SECONDS', 3600))
+    JOB_TIMEOUT_SECONDS = int(os.getenv('JOB_TIMEOUT_SECONDS', 600))  # running itni der = worker mar gaya
+    JOB_RETENTION_HOURS = int(os.getenv('JOB_RETENTION_HOURS', 24))  # done jobs kab tak rakhne hain
+
+
+class ProductionConfig(Config):
+    DB_SSLMODE = os.getenv('DB_SSLMODE', 'require')
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 15000))
+    DB_IDLE_IN_TRANSACTION_TIMEOUT_MS = int(os.getenv('DB_IDLE_IN_TRANSACTION_TIMEOUT_MS', 60000))
+
+
+class StagingConfig(ProductionConfig):
+    # Staging DB chhota plan hai; slow checkouts jaldi dikhne chahiye
+    DB_MAX_CONNECTIONS = int(os.getenv('DB_MAX_CONNECTIONS', 10))
+    DB_POOL_SLOW_CHECKOUT = float(os.getenv('DB_POOL_SLOW_CHECKOUT', 0.2))
+
+
+class LocalConfig(Config):
+    # DATABASE_URL na ho to instance/hotel.db (SQLite, WAL)
+    SQLALCHEMY_DATABASE_URI = _database_url('sqlite:///hotel.db')
+    AUTO_CREATE_TABLES = os.getenv('AUTO_CREATE_TABLES', '1') != '0'
+    ORDER_EVENTS_ENABLED = os.getenv('ORDER_EVENTS_ENABLED', '1') == '1'  # flask run threaded hai
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 30000))
+    METRICS_REQUIRE_TOKEN = False
+    JOB_WORKER_THREADS = int(os.getenv('JOB_WORKER_THREADS', 1))  # `flask run` akela kaafi ho
+
+
+class TestConfig(LocalConfig):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = os.getenv('TEST_DATABASE_URL', 'sqlite://')
+    USER_CACHE_TTL = 0
+    METRICS_ENABLED = False
+    JOB_WORKER_THREADS = 0
+
+
+PROFILES = {
+    'production': ProductionConfig,
+    'staging': StagingConfig,
+    'local': LocalConfig,
+    'test': TestConfig,
+}
+
+
+def config_for(name=None):
+    """Config class for APP_ENV (production / staging / local / test).
+
+    Purane setups ke liye FLASK_ENV=development ko local maana jata hai.
+    """
+    name = name or os.getenv('APP_ENV') or ('local' if os.getenv('FLASK_ENV') == 'development' else 'production')
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise RuntimeError(f'Unknown APP_ENV {name!r}; use one of {", ".join(PROFILES)}') from None
@@ -1,5 +1,8 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
+from flask_migrate import Migrate
 
 db = SQLAlchemy()
-login_manager = LoginManager()
\ No newline at end of file
+login_manager = LoginManager()
+# Schema changes migrations/ mein (Alembic); SQLite pe ALTER ke liye batch mode
+migrate = Migrate(render_as_batch=True)
\ No newline at end of file
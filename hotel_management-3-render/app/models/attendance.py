@@ -12,3 +12,8 @@ class Attendance(db.Model):
     date = db.Column(db.Date, nullable=False)
     status = db.Column(db.Enum(AttendanceStatus), nullable=False)
 
+    # Ek employee ki ek din mein ek hi entry; month-wise queries bhi isi index se
+    __table_args__ = (
+        db.Index('ix_attendance_employee_date', 'employee_id', 'date', unique=True),
+    )
+
@@ -10,13 +10,16 @@ class PaymentMode:
 class Bill(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     order_id = db.Column(db.Integer, db.ForeignKey('order.id'), nullable=False, unique=True)
-    total_items = db.Column(db.Float, nullable=False)
-    gst = db.Column(db.Float, nullable=False)
-    service_charge = db.Column(db.Float, nullable=False)
-    grand_total = db.Column(db.Float, nullable=False)
-    generated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    total_items = db.Column(db.Numeric(10, 2), nullable=False)
+    gst = db.Column(db.Numeric(10, 2), nullable=False)
+    service_charge = db.Column(db.Numeric(10, 2), nullable=False)
+    grand_total = db.Column(db.Numeric(10, 2), nullable=False)
+    generated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), index=True)
 
     # NEW: Payment Mode
     payment_mode = db.Column(db.String(20), nullable=False)  # 'Cash' or 'Online'
 
+    # Pay button ka token: double-click / retry wahi bill wapas deta hai
+    idempotency_key = db.Column(db.String(64), unique=True, nullable=True)
+
     order = db.relationship('Order', backref=db.backref('bill', uselist=False))
\ No newline at end of file
@@ -0,0 +1,33 @@
+from ..extensions import db
+
+
+class CacheVersion(db.Model):
+    # Har gunicorn worker apna in-process cache rakhta hai; yeh counter DB mein
+    # hai taaki ek worker ka write baaki sab workers ke cache ko invalid kar de
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    @classmethod
+    def current(cls, name):
+        return db.session.execute(
+            db.select(cls.version).where(cls.name == name)
+        ).scalar() or 0
+
+    @classmethod
+    def bump(cls, name):
+        """Increment ``name`` in the caller's transaction (commit karna caller ka kaam)."""
+        result = db.session.execute(
+            db.update(cls).where(cls.name == name).values(version=cls.version + 1)
+        )
+        if not result.rowcount:
+            db.session.add(cls(name=name, version=1))
+
+    @classmethod
+    def bump_on(cls, connection, name):
+        """Same as bump, on a raw connection (for mapper events, jahan session flush ke beech mein hai)."""
+        table = cls.__table__
+        result = connection.execute(
+            table.update().where(table.c.name == name).values(version=table.c.version + 1)
+        )
+        if not result.rowcount:
+            connection.execute(table.insert().values(name=name, version=1))
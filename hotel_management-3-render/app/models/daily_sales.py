@@ -0,0 +1,12 @@
+from ..extensions import db
+
+
+class DailySales(db.Model):
+    # Ek row per business day (restaurant timezone); dashboards isi se padhte hain.
+    # Order/settlement ke transaction mein update hota hai, `flask rebuild-daily-sales` se repair
+    day = db.Column(db.Date, primary_key=True)
+    order_count = db.Column(db.Integer, nullable=False, default=0)
+    bill_count = db.Column(db.Integer, nullable=False, default=0)
+    cash_revenue = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+    online_revenue = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+    total_revenue = db.Column(db.Numeric(12, 2), nullable=False, default=0)
@@ -18,7 +18,7 @@ class Employee(db.Model):
     phone = db.Column(db.String(15))
     address = db.Column(db.Text)
     aadhaar_no = db.Column(db.String(12), unique=True)  # NEW: Aadhaar Number
-    salary = db.Column(db.Float, nullable=False)
+    salary = db.Column(db.Numeric(10, 2), nullable=False)
     role = db.Column(db.Enum(EmployeeRole), nullable=False)
     hire_date = db.Column(db.Date, nullable=False)
     resign_date = db.Column(db.Date, nullable=True)  # ← Fixed here
@@ -8,7 +8,7 @@ class TransactionType:
 class FinanceTransaction(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     type = db.Column(db.String(20), nullable=False)  # 'Inflow' or 'Outflow'
-    amount = db.Column(db.Float, nullable=False)
+    amount = db.Column(db.Numeric(10, 2), nullable=False)
     description = db.Column(db.String(200))
-    date = db.Column(db.DateTime, default=datetime.utcnow)
+    date = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     bill_id = db.Column(db.Integer, db.ForeignKey('bill.id'))  # Link to bill if inflow
\ No newline at end of file
@@ -22,7 +22,11 @@ class Inventory(db.Model):
     item_id = db.Column(db.Integer, primary_key=True)
     item_name = db.Column(db.String(255), nullable=False)
     category = db.Column(db.Enum(InventoryCategory), nullable=False)
-    quantity_with_unit = db.Column(db.String(50), nullable=False)
+    quantity_with_unit = db.Column(db.String(50), nullable=False)  # display only, e.g. "12.5 kg"
+    # Current balance (services/stock): numeric stock in normalized unit + total spend
+    quantity = db.Column(db.Numeric(12, 3), nullable=False, default=0)
+    unit = db.Column(db.String(10), nullable=False, default='pcs')
+    total_spent = db.Column(db.Numeric(12, 2), nullable=False, default=0)
     status = db.Column(db.Enum(InventoryStatus), nullable=False, default=InventoryStatus.UNUSED)
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
 
@@ -32,6 +36,16 @@ class Expense(db.Model):
     expense_id = db.Column(db.Integer, primary_key=True)
     item_id = db.Column(db.Integer, db.ForeignKey('inventory.item_id'), nullable=False)
     added_quantity_with_unit = db.Column(db.String(50), nullable=False)
+    quantity = db.Column(db.Numeric(12, 3), nullable=False, default=0)
+    unit = db.Column(db.String(10), nullable=False, default='pcs')
     payment_amount = db.Column(db.Numeric(10, 2), nullable=False)
     payment_mode = db.Column(db.Enum(PaymentMode), nullable=False, default=PaymentMode.CASH)
-    date = db.Column(db.DateTime, default=db.func.current_timestamp())
\ No newline at end of file
+    date = db.Column(db.DateTime, default=db.func.current_timestamp(), index=True)
+    # Ledger: item ka running balance is entry ke baad
+    balance_quantity = db.Column(db.Numeric(12, 3), nullable=False, default=0)
+    balance_spent = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+
+    # Per-item history / latest entry / totals (services/stock.item_summaries)
+    __table_args__ = (
+        db.Index('ix_expense_item_date', 'item_id', 'date'),
+    )
\ No newline at end of file
@@ -0,0 +1,34 @@
+from ..extensions import db
+from datetime import datetime
+
+
+class JobStatus:
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+
+
+class Job(db.Model):
+    # Background kaam ki durable queue (services/jobs); worker restart ho to bhi job DB mein bachi rehti hai
+    id = db.Column(db.Integer, primary_key=True)
+    task = db.Column(db.String(100), nullable=False)
+    payload = db.Column(db.JSON, nullable=False, default=dict)
+    status = db.Column(db.String(20), nullable=False, default=JobStatus.QUEUED)
+
+    # Same key wali job queue mein ho to dobara enqueue nahi hoti; job khatam hone pe key hat jaati hai
+    dedupe_key = db.Column(db.String(200), unique=True, nullable=True)
+
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    enqueued_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    locked_by = db.Column(db.String(100), nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+
+    __table_args__ = (
+        # Worker ka poll: status='queued' AND run_at <= now ORDER BY run_at
+        db.Index('ix_job_status_run_at', 'status', 'run_at'),
+    )
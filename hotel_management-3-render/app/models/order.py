@@ -15,9 +15,11 @@ class Order(db.Model):
     table_number = db.Column(db.String(10))
     customer_name = db.Column(db.String(100))
     status = db.Column(db.String(20), default=OrderStatus.PENDING)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    total_amount = db.Column(db.Float, default=0.0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    total_amount = db.Column(db.Numeric(10, 2), default=0)
     edit_count = db.Column(db.Integer, default=0)
+    # Har change pe update hota hai; API ke ETag / updated_since isi se chalte hain
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     # NEW: Payment Status
     is_paid = db.Column(db.Boolean, default=False)
@@ -30,7 +32,7 @@ class OrderItem(db.Model):
     order_id = db.Column(db.Integer, db.ForeignKey('order.id'), nullable=False)
     menu_item_id = db.Column(db.Integer, db.ForeignKey('menu_item.id'), nullable=False)
     quantity = db.Column(db.Integer, nullable=False)
-    price_at_time = db.Column(db.Float, nullable=False)
+    price_at_time = db.Column(db.Numeric(10, 2), nullable=False)
     added_after_edit = db.Column(db.Integer, default=0)  # 0 for original, n for added during nth edit
 
     menu_item = db.relationship('MenuItem')
\ No newline at end of file
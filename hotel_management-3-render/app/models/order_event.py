@@ -0,0 +1,11 @@
+from ..extensions import db
+from datetime import datetime
+
+
+class OrderEvent(db.Model):
+    # order_events.DatabaseBackend ka feed: id hi SSE event id hai, isliye sab workers
+    # (aur restart ke baad bhi) Last-Event-ID ka matlab same rehta hai
+    id = db.Column(db.Integer, primary_key=True)
+    order_id = db.Column(db.Integer, nullable=False)
+    payload = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
@@ -0,0 +1,16 @@
+from datetime import datetime
+
+from ..extensions import db
+
+
+class PayrollSnapshot(db.Model):
+    # Band (closed) mahine ka computed payroll, ek row per employee. Us mahine ki
+    # attendance ya employee badle to services/payroll.invalidate*() rows hata dete hain
+    month = db.Column(db.Date, primary_key=True)  # month ka pehla din
+    employee_id = db.Column(db.Integer, db.ForeignKey('employee.id', ondelete='CASCADE'), primary_key=True)
+    present_days = db.Column(db.Integer, nullable=False, default=0)
+    half_days = db.Column(db.Integer, nullable=False, default=0)
+    absent_days = db.Column(db.Integer, nullable=False, default=0)
+    monthly_salary = db.Column(db.Numeric(10, 2), nullable=False)
+    pay = db.Column(db.Numeric(10, 2), nullable=False)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
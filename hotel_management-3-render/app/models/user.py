@@ -1,6 +1,9 @@
 from enum import Enum
-from werkzeug.security import generate_password_hash, check_password_hash
 from ..extensions import db, login_manager
+from .cache_version import CacheVersion
+
+# CacheVersion name for the per-worker user identity cache (services/identity)
+IDENTITY_CACHE = 'users'
 
 class Role(Enum):
     ADMIN = 'Admin'
@@ -15,11 +18,19 @@ class User(db.Model):
     password_hash = db.Column(db.String(255), nullable=False)  # 255 safe hai scrypt ke liye
     role = db.Column(db.Enum(Role), nullable=False)
 
+    # Hashing services/passwords ke bounded executor pe (policy config se);
+    # dono HashingBusy raise kar sakte hain jab saare slots busy hon
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        from ..services import passwords
+        self.password_hash = passwords.hash_password(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        from ..services import passwords
+        return passwords.verify(self.password_hash, password)
+
+    def password_needs_rehash(self):
+        from ..services import passwords
+        return passwords.needs_rehash(self.password_hash)
 
     # Flask-Login required methods
     @property
@@ -37,7 +48,21 @@ class User(db.Model):
     def get_id(self):
         return str(self.id)
 
-# Flask-Login user loader
+# Flask-Login user loader: har request pe DB nahi, worker ka identity cache
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
\ No newline at end of file
+    from ..services import identity
+    return identity.load(int(user_id))
+
+
+# User/role badla ya delete hua: sab workers ke identity cache invalid
+@db.event.listens_for(User, 'after_update')
+@db.event.listens_for(User, 'after_delete')
+def _user_changed(mapper, connection, target):
+    from ..services import identity
+    state = db.inspect(target)
+    # Sirf password rehash hua to cached identity (id, username, role) same hai
+    if not state.deleted and not any(state.attrs[key].history.has_changes() for key in ('username', 'role')):
+        return
+    CacheVersion.bump_on(connection, IDENTITY_CACHE)
+    identity.forget(target.id)
\ No newline at end of file
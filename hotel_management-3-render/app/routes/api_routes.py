@@ -0,0 +1,192 @@
+"""JSON API for orders, for the tablets that poll every few seconds.
+
+GET endpoints send an ETag and answer ``If-None-Match`` with a bare 304,
+checked with a count/max(updated_at) query before any order is loaded.
+``?updated_since=<cursor>`` returns the orders changed after the cursor
+from the previous response. ``updated_at`` is stamped at flush time, so a
+transaction can commit after a poll already returned a later cursor; the
+filter therefore reaches API_SYNC_OVERLAP_SECONDS back before the cursor
+and clients merge the orders by id (a repeat is just the same order again).
+"""
+import hashlib
+from datetime import datetime, timedelta
+
+from flask import Blueprint, Response, current_app, jsonify, request
+from flask_login import login_required
+from sqlalchemy.orm import selectinload
+
+from ..extensions import db
+from ..models.order import Order, OrderItem, OrderStatus
+from ..routes.decorators import role_required
+from ..services import daily_sales
+from ..services.date_window import DateWindow
+from ..services.order_events import order_payload, publish_order_changed
+from ..services.order_lines import add_lines, available_items
+
+api_bp = Blueprint('api', __name__, url_prefix='/api')
+
+
+def _error(message, status=400):
+    return jsonify(error=message), status
+
+
+def _not_modified(etag):
+    """304 response if the client already has ``etag``, else None."""
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    return None
+
+
+def _with_etag(payload, etag):
+    response = jsonify(payload)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def _json_body():
+    """The request's JSON object, or None if the body is not a JSON object."""
+    data = request.get_json(silent=True)
+    return data if isinstance(data, dict) else None
+
+
+def _load(query):
+    return query.options(selectinload(Order.items).selectinload(OrderItem.menu_item))
+
+
+def _quantities(items):
+    """``[{"menu_item_id": 3, "qty": 2}, ...]`` -> ``{3: 2}``; ValueError on bad input."""
+    quantities = {}
+    for entry in items or []:
+        item_id = int(entry['menu_item_id'])
+        qty = int(entry.get('qty', 0))
+        if qty > 0:
+            quantities[item_id] = quantities.get(item_id, 0) + qty
+    return quantities
+
+
+@api_bp.route('/orders')
+@login_required
+def list_orders():
+    try:
+        window = DateWindow.from_args(request.args)
+    except ValueError as e:
+        return _error(str(e))
+    since_str = request.args.get('updated_since')
+    try:
+        since = datetime.fromisoformat(since_str) if since_str else None
+    except ValueError:
+        return _error('Invalid updated_since!')
+
+    query = Order.query.filter(window.filter(Order.created_at))
+    if since:
+        overlap = timedelta(seconds=current_app.config.get('API_SYNC_OVERLAP_SECONDS', 30))
+        query = query.filter(Order.updated_at > since - overlap)
+
+    count, last_update = query.with_entities(db.func.count(Order.id), db.func.max(Order.updated_at)).one()
+    etag = hashlib.sha1(
+        f'{window.start_date}|{window.end_date}|{since_str}|{count}|{last_update}'.encode()
+    ).hexdigest()
+    cached = _not_modified(etag)
+    if cached:
+        return cached
+
+    orders = _load(query).order_by(Order.created_at.asc()).all()
+    cursor = last_update.isoformat() if last_update else since_str
+    return _with_etag({'orders': [order_payload(o) for o in orders], 'cursor': cursor}, etag)
+
+
+@api_bp.route('/orders/<int:id>')
+@login_required
+def order_detail(id):
+    updated_at = db.session.execute(db.select(Order.updated_at).where(Order.id == id)).first()
+    if updated_at is None:
+        return _error('Order not found', 404)
+    etag = hashlib.sha1(f'{id}|{updated_at[0]}'.encode()).hexdigest()
+    cached = _not_modified(etag)
+    if cached:
+        return cached
+    order = _load(Order.query.filter_by(id=id)).one()
+    return _with_etag(order_payload(order), etag)
+
+
+@api_bp.route('/orders', methods=['POST'])
+@login_required
+@role_required('Waiter', 'Cashier', 'Admin', 'Manager')
+def create_order():
+    data = _json_body()
+    if data is None:
+        return _error('Request body must be a JSON object')
+    order_type = data.get('order_type')
+    table_number = data.get('table_number') if order_type == 'Dine-in' else None
+    customer_name = data.get('customer_name') if order_type == 'Parcel' else None
+
+    if order_type not in ('Dine-in', 'Parcel'):
+        return _error('order_type must be Dine-in or Parcel')
+    if order_type == 'Dine-in' and not table_number:
+        return _error('Table number is required for Dine-in!')
+    if order_type == 'Parcel' and not customer_name:
+        return _error('Customer name is required for Parcel!')
+
+    try:
+        quantities = _quantities(data.get('items'))
+    except (KeyError, TypeError, ValueError):
+        return _error('items must be a list of {menu_item_id, qty}')
+    menu_items = available_items(quantities.keys())
+    if not menu_items:
+        return _error('Please select at least one item!')
+
+    order = Order(order_type=order_type, table_number=table_number,
+                  customer_name=customer_name, status=OrderStatus.PENDING)
+    db.session.add(order)
+    db.session.flush()
+    order.total_amount = add_lines(order.id, quantities, menu_items)
+    daily_sales.record_order(order.created_at)
+    db.session.commit()
+    publish_order_changed(order.id)
+    return jsonify(order_payload(order)), 201
+
+
+@api_bp.route('/orders/<int:id>/items', methods=['POST'])
+@login_required
+@role_required('Waiter', 'Cashier', 'Admin', 'Manager')
+def edit_order(id):
+    order = db.session.get(Order, id)
+    if order is None:
+        return _error('Order not found', 404)
+    data = _json_body()
+    if data is None:
+        return _error('Request body must be a JSON object')
+    try:
+        quantities = _quantities(data.get('items'))
+    except (KeyError, TypeError, ValueError):
+        return _error('items must be a list of {menu_item_id, qty}')
+
+    order.edit_count += 1
+    order.status = f"Partial {order.edit_count}"
+    order.total_amount += add_lines(order.id, quantities, available_items(quantities.keys()),
+                                    edit_round=order.edit_count)
+    db.session.commit()
+    publish_order_changed(order.id)
+    return jsonify(order_payload(order))
+
+
+@api_bp.route('/orders/<int:id>/status', methods=['POST'])
+@login_required
+@role_required('Chef', 'Admin', 'Manager')
+def update_status(id):
+    order = db.session.get(Order, id)
+    if order is None:
+        return _error('Order not found', 404)
+    data = _json_body()
+    if data is None:
+        return _error('Request body must be a JSON object')
+    new_status = data.get('status')
+    if new_status not in ['Pending', 'Preparing', 'Ready', 'Served']:
+        return _error('Invalid status!')
+    order.status = new_status
+    db.session.commit()
+    publish_order_changed(order.id)
+    return jsonify(order_payload(order))
@@ -0,0 +1,35 @@
+import os
+
+from flask import Blueprint, Response, abort, current_app, request
+from werkzeug.security import safe_join
+
+from ..services import assets
+
+assets_bp = Blueprint('assets', __name__)
+
+
+@assets_bp.route('/assets/<path:filename>')
+def serve(filename):
+    name, requested = assets.split_fingerprint(filename)
+    path = safe_join(current_app.static_folder, name)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+
+    current = assets.fingerprint(path)
+    encoding, body = assets.compressed_body(path, assets.accepted_encodings(request.headers.get('Accept-Encoding')))
+    if body is None:
+        with open(path, 'rb') as f:
+            body = f.read()
+
+    response = Response(body, content_type=assets.content_type(name))
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    if name.endswith(assets.COMPRESSIBLE):
+        response.vary.add('Accept-Encoding')
+    # Hash match = content kabhi nahi badlega; purana hash (deploy se pehle ka page) = har baar poochho
+    if requested == current:
+        response.headers['Cache-Control'] = f"public, max-age={current_app.config['ASSET_MAX_AGE']}, immutable"
+    else:
+        response.headers['Cache-Control'] = 'no-cache'
+    response.set_etag(f'{current}-{encoding or "identity"}')
+    return response.make_conditional(request)
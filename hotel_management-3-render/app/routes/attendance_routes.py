@@ -3,11 +3,48 @@ from flask_login import login_required
 from ..extensions import db
 from ..models.employee import Employee
 from ..models.attendance import Attendance, AttendanceStatus
-from datetime import date, datetime, timedelta
+from datetime import datetime
 from ..routes.decorators import role_required
+from ..services import attendance as marking, payroll
+from ..services.date_window import local_today
 
 attendance_bp = Blueprint('attendance', __name__, url_prefix='/attendance')
 
+@attendance_bp.route('/day', methods=['GET', 'POST'])
+@login_required
+@role_required('Admin', 'Manager')
+def day():
+    # Poore staff ki ek din ki attendance, ek form aur ek upsert
+    try:
+        day_str = request.values.get('date')
+        attendance_date = datetime.strptime(day_str, '%Y-%m-%d').date() if day_str else local_today()
+    except ValueError:
+        flash('Invalid date!', 'danger')
+        return redirect(url_for('attendance.day'))
+
+    employees = marking.roster(attendance_date)
+
+    if request.method == 'POST':
+        try:
+            statuses = marking.parse_statuses(request.form, [emp.id for emp in employees])
+        except ValueError:
+            flash('Invalid status!', 'danger')
+            return redirect(url_for('attendance.day', date=attendance_date.isoformat()))
+
+        saved = marking.mark_day(attendance_date, statuses)
+        db.session.commit()
+        flash(f'Attendance saved for {saved} employees on {attendance_date.strftime("%d-%m-%Y")}!', 'success')
+        return redirect(url_for('attendance.day', date=attendance_date.isoformat()))
+
+    marked = marking.statuses_for(attendance_date, [emp.id for emp in employees])
+    return render_template(
+        'attendance/day.html',
+        employees=employees,
+        marked=marked,
+        attendance_date=attendance_date,
+        statuses=[status.value for status in AttendanceStatus]
+    )
+
 @attendance_bp.route('/list/<int:employee_id>', methods=['GET', 'POST'])
 @login_required
 @role_required('Admin', 'Manager')
@@ -27,44 +64,25 @@ def list(employee_id):
             flash('Invalid date or status!', 'danger')
             return redirect(url_for('attendance.list', employee_id=employee_id))
 
-        existing = Attendance.query.filter_by(employee_id=employee_id, date=attendance_date).first()
-        if existing:
+        # Unique (employee_id, date) index: duplicate submit kuch insert nahi karta
+        if not marking.mark_one(employee_id, attendance_date, status):
             flash('Attendance already marked for this date!', 'warning')
             return redirect(url_for('attendance.list', employee_id=employee_id))
-
-        attendance = Attendance(
-            employee_id=employee_id,
-            date=attendance_date,
-            status=status
-        )
-        db.session.add(attendance)
         db.session.commit()
         flash('Attendance marked successfully!', 'success')
         return redirect(url_for('attendance.list', employee_id=employee_id))
 
-    # Salary Calculation (Current Month)
-    today = date.today()
-    month_start = today.replace(day=1)
-    month_end = (month_start.replace(month=month_start.month % 12 + 1, day=1) if month_start.month < 12 else month_start.replace(year=month_start.year + 1, month=1, day=1)) - timedelta(days=1)
-
-    monthly_attendances = Attendance.query.filter_by(employee_id=employee_id)\
-        .filter(Attendance.date.between(month_start, month_end)).all()
-
-    present_days = sum(1 for a in monthly_attendances if a.status == AttendanceStatus.PRESENT)
-    half_days = sum(1 for a in monthly_attendances if a.status == AttendanceStatus.HALF_DAY)
-    absent_days = sum(1 for a in monthly_attendances if a.status == AttendanceStatus.ABSENT)
-
-    days_worked = present_days + (half_days * 0.5)
-    daily_salary = employee.salary / 30  # 30-day month assumption
-    calculated_salary = days_worked * daily_salary
+    # Salary Calculation (Current Month) - payroll wali grouped query se
+    today = local_today()
+    line = payroll.compute(payroll.month_start(today), employee_id=employee_id)[0]
 
     return render_template(
         'attendance/list.html',
         employee=employee,
         attendances=attendances,
         today=today,
-        calculated_salary=calculated_salary,
-        present_days=present_days,
-        half_days=half_days,
-        absent_days=absent_days
+        calculated_salary=line.pay,
+        present_days=line.present_days,
+        half_days=line.half_days,
+        absent_days=line.absent_days
     )
\ No newline at end of file
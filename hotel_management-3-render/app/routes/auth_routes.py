@@ -1,13 +1,12 @@
-from datetime import date
-
-from flask import Blueprint, render_template, redirect, url_for, request, flash
+from flask import Blueprint, current_app, render_template, redirect, url_for, request, flash
 from flask_login import login_user, logout_user, login_required, current_user
 
-from ..models.billing import Bill
 from ..models.employee import Employee
 from ..models.order import Order
 from ..models.user import User, Role
 from ..extensions import db
+from ..services import daily_sales, passwords
+from ..services.date_window import DateWindow
 
 auth_bp = Blueprint('auth', __name__, url_prefix='')
 
@@ -56,6 +55,11 @@ def signup():
             flash(f'Success! "{username}" registered as {role.value}. Now login below.', 'success')
             return redirect(url_for('auth.login'))
 
+        except passwords.HashingBusy:
+            db.session.rollback()
+            flash('Server is busy, please try again in a moment.', 'warning')
+            return render_template('auth/signup.html'), 503
+
         except Exception as e:
             db.session.rollback()
             print(f"Error: {e}")  # Console mein error dikhega
@@ -74,65 +78,70 @@ def login():
         username = request.form.get('username', '').strip()
         password = request.form.get('password', '').strip()
 
+        # Ek username pe baar baar galat try: hashing se pehle hi rok do
+        if not passwords.allow_attempt(username):
+            flash('Too many login attempts. Please wait a minute and try again.', 'danger')
+            return render_template('auth/login.html'), 429
+
         user = User.query.filter_by(username=username).first()
 
-        if user and user.check_password(password):
+        try:
+            valid = user is not None and user.check_password(password)
+        except passwords.HashingBusy:
+            flash('Server is busy, please try again in a moment.', 'warning')
+            return render_template('auth/login.html'), 503
+
+        # Purani policy wala hash? Abhi plain password haath mein hai, upgrade kar do
+        if valid and user.password_needs_rehash():
+            try:
+                user.set_password(password)
+                db.session.commit()
+            except passwords.HashingBusy:
+                # Upgrade agli login pe ho jayega; sahi password wale ko rokna nahi
+                db.session.rollback()
+                current_app.logger.info('Password rehash for %s skipped: hashing busy', username)
+
+        if valid:
             login_user(user)
             flash(f'Welcome {username}! Logged in as {user.role.value}', 'success')
             return redirect(url_for('auth.dashboard'))
         else:
+            passwords.record_failure(username)
             flash('Invalid username or password', 'danger')
 
     return render_template('auth/login.html')
 
 
 # DASHBOARD
-from datetime import datetime, date
-from flask import request
 @auth_bp.route('/dashboard')
 @login_required
 def dashboard():
     # Date filter logic
-    filter_date_str = request.args.get('date')
-    start_date_str = request.args.get('start_date')
-    end_date_str = request.args.get('end_date')
-
-    if filter_date_str:
-        try:
-            selected_date = datetime.strptime(filter_date_str, '%Y-%m-%d').date()
-            start_date = end_date = selected_date
-        except:
-            flash('Invalid date!', 'danger')
-            start_date = end_date = date.today()
-    elif start_date_str and end_date_str:
-        try:
-            start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
-            end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
-        except:
-            flash('Invalid date range!', 'danger')
-            start_date = end_date = date.today()
-    else:
-        start_date = end_date = date.today()
+    try:
+        window = DateWindow.from_args(request.args)
+    except ValueError as e:
+        flash(str(e), 'danger')
+        window = DateWindow.today()
+    start_date, end_date = window.start_date, window.end_date
 
     # Orders in selected period
-    orders_query = Order.query.filter(db.func.date(Order.created_at).between(start_date, end_date))
+    orders_query = Order.query.filter(window.filter(Order.created_at))
 
-    total_orders_count = orders_query.count()
+    # Counts + revenue daily rollup se (O(days) rows, O(bills) nahi)
+    sales = daily_sales.totals(window)
+    total_orders_count = sales.order_count
 
     live_orders_count = orders_query.filter(Order.status.notin_(['Paid', 'Served'])).count()
 
-    # Revenue from Bills
-    bills_query = Bill.query.filter(db.func.date(Bill.generated_at).between(start_date, end_date))
-    bills = bills_query.all()
-
-    total_revenue = sum(bill.grand_total for bill in bills)
-    cash_revenue = sum(bill.grand_total for bill in bills if bill.payment_mode == 'Cash')
-    online_revenue = sum(bill.grand_total for bill in bills if bill.payment_mode == 'Online')
+    total_revenue = sales.total_revenue
+    cash_revenue = sales.cash_revenue
+    online_revenue = sales.online_revenue
 
-    # Recent orders with day-wise sequence
-    recent_orders = orders_query.order_by(Order.created_at.asc()).all()
-    for index, order in enumerate(recent_orders, start=1):
-        order.day_sequence = index
+    # Recent orders (latest first, limited) with day-wise sequence
+    recent_orders = orders_query.order_by(Order.created_at.desc(), Order.id.desc())\
+        .limit(current_app.config['DASHBOARD_RECENT_ORDERS']).all()
+    for index, order in enumerate(recent_orders):
+        order.day_sequence = total_orders_count - index
 
     # Total employee
     employees_count = Employee.query.count()  # ← Ab error nahi aayega
@@ -4,52 +4,63 @@ from app.extensions import db
 from app.models.billing import Bill
 from app.models.order import Order
 from app.models.finance import FinanceTransaction, TransactionType
-from datetime import datetime, date, timezone
-from io import BytesIO
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
+import tempfile
 from ..routes.decorators import role_required
+from ..services.date_window import DateWindow
+from ..services.pagination import keyset_paginate, page_size
+from ..services.csv_export import export_name, export_response
+from ..services import http_cache
+from ..services.invoices import content_hash, invoice_data, invoice_pdf, render_batch, write_zip
 
 billing_bp = Blueprint('billing', __name__, url_prefix='/billing')
 
 
-from datetime import datetime, date
-
 @billing_bp.route('/')
 @login_required
 @role_required('Admin', 'Manager', 'Cashier')
 def list():
-    filter_date_str = request.args.get('date')
-    start_date_str = request.args.get('start_date')
-    end_date_str = request.args.get('end_date')
-
-    query = Bill.query
-
-    if filter_date_str:
-        try:
-            filter_date = datetime.strptime(filter_date_str, '%Y-%m-%d').date()
-            query = query.filter(db.func.date(Bill.generated_at) == filter_date)
-        except:
-            flash('Invalid date format!', 'danger')
-    elif start_date_str and end_date_str:
-        try:
-            start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
-            end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
-            query = query.filter(db.func.date(Bill.generated_at).between(start_date, end_date))
-        except:
-            flash('Invalid date range!', 'danger')
-    else:
-        today = date.today()
-        query = query.filter(db.func.date(Bill.generated_at) == today)
-
-    # Ascending order (oldest first)
-    bills = query.order_by(Bill.generated_at.asc()).all()
-
-    # Add day-wise sequential number
-    for index, bill in enumerate(bills, start=1):
-        bill.day_sequence = index  # Temporary attribute
-
-    return render_template('billing/list.html', bills=bills)
+    try:
+        window = DateWindow.from_args(request.args)
+    except ValueError as e:
+        flash(str(e), 'danger')
+        window = DateWindow.today()
+
+    query = Bill.query.filter(window.filter(Bill.generated_at))
+
+    # Ascending order (oldest first), ek page at a time
+    try:
+        page = keyset_paginate(query, Bill.generated_at, Bill.id,
+                               request.args.get('cursor'), page_size(request.args))
+    except ValueError as e:
+        flash(str(e), 'danger')
+        page = keyset_paginate(query, Bill.generated_at, Bill.id, per_page=page_size(request.args))
+
+    # Day-wise sequential number (pichhle pages se continue)
+    bills = page.numbered()
+
+    return render_template('billing/list.html', bills=bills, page=page)
+
+
+@billing_bp.route('/export')
+@login_required
+@role_required('Admin', 'Manager', 'Cashier')
+def export():
+    # Same date filter as the list; poori range ek CSV mein (streamed)
+    try:
+        window = DateWindow.from_args(request.args)
+    except ValueError as e:
+        flash(str(e), 'danger')
+        return redirect(url_for('billing.list'))
+
+    statement = db.select(
+        Bill.id, Bill.order_id, Bill.generated_at, Bill.payment_mode,
+        Bill.total_items, Bill.gst, Bill.service_charge, Bill.grand_total,
+    ).where(window.filter(Bill.generated_at)).order_by(Bill.generated_at, Bill.id)
+
+    header = ['Bill ID', 'Order ID', 'Generated', 'Payment Mode',
+              'Items Total', 'GST', 'Service Charge', 'Grand Total']
+    return export_response(export_name('bills', window), header, statement,
+                           compress=request.args.get('gzip') == '1')
 
 
 @billing_bp.route('/view_invoice/<int:id>')
@@ -57,7 +68,12 @@ def list():
 @role_required('Admin', 'Manager', 'Cashier')
 def view_invoice(id):
     bill = Bill.query.get_or_404(id)
-    return render_template('billing/invoice.html', bill=bill)
+    # Bill generate hone ke baad nahi badalta: content hash same to 304
+    return http_cache.conditional(
+        http_cache.page_etag('invoice', content_hash(invoice_data(bill))),
+        lambda: render_template('billing/invoice.html', bill=bill),
+        last_modified=bill.generated_at, immutable=True,
+    )
 
 
 @billing_bp.route('/download_pdf/<int:id>')
@@ -65,32 +81,36 @@ def view_invoice(id):
 @role_required('Admin', 'Manager', 'Cashier')
 def download_pdf(id):
     bill = Bill.query.get_or_404(id)
-    buffer = BytesIO()
-    p = canvas.Canvas(buffer, pagesize=letter)
-    width, height = letter
-
-    p.setFont("Helvetica-Bold", 20)
-    p.drawString(50, height - 50, "Hotel Management Invoice")
-
-    p.setFont("Helvetica", 12)
-    p.drawString(50, height - 100, f"Invoice ID: #{bill.id}")
-    p.drawString(50, height - 120, f"Order ID: #{bill.order_id}")
-    p.drawString(50, height - 140, f"Generated: {bill.generated_at.strftime('%Y-%m-%d %H:%M')}")
-    p.drawString(50, height - 160, f"Payment Mode: {bill.payment_mode}")
+    # Disk cache se (bill ka content hash file name mein hai); browser ke paas hai to 304
+    return http_cache.conditional(
+        http_cache.page_etag('invoice.pdf', content_hash(invoice_data(bill))),
+        lambda: send_file(invoice_pdf(bill), as_attachment=True, download_name=f"invoice_{bill.id}.pdf",
+                          mimetype='application/pdf', conditional=False, etag=False),
+        last_modified=bill.generated_at, immutable=True,
+    )
 
-    p.drawString(50, height - 200, "Items Total:")
-    p.drawString(400, height - 200, f"₹{bill.total_items}")
 
-    p.drawString(50, height - 220, "GST (18%):")
-    p.drawString(400, height - 220, f"₹{bill.gst}")
-
-    p.drawString(50, height - 240, "Service Charge (5%):")
-    p.drawString(400, height - 240, f"₹{bill.service_charge}")
-
-    p.setFont("Helvetica-Bold", 16)
-    p.drawString(50, height - 280, "Grand Total:")
-    p.drawString(400, height - 280, f"₹{bill.grand_total}")
-
-    p.save()
-    buffer.seek(0)
-    return send_file(buffer, as_attachment=True, download_name=f"invoice_{bill.id}.pdf", mimetype='application/pdf')
\ No newline at end of file
+@billing_bp.route('/invoices')
+@login_required
+@role_required('Admin', 'Manager')
+def download_invoices():
+    # Date range ke saare invoices ek zip mein (month end / auditor)
+    try:
+        window = DateWindow.from_args(request.args)
+    except ValueError as e:
+        flash(str(e), 'danger')
+        return redirect(url_for('billing.list'))
+
+    bills = Bill.query.filter(window.filter(Bill.generated_at)).order_by(Bill.generated_at, Bill.id).all()
+    if not bills:
+        flash('No bills in selected period!', 'warning')
+        return redirect(url_for('billing.list', **request.args))
+
+    # Web worker mein process pool nahi: PDFs zyada tar render_pdf job ne pehle hi bana di hoti hain,
+    # bache hue yahin render. Bade backfill ke liye `flask export-invoices`.
+    paths, _ = render_batch(bills, workers=1)
+    archive = tempfile.SpooledTemporaryFile(max_size=50 * 1024 * 1024)
+    write_zip(paths, archive)
+    archive.seek(0)
+    return send_file(archive, as_attachment=True, download_name=f"{export_name('invoices', window)}.zip",
+                     mimetype='application/zip')
\ No newline at end of file
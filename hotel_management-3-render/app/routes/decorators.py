@@ -3,6 +3,9 @@ from flask_login import current_user
 from flask import flash, redirect, url_for
 
 def role_required(*roles):
+    # current_user yahan services/identity ka cached identity hai (koi DB query nahi)
+    required_roles = {r.upper() for r in roles}  # ← SABKO UPPERCASE, ek hi baar
+
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
@@ -11,7 +14,6 @@ def role_required(*roles):
                 return redirect(url_for('auth.login'))
 
             user_role = current_user.role.value.upper()  # ← UPPERCASE KAR DO
-            required_roles = [r.upper() for r in roles]  # ← SABKO UPPERCASE
 
             if user_role not in required_roles:
                 flash('You do not have permission to access this page.', 'danger')
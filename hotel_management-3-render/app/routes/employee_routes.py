@@ -1,8 +1,11 @@
-from flask import Blueprint, render_template, request, flash, redirect, url_for
+from flask import Blueprint, Response, jsonify, render_template, request, flash, redirect, url_for, stream_with_context
 from flask_login import login_required, current_user
 from ..extensions import db
 from ..models.employee import Employee, EmployeeRole
 from ..routes.decorators import role_required
+from ..services import payroll
+from ..services.csv_export import csv_chunks
+from ..services.money import parse_money
 from datetime import datetime
 from sqlalchemy.exc import IntegrityError
 
@@ -47,7 +50,7 @@ def add_edit(id=None):
                 errors.append("Age must be a valid number")
 
             try:
-                salary = float(salary_str) if salary_str else None
+                salary = parse_money(salary_str) if salary_str else None
                 if salary is None or salary <= 0:
                     errors.append("Salary must be a positive number")
             except ValueError:
@@ -75,6 +78,9 @@ def add_edit(id=None):
             role = EmployeeRole(role_str)
 
             if employee:
+                # Salary / dates badle to purane band mahino ka payroll bhi badalta hai
+                if (employee.salary, employee.hire_date, employee.resign_date) != (salary, hire_date, resign_date):
+                    payroll.invalidate_since(min(employee.hire_date, hire_date))
                 employee.name = name
                 employee.age = age
                 employee.phone = phone
@@ -98,6 +104,7 @@ def add_edit(id=None):
                     resign_date=resign_date
                 )
                 db.session.add(new_employee)
+                payroll.invalidate_since(hire_date)
                 flash('Employee added successfully!', 'success')
 
             db.session.commit()
@@ -118,6 +125,7 @@ def add_edit(id=None):
 def delete(id):
     employee = Employee.query.get_or_404(id)
     try:
+        payroll.invalidate_since(employee.hire_date)
         db.session.delete(employee)
         db.session.commit()
         flash('Employee deleted successfully!', 'success')
@@ -126,6 +134,34 @@ def delete(id):
         flash(f'Error deleting: {str(e)}', 'danger')
     return redirect(url_for('employee.list'))
 
+@employee_bp.route('/payroll')
+@login_required
+@role_required('Admin', 'Manager')
+def payroll_run():
+    # ?month=YYYY-MM (default: current month), ?format=csv ya json
+    try:
+        month = payroll.parse_month(request.args.get('month'))
+    except ValueError as e:
+        flash(str(e), 'danger')
+        return redirect(url_for('employee.list'))
+
+    lines, from_snapshot = payroll.run(month)
+
+    if request.args.get('format') == 'csv':
+        header = ['Employee ID', 'Name', 'Role', 'Monthly Salary', 'Present', 'Half Days', 'Absent', 'Pay']
+        rows = [(line.employee_id, line.name, line.role, line.monthly_salary, line.present_days,
+                 line.half_days, line.absent_days, line.pay) for line in lines]
+        return Response(stream_with_context(csv_chunks(header, rows)), mimetype='text/csv',
+                        headers={'Content-Disposition': f'attachment; filename="payroll_{month:%Y-%m}.csv"'})
+
+    return jsonify(
+        month=f'{month:%Y-%m}',
+        closed=payroll.is_closed(month),
+        from_snapshot=from_snapshot,
+        total_pay=str(sum((line.pay for line in lines), 0)),
+        employees=[payroll.line_dict(line) for line in lines],
+    )
+
 @employee_bp.route('/attendance')
 @login_required
 @role_required('Admin', 'Manager')
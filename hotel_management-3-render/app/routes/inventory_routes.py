@@ -1,10 +1,14 @@
-from flask import Blueprint, render_template, request, flash, redirect, url_for
+from flask import Blueprint, abort, render_template, request, flash, redirect, url_for
 from flask_login import login_required
 from ..extensions import db
 from ..models.inventory import Inventory, Expense, InventoryCategory, InventoryStatus, PaymentMode
-from datetime import datetime, date
-from sqlalchemy import func
 from ..routes.decorators import role_required
+from ..services.date_window import DateWindow, local_today
+from ..services.money import parse_money
+from ..services.stock import format_quantity, item_summaries, parse_quantity, record_purchase
+from ..services.pagination import keyset_paginate, page_size
+from ..services.csv_export import export_name, export_response
+from sqlalchemy.orm import contains_eager
 
 inventory_bp = Blueprint('inventory', __name__, url_prefix='/inventory')
 
@@ -12,28 +16,26 @@ inventory_bp = Blueprint('inventory', __name__, url_prefix='/inventory')
 @login_required
 @role_required('Admin', 'Manager')
 def list():
-    # Date filter
-    filter_date_str = request.args.get('date')
-    start_date_str = request.args.get('start_date')
-    end_date_str = request.args.get('end_date')
+    # Date filter (koi filter nahi to saare expenses)
+    try:
+        window = DateWindow.from_args(request.args, default_today=False)
+    except ValueError as e:
+        flash(str(e), 'danger')
+        window = None
 
-    query = Expense.query.join(Inventory)
+    query = Expense.query.join(Inventory).options(contains_eager(Expense.inventory))
+    if window:
+        query = query.filter(window.filter(Expense.date))
 
-    if filter_date_str:
-        try:
-            filter_date = datetime.strptime(filter_date_str, '%Y-%m-%d').date()
-            query = query.filter(func.date(Expense.date) == filter_date)
-        except ValueError:
-            flash('Invalid date!', 'danger')
-    elif start_date_str and end_date_str:
-        try:
-            start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
-            end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
-            query = query.filter(func.date(Expense.date).between(start_date, end_date))
-        except ValueError:
-            flash('Invalid date range!', 'danger')
-
-    expenses = query.order_by(Expense.date.desc()).all()
+    # Latest first, ek page at a time
+    try:
+        page = keyset_paginate(query, Expense.date, Expense.expense_id,
+                               request.args.get('cursor'), page_size(request.args), descending=True)
+    except ValueError as e:
+        flash(str(e), 'danger')
+        page = keyset_paginate(query, Expense.date, Expense.expense_id,
+                               per_page=page_size(request.args), descending=True)
+    expenses = page.items
 
     # Group by item
     grouped_items = {}
@@ -46,9 +48,34 @@ def list():
             }
         grouped_items[item.item_id]['expenses'].append(expense)
 
-    today = date.today()
+    today = local_today()
+
+    return render_template('inventory/list.html', grouped_items=grouped_items.values(), today=today, request=request,
+                           page=page)
+
+@inventory_bp.route('/export')
+@login_required
+@role_required('Admin', 'Manager')
+def export():
+    # Same filter as the list (koi filter nahi to saare expenses), streamed
+    try:
+        window = DateWindow.from_args(request.args, default_today=False)
+    except ValueError as e:
+        flash(str(e), 'danger')
+        return redirect(url_for('inventory.list'))
 
-    return render_template('inventory/list.html', grouped_items=grouped_items.values(), today=today, request=request)
+    statement = db.select(
+        Expense.expense_id, Expense.date, Inventory.item_name, Inventory.category,
+        Expense.added_quantity_with_unit, Expense.payment_amount, Expense.payment_mode,
+    ).join(Inventory, Expense.item_id == Inventory.item_id)
+    if window:
+        statement = statement.where(window.filter(Expense.date))
+    statement = statement.order_by(Expense.date, Expense.expense_id)
+
+    header = ['Expense ID', 'Date', 'Item', 'Category', 'Quantity Added',
+              'Amount', 'Payment Mode']
+    return export_response(export_name('expenses', window), header, statement,
+                           compress=request.args.get('gzip') == '1')
 
 @inventory_bp.route('/add', methods=['GET', 'POST'])
 @login_required
@@ -66,28 +93,32 @@ def add():
             return redirect(url_for('inventory.add'))
 
         try:
-            payment_amount = float(payment_amount_str)
+            quantity, unit = parse_quantity(quantity_with_unit)
+        except ValueError as e:
+            flash(str(e), 'danger')
+            return redirect(url_for('inventory.add'))
+
+        try:
+            payment_amount = parse_money(payment_amount_str)
             category_enum = InventoryCategory(category_str.upper())
             payment_mode_enum = PaymentMode(payment_mode_str.upper())
         except ValueError:
             flash('Invalid data!', 'danger')
             return redirect(url_for('inventory.add'))
 
+        # Zero balance se shuru, pehli purchase ledger entry se stock aata hai
         new_item = Inventory(
             item_name=name,
             category=category_enum,
-            quantity_with_unit=quantity_with_unit
+            quantity=0,
+            unit=unit,
+            total_spent=0,
+            quantity_with_unit=format_quantity(0, unit)
         )
         db.session.add(new_item)
         db.session.flush()
 
-        expense = Expense(
-            item_id=new_item.item_id,
-            added_quantity_with_unit=quantity_with_unit,
-            payment_amount=payment_amount,
-            payment_mode=payment_mode_enum
-        )
-        db.session.add(expense)
+        record_purchase(new_item, quantity, unit, payment_amount, payment_mode_enum)
         db.session.commit()
 
         flash('Item added successfully!', 'success')
@@ -99,7 +130,6 @@ def add():
 @login_required
 @role_required('Admin', 'Manager')
 def add_quantity(id):
-    item = Inventory.query.get_or_404(id)
     if request.method == 'POST':
         added_qty = request.form.get('added_quantity_with_unit')
         payment_amount_str = request.form.get('payment_amount')
@@ -110,28 +140,27 @@ def add_quantity(id):
             return redirect(url_for('inventory.add_quantity', id=id))
 
         try:
-            payment_amount = float(payment_amount_str)
+            payment_amount = parse_money(payment_amount_str)
             payment_mode_enum = PaymentMode(payment_mode_str.upper())
         except ValueError:
             flash('Invalid data!', 'danger')
             return redirect(url_for('inventory.add_quantity', id=id))
 
-        # Update total quantity with history
-        item.quantity_with_unit = f"{item.quantity_with_unit} + {added_qty}"
-
-        # Save new addition in history
-        expense = Expense(
-            item_id=item.item_id,
-            added_quantity_with_unit=added_qty,
-            payment_amount=payment_amount,
-            payment_mode=payment_mode_enum
-        )
-        db.session.add(expense)
+        # Row lock: do purchases ek hi balance padh ke overwrite na karein
+        item = db.session.get(Inventory, id, with_for_update=True) or abort(404)
+        try:
+            quantity, unit = parse_quantity(added_qty)
+            record_purchase(item, quantity, unit, payment_amount, payment_mode_enum)
+        except ValueError as e:
+            db.session.rollback()
+            flash(str(e), 'danger')
+            return redirect(url_for('inventory.add_quantity', id=id))
         db.session.commit()
 
         flash('Quantity added successfully!', 'success')
         return redirect(url_for('inventory.list'))
 
+    item = Inventory.query.get_or_404(id)
     return render_template('inventory/add_quantity.html', item=item, payment_modes=PaymentMode)
 
 @inventory_bp.route('/update_status/<int:id>', methods=['POST'])
@@ -154,17 +183,24 @@ def update_status(id):
 @login_required
 @role_required('Admin', 'Manager')
 def view(id):
-    item = Inventory.query.get_or_404(id)
-    expenses = Expense.query.filter_by(item_id=id).order_by(Expense.date.desc()).all()
-    total_expense = sum(e.payment_amount for e in expenses)
-    return render_template('inventory/view.html', item=item, expenses=expenses, total_expense=total_expense)
+    summaries = item_summaries(item_id=id)
+    if not summaries:
+        abort(404)
+    item = summaries[0].item
+    expenses = Expense.query.filter_by(item_id=id).order_by(Expense.date.desc(), Expense.expense_id.desc()).all()
+    return render_template('inventory/view.html', item=item, expenses=expenses,
+                           total_expense=summaries[0].total_expense)
 
 @inventory_bp.route('/view_all')
 @login_required
 @role_required('Admin', 'Manager')
 def view_all():
-    items = Inventory.query.order_by(Inventory.created_at.desc()).all()
-    for item in items:
-        item.last_expense = Expense.query.filter_by(item_id=item.item_id).order_by(Expense.date.desc()).first()
-        item.total_expense = sum(e.payment_amount for e in item.expenses)
+    # Ek grouped query: har item ka total, count aur last addition
+    items = []
+    for summary in item_summaries():
+        item = summary.item
+        item.last_expense = summary.last_expense
+        item.total_expense = summary.total_expense
+        item.expense_count = summary.expense_count
+        items.append(item)
     return render_template('inventory/view_all.html', items=items)
\ No newline at end of file
@@ -3,6 +3,8 @@ from flask_login import login_required
 from app.extensions import db
 from app.models.menu import Category, MenuItem
 from ..routes.decorators import role_required
+from ..services import catalog, http_cache
+from ..services.money import parse_money
 
 menu_bp = Blueprint('menu', __name__, url_prefix='/menu')
 
@@ -10,8 +12,12 @@ menu_bp = Blueprint('menu', __name__, url_prefix='/menu')
 @login_required
 @role_required('Admin', 'Manager')
 def list():
-    categories = Category.query.order_by(Category.name).all()
-    return render_template('menu/list.html', categories=categories)
+    # Menu version same hai to 304, template render nahi hota
+    version = catalog.version()
+    return http_cache.conditional(
+        http_cache.page_etag('menu', version),
+        lambda: render_template('menu/list.html', categories=catalog.get_categories(version)),
+    )
 
 @menu_bp.route('/add', methods=['GET', 'POST'])
 @menu_bp.route('/edit/<int:id>', methods=['GET', 'POST'])
@@ -31,7 +37,7 @@ def add_edit(id=None):
             return render_template('menu/add_edit.html', item=item, category_name=category_name)
 
         try:
-            price = float(price_str)
+            price = parse_money(price_str)
         except ValueError:
             flash('Invalid price format!', 'danger')
             return render_template('menu/add_edit.html', item=item, category_name=category_name)
@@ -61,6 +67,7 @@ def add_edit(id=None):
             db.session.add(new_item)
             flash('Menu item added successfully!', 'success')
 
+        catalog.invalidate()
         db.session.commit()
         return redirect(url_for('menu.list'))
 
@@ -74,6 +81,7 @@ def add_edit(id=None):
 def delete(id):
     item = MenuItem.query.get_or_404(id)
     db.session.delete(item)
+    catalog.invalidate()
     db.session.commit()
     flash('Menu item deleted successfully!', 'success')
     return redirect(url_for('menu.list'))
\ No newline at end of file
@@ -0,0 +1,24 @@
+import hmac
+
+from flask import Blueprint, Response, abort, current_app, request
+
+from ..services import metrics
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+@metrics_bp.route('/metrics')
+def scrape():
+    if not current_app.config.get('METRICS_ENABLED', True):
+        abort(404)
+    token = current_app.config.get('METRICS_TOKEN')
+    if not token:
+        # Bina token ke production mein endpoint public ho jata; tab band hi rakho
+        if current_app.config.get('METRICS_REQUIRE_TOKEN', True):
+            abort(404)
+    elif not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        abort(401)
+
+    scope = 'worker' if request.args.get('scope') == 'worker' else 'all'
+    return Response(metrics.render(metrics.collect(scope)),
+                    mimetype='text/plain; version=0.0.4; charset=utf-8')
@@ -1,52 +1,85 @@
-from flask import Blueprint, render_template, request, flash, redirect, url_for
+from flask import Blueprint, Response, abort, current_app, render_template, request, flash, redirect, url_for
 from flask_login import login_required
+from uuid import uuid4
+from sqlalchemy.orm import selectinload
 from ..extensions import db
 from ..models.billing import Bill
 from ..models.order import Order, OrderItem, OrderStatus
-from ..models.menu import Category, MenuItem
 from ..routes.decorators import role_required
+from ..services.date_window import DateWindow
+from ..services import catalog, daily_sales, jobs
+from ..services.pagination import keyset_paginate, page_size
+from ..services.csv_export import export_name, export_response
+from ..services.order_lines import parse_quantities, available_items, add_lines
+from ..services.settlement import PAYMENT_MODES, SettlementError, settle_order
+from ..services.order_events import get_backend, publish_order_changed, sse_stream
 
 order_bp = Blueprint('order', __name__, url_prefix='/orders')
 
 # All routes must be defined BEFORE blueprint registration
 
-from datetime import datetime, date
-from flask import request  # ← add this import
-
 @order_bp.route('/')
 @login_required
 def list():
-    filter_date_str = request.args.get('date')
-    start_date_str = request.args.get('start_date')
-    end_date_str = request.args.get('end_date')
-
-    query = Order.query
-
-    if filter_date_str:
-        try:
-            filter_date = datetime.strptime(filter_date_str, '%Y-%m-%d').date()
-            query = query.filter(db.func.date(Order.created_at) == filter_date)
-        except:
-            flash('Invalid date format!', 'danger')
-    elif start_date_str and end_date_str:
-        try:
-            start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
-            end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
-            query = query.filter(db.func.date(Order.created_at).between(start_date, end_date))
-        except:
-            flash('Invalid date range!', 'danger')
-    else:
-        today = date.today()
-        query = query.filter(db.func.date(Order.created_at) == today)
+    try:
+        window = DateWindow.from_args(request.args)
+    except ValueError as e:
+        flash(str(e), 'danger')
+        window = DateWindow.today()
+
+    query = Order.query.filter(window.filter(Order.created_at))
+
+    # Items + menu items ek saath load karo, warna template har order ke
+    # liye alag query chalata hai (N+1)
+    query = query.options(selectinload(Order.items).selectinload(OrderItem.menu_item))
+
+    # Ascending order (oldest first), ek page at a time
+    try:
+        page = keyset_paginate(query, Order.created_at, Order.id,
+                               request.args.get('cursor'), page_size(request.args))
+    except ValueError as e:
+        flash(str(e), 'danger')
+        page = keyset_paginate(query, Order.created_at, Order.id, per_page=page_size(request.args))
+
+    # Day-wise sequential number (pichhle pages se continue)
+    orders = page.numbered()
+
+    # Har render ka naya token; same form dobara submit ho to wahi bill milega
+    payment_token = uuid4().hex
+    return render_template('orders/list.html', orders=orders, page=page, payment_token=payment_token)
+
+@order_bp.route('/export')
+@login_required
+@role_required('Admin', 'Manager', 'Cashier')
+def export():
+    # Same date filter as the list; poori range ek CSV mein (streamed)
+    try:
+        window = DateWindow.from_args(request.args)
+    except ValueError as e:
+        flash(str(e), 'danger')
+        return redirect(url_for('order.list'))
 
-    # Ascending order (oldest first)
-    orders = query.order_by(Order.created_at.asc()).all()
+    statement = db.select(
+        Order.id, Order.created_at, Order.order_type, Order.table_number, Order.customer_name,
+        Order.status, Order.total_amount, Order.edit_count, Order.is_paid, Order.paid_at,
+    ).where(window.filter(Order.created_at)).order_by(Order.created_at, Order.id)
 
-    # Add day-wise sequential number
-    for index, order in enumerate(orders, start=1):
-        order.day_sequence = index  # Temporary attribute for template
+    header = ['Order ID', 'Created', 'Type', 'Table', 'Customer',
+              'Status', 'Total', 'Edits', 'Paid', 'Paid At']
+    return export_response(export_name('orders', window), header, statement,
+                           compress=request.args.get('gzip') == '1')
 
-    return render_template('orders/list.html', orders=orders)
+@order_bp.route('/stream')
+@login_required
+def stream():
+    # Kitchen/counter screens: sirf changed orders push hote hain (SSE)
+    if not current_app.config.get('ORDER_EVENTS_ENABLED'):
+        abort(404)
+    last_id = request.headers.get('Last-Event-ID', type=int)
+    sub = get_backend().subscribe(last_id)
+    lifetime = current_app.config.get('ORDER_EVENTS_STREAM_SECONDS', 300)
+    return Response(sse_stream(sub, lifetime=lifetime), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 @order_bp.route('/add', methods=['GET', 'POST'])
 @login_required
@@ -59,12 +92,19 @@ def add():
 
         if order_type == 'Dine-in' and not table_number:
             flash('Table number is required for Dine-in!', 'danger')
-            categories = Category.query.order_by(Category.name).all()
+            categories = catalog.get_categories()
             return render_template('orders/add.html', categories=categories)
 
         if order_type == 'Parcel' and not customer_name:
             flash('Customer name is required for Parcel!', 'danger')
-            categories = Category.query.order_by(Category.name).all()
+            categories = catalog.get_categories()
+            return render_template('orders/add.html', categories=categories)
+
+        quantities = parse_quantities(request.form)
+        menu_items = available_items(quantities.keys())
+        if not menu_items:
+            flash('Please select at least one item!', 'danger')
+            categories = catalog.get_categories()
             return render_template('orders/add.html', categories=categories)
 
         order = Order(
@@ -76,38 +116,15 @@ def add():
         db.session.add(order)
         db.session.flush()
 
-        total = 0.0
-        items_added = False
-        for key in request.form:
-            if key.startswith('qty_'):
-                item_id = key.split('_')[1]
-                qty = int(request.form.get(key, 0))
-                if qty > 0:
-                    item = MenuItem.query.get(item_id)
-                    if item and item.available:
-                        order_item = OrderItem(
-                            order_id=order.id,
-                            menu_item_id=item.id,
-                            quantity=qty,
-                            price_at_time=item.price,
-                            added_after_edit=0
-                        )
-                        db.session.add(order_item)
-                        total += qty * item.price
-                        items_added = True
-
-        if not items_added:
-            db.session.rollback()
-            flash('Please select at least one item!', 'danger')
-            categories = Category.query.order_by(Category.name).all()
-            return render_template('orders/add.html', categories=categories)
-
+        total = add_lines(order.id, quantities, menu_items)
         order.total_amount = total
+        daily_sales.record_order(order.created_at)
         db.session.commit()
+        publish_order_changed(order.id)
         flash(f'Order #{order.id} placed successfully! Total: ₹{total}', 'success')
         return redirect(url_for('order.list'))
 
-    categories = Category.query.order_by(Category.name).all()
+    categories = catalog.get_categories()
     return render_template('orders/add.html', categories=categories)
 
 @order_bp.route('/edit/<int:id>', methods=['GET', 'POST'])
@@ -119,35 +136,17 @@ def edit(id):
         order.edit_count += 1
         order.status = f"Partial {order.edit_count}"
 
-        added_total = 0.0
-        for key in request.form:
-            if key.startswith('qty_'):
-                item_id = key.split('_')[1]
-                qty = int(request.form.get(key, 0))
-                if qty > 0:
-                    item = MenuItem.query.get(item_id)
-                    if item and item.available:
-                        # Check if already exists
-                        existing = OrderItem.query.filter_by(order_id=order.id, menu_item_id=item.id).first()
-                        if existing:
-                            existing.quantity += qty
-                        else:
-                            new_item = OrderItem(
-                                order_id=order.id,
-                                menu_item_id=item.id,
-                                quantity=qty,
-                                price_at_time=item.price,
-                                added_after_edit=order.edit_count
-                            )
-                            db.session.add(new_item)
-                        added_total += qty * item.price
+        quantities = parse_quantities(request.form)
+        added_total = add_lines(order.id, quantities, available_items(quantities.keys()),
+                                edit_round=order.edit_count)
 
         order.total_amount += added_total
         db.session.commit()
+        publish_order_changed(order.id)
         flash(f'Order edited! Now status: Partial {order.edit_count}', 'success')
         return redirect(url_for('order.list'))
 
-    categories = Category.query.order_by(Category.name).all()
+    categories = catalog.get_categories()
     return render_template('orders/edit.html', order=order, categories=categories)
 
 @order_bp.route('/update_status/<int:id>', methods=['POST'])
@@ -159,103 +158,57 @@ def update_status(id):
     if new_status in ['Pending', 'Preparing', 'Ready', 'Served']:
         order.status = new_status
         db.session.commit()
+        publish_order_changed(order.id)
         flash('Status updated!', 'success')
     else:
         flash('Invalid status!', 'danger')
     return redirect(url_for('order.list'))
 
 
-from datetime import datetime, timezone  # ← yahan bhi import
-
-
 @order_bp.route('/mark_paid/<int:id>', methods=['POST'])
 @login_required
 @role_required('Cashier', 'Admin', 'Manager')
 def mark_paid(id):
     order = Order.query.get_or_404(id)
 
-    if order.is_paid:
-        flash('Order already paid!', 'info')
-        return redirect(url_for('order.list'))
-
     payment_mode = request.form.get('payment_mode')
-    if not payment_mode or payment_mode not in ['Cash', 'Online']:
+    if not payment_mode or payment_mode not in PAYMENT_MODES:
         flash('Please select a payment mode!', 'danger')
         return redirect(url_for('order.list'))
 
-    # Mark as paid
-    order.is_paid = True
-    order.paid_at = datetime.now(timezone.utc)
-    order.status = 'Paid'
-    db.session.commit()
-
-    # Generate bill
-    bill = Bill.query.filter_by(order_id=order.id).first()
-    if not bill:
-        total_items = order.total_amount
-        gst = total_items * 0
-        service_charge = total_items * 0
-        grand_total = total_items + gst + service_charge
-
-        bill = Bill(
-            order_id=order.id,
-            total_items=total_items,
-            gst=gst,
-            service_charge=service_charge,
-            grand_total=grand_total,
-            payment_mode=payment_mode  # ← SAVE PAYMENT MODE
-        )
-        db.session.add(bill)
-        db.session.commit()
+    # Payment + bill + finance entry ek hi transaction mein (double click safe)
+    try:
+        result = settle_order(order.id, payment_mode, request.form.get('idempotency_key'))
+    except SettlementError as e:
+        flash(str(e), 'danger')
+        return redirect(url_for('order.list'))
 
-        # Finance entry
-        from ..models.finance import FinanceTransaction, TransactionType
-        inflow = FinanceTransaction(
-            type=TransactionType.INFLOW,
-            amount=grand_total,
-            description=f'{payment_mode} payment for Order #{order.id}',
-        )
-        db.session.add(inflow)
-        db.session.commit()
+    if not (result.created or result.replayed):
+        flash('Order already paid!', 'info')
+        return redirect(url_for('order.list'))
 
+    if result.created:
+        publish_order_changed(order.id)
+        # PDF background mein ban jaaye, cashier ko render ka wait na karna pade. Payment commit ho
+        # chuka hai: queue fail ho to bhi success dikhao, invoice_pdf cache miss pe khud render karega
+        try:
+            jobs.enqueue('invoices.render_pdf', {'bill_id': result.bill_id},
+                         dedupe_key=f'invoice-pdf:{result.bill_id}')
+        except Exception:
+            db.session.rollback()
+            current_app.logger.exception('Could not queue invoice PDF for bill %s', result.bill_id)
     flash(f'Payment via {payment_mode} successful! Bill generated.', 'success')
-    return redirect(url_for('billing.view_invoice', id=bill.id))
+    return redirect(url_for('billing.view_invoice', id=result.bill_id))
 
 @order_bp.route('/view/<int:id>')
 @login_required
 def view_order(id):
     order = Order.query.get_or_404(id)
 
-    # Correct way to get bill
+    # Bill sirf payment (mark_paid -> settle_order) pe banta hai; GET pe kuch likhna nahi
     bill = Bill.query.filter_by(order_id=order.id).first()
-
     if not bill:
-        # Auto generate bill if not exists
-        total_items = order.total_amount
-        gst = total_items * 0
-        service_charge = total_items * 0
-        grand_total = total_items + gst + service_charge
-
-        bill = Bill(
-            order_id=order.id,
-            total_items=total_items,
-            gst=gst,
-            service_charge=service_charge,
-            grand_total=grand_total
-        )
-        db.session.add(bill)
-        db.session.commit()
-
-        # Add to finance
-        from ..models.finance import FinanceTransaction, TransactionType
-        inflow = FinanceTransaction(
-            type=TransactionType.INFLOW,
-            amount=grand_total,
-            description=f'Auto bill for Order #{order.id}',
-        )
-        db.session.add(inflow)
-        db.session.commit()
-
-        flash(f'Bill automatically generated for Order #{order.id}', 'success')
+        flash(f'Order #{order.id} is not paid yet. Take the payment to generate its bill.', 'info')
+        return redirect(url_for('order.list'))
 
     return redirect(url_for('billing.view_invoice', id=bill.id))
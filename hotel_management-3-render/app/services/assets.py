@@ -0,0 +1,147 @@
+"""Fingerprinted static assets with long-lived caching and pre-compression.
+
+Templates link assets with ``asset_url('css/style.css')``, which gives
+``/assets/css/style.<hash>.css`` where ``<hash>`` is the first 12 hex
+digits of the file's sha256. A changed file gets a new URL, so the
+response can be cached for a year as ``immutable``: a repeat visit costs
+no request at all for CSS/JS/fonts, and a deploy can't leave a tablet on
+stale Bootstrap. An old hash (a page cached before the deploy) still gets
+the current file, but with ``no-cache``.
+
+Text assets go out brotli- or gzip-compressed when the client accepts it.
+``flask build-assets`` writes ``.br`` / ``.gz`` files next to each asset
+at build time (brotli only when the ``brotli`` package is installed);
+without them the first request compresses with gzip in memory and keeps
+the result for the life of the worker.
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+
+from flask import current_app, url_for
+
+try:
+    import brotli
+except ImportError:  # optional; gzip se kaam chal jaata hai
+    brotli = None
+
+DIGEST_LENGTH = 12
+COMPRESSIBLE = ('.css', '.js', '.svg', '.json', '.txt', '.map')
+# Itne chhote files compress karne se fayda nahi
+MIN_COMPRESS_BYTES = 512
+_FINGERPRINTED = re.compile(r'^(.*)\.([0-9a-f]{%d})(\.[^./]+)$' % DIGEST_LENGTH)
+
+# {absolute path: (mtime, size, digest)}
+_digests = {}
+# {(absolute path, mtime, encoding): bytes}, jab .gz file disk pe na ho
+_compressed = {}
+
+
+def fingerprint(path):
+    """Short sha256 of the file at ``path``, recomputed only when it changes."""
+    stat = os.stat(path)
+    cached = _digests.get(path)
+    if cached and cached[:2] == (stat.st_mtime, stat.st_size):
+        return cached[2]
+    with open(path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:DIGEST_LENGTH]
+    _digests[path] = (stat.st_mtime, stat.st_size, digest)
+    return digest
+
+
+def split_fingerprint(filename):
+    """``'css/style.<hash>.css'`` -> ``('css/style.css', '<hash>')``; no hash -> ``(filename, None)``."""
+    match = _FINGERPRINTED.match(filename)
+    if not match:
+        return filename, None
+    stem, digest, ext = match.groups()
+    return stem + ext, digest
+
+
+def asset_url(filename):
+    """URL of a file under ``static/`` with its content hash in the name."""
+    path = os.path.join(current_app.static_folder, filename)
+    stem, ext = os.path.splitext(filename)
+    return url_for('assets.serve', filename=f'{stem}.{fingerprint(path)}{ext}')
+
+
+def asset_exists(filename):
+    """True if ``filename`` is present under ``static/`` (optional vendored files)."""
+    return os.path.isfile(os.path.join(current_app.static_folder, filename))
+
+
+def accepted_encodings(header):
+    """Encodings from an Accept-Encoding header that we can send, best first."""
+    offered = set()
+    for part in (header or '').split(','):
+        name, _, params = part.strip().partition(';')
+        quality = params.strip().replace(' ', '')
+        if quality.startswith('q=') and quality[2:].strip('0.') == '':
+            continue  # q=0: client ne mana kiya hai
+        offered.add(name.strip().lower())
+    return [encoding for encoding in ('br', 'gzip') if encoding in offered]
+
+
+def _variant_path(path, encoding):
+    return path + ('.br' if encoding == 'br' else '.gz')
+
+
+def compressed_body(path, encodings):
+    """``(encoding, bytes)`` of the best compressed variant, or ``(None, None)``.
+
+    A prebuilt ``.br`` / ``.gz`` is used only when it is newer than the asset.
+    """
+    if not path.endswith(COMPRESSIBLE):
+        return None, None
+    mtime = os.path.getmtime(path)
+    for encoding in encodings:
+        variant = _variant_path(path, encoding)
+        if os.path.exists(variant) and os.path.getmtime(variant) >= mtime:
+            with open(variant, 'rb') as f:
+                return encoding, f.read()
+    if 'gzip' not in encodings or os.path.getsize(path) < MIN_COMPRESS_BYTES:
+        return None, None
+    key = (path, mtime, 'gzip')
+    if key not in _compressed:
+        with open(path, 'rb') as f:
+            _compressed[key] = gzip.compress(f.read(), 9, mtime=0)
+    return 'gzip', _compressed[key]
+
+
+def build(static_folder):
+    """Write ``.gz`` (and ``.br`` if available) next to every compressible asset.
+
+    Returns ``(files, bytes_before, bytes_after)``, the smallest variant per file.
+    """
+    files = before = after = 0
+    for root, _, names in os.walk(static_folder):
+        for name in sorted(names):
+            path = os.path.join(root, name)
+            if not name.endswith(COMPRESSIBLE) or os.path.getsize(path) < MIN_COMPRESS_BYTES:
+                continue
+            with open(path, 'rb') as f:
+                data = f.read()
+            variants = {'gzip': gzip.compress(data, 9, mtime=0)}
+            if brotli is not None:
+                variants['br'] = brotli.compress(data, quality=11)
+            for encoding, body in variants.items():
+                with open(_variant_path(path, encoding), 'wb') as f:
+                    f.write(body)
+            files += 1
+            before += len(data)
+            after += min(len(body) for body in variants.values())
+    return files, before, after
+
+
+def content_type(filename):
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    if mimetype.startswith('text/') or mimetype in ('application/javascript', 'image/svg+xml'):
+        mimetype += '; charset=utf-8'
+    return mimetype
+
+
+def init_app(app):
+    app.add_template_global(asset_url)
+    app.add_template_global(asset_exists)
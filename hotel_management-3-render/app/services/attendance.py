@@ -0,0 +1,64 @@
+"""Attendance marking on top of the unique (employee_id, date) index.
+
+``mark_day`` writes a whole roster for one day as a single
+INSERT .. ON CONFLICT DO UPDATE, so re-submitting the form (or two
+managers submitting at once) corrects the day's entries instead of
+creating duplicates.
+"""
+from ..extensions import db
+from ..models.attendance import Attendance, AttendanceStatus
+from ..models.employee import Employee
+from . import payroll
+from .sql import dialect_insert
+
+_KEY = [Attendance.employee_id, Attendance.date]
+
+
+def parse_statuses(form, employee_ids):
+    """``{employee_id: AttendanceStatus}`` from ``status_<id>`` fields (blank = skip)."""
+    statuses = {}
+    for employee_id in employee_ids:
+        value = form.get(f'status_{employee_id}')
+        if value:
+            statuses[employee_id] = AttendanceStatus(value)  # ValueError on bad status
+    return statuses
+
+
+def roster(day):
+    """Employees on the rolls on ``day`` (hired, not resigned), by name."""
+    return Employee.query.filter(
+        Employee.hire_date <= day,
+        db.or_(Employee.resign_date.is_(None), Employee.resign_date > day),
+    ).order_by(Employee.name).all()
+
+
+def statuses_for(day, employee_ids):
+    """Existing ``{employee_id: status}`` for ``day`` (one query)."""
+    if not employee_ids:
+        return {}
+    rows = db.session.query(Attendance.employee_id, Attendance.status)\
+        .filter(Attendance.date == day, Attendance.employee_id.in_(employee_ids))
+    return dict(rows)
+
+
+def mark_day(day, statuses):
+    """Upsert every ``{employee_id: status}`` for ``day``. Caller commits."""
+    if not statuses:
+        return 0
+    rows = [{'employee_id': employee_id, 'date': day, 'status': status}
+            for employee_id, status in statuses.items()]
+    stmt = dialect_insert(Attendance).values(rows)
+    stmt = stmt.on_conflict_do_update(index_elements=_KEY, set_={'status': stmt.excluded.status})
+    db.session.execute(stmt)
+    payroll.invalidate(day)
+    return len(rows)
+
+
+def mark_one(employee_id, day, status):
+    """Insert one entry; False if the day is already marked. Caller commits."""
+    stmt = dialect_insert(Attendance).values(employee_id=employee_id, date=day, status=status)
+    stmt = stmt.on_conflict_do_nothing(index_elements=_KEY).returning(Attendance.id)
+    inserted = db.session.execute(stmt).scalar() is not None
+    if inserted:
+        payroll.invalidate(day)
+    return inserted
@@ -0,0 +1,68 @@
+"""Read-through cache of the menu catalog (categories + items).
+
+Order entry and the menu page render the whole menu on every GET although
+it changes maybe once a week. Each worker keeps a snapshot of plain
+tuples, tagged with the ``menu`` CacheVersion it was built from. A page
+view costs one primary-key lookup of that version; the categories/items
+are reloaded only after a write in menu_routes bumped it (in any worker).
+"""
+import threading
+from collections import namedtuple
+
+from sqlalchemy.orm import selectinload
+
+from ..models.cache_version import CacheVersion
+from ..models.menu import Category
+
+CATALOG = 'menu'
+
+CatalogCategory = namedtuple('CatalogCategory', 'id name items')
+CatalogItem = namedtuple('CatalogItem', 'id name price available category_id')
+
+_lock = threading.Lock()
+_snapshot = {'version': None, 'categories': ()}
+
+
+def _load():
+    categories = Category.query.options(selectinload(Category.items)).order_by(Category.name).all()
+    return tuple(
+        CatalogCategory(
+            id=category.id,
+            name=category.name,
+            items=tuple(
+                CatalogItem(item.id, item.name, item.price, item.available, item.category_id)
+                for item in sorted(category.items, key=lambda i: i.id)
+            ),
+        )
+        for category in categories
+    )
+
+
+def version():
+    """Current catalog version (one primary-key lookup); changes on every menu write."""
+    return CacheVersion.current(CATALOG)
+
+
+def get_categories(current=None):
+    """All categories (by name) with all their items, available or not.
+
+    Pass ``current`` when the caller already looked up ``version()``.
+    """
+    if current is None:
+        current = version()
+    with _lock:
+        if _snapshot['version'] == current:
+            return _snapshot['categories']
+
+    categories = _load()
+    with _lock:
+        _snapshot['version'] = current
+        _snapshot['categories'] = categories
+    return categories
+
+
+def invalidate():
+    """Call inside the transaction that changes the menu, before commit."""
+    CacheVersion.bump(CATALOG)
+    with _lock:
+        _snapshot['version'] = None
@@ -0,0 +1,85 @@
+"""Streaming CSV export for the orders, bills and expenses lists.
+
+Rows are read as plain tuples with ``yield_per`` (a server-side cursor on
+PostgreSQL, so the driver does not buffer the whole result either) and
+written out from a generator in chunks of CHUNK_ROWS, so memory stays flat
+whether the export is 100 rows or a million. ``?gzip=1`` compresses the
+stream on the fly.
+"""
+import csv
+import io
+import zlib
+from datetime import datetime, timezone
+from enum import Enum
+
+from flask import Response, stream_with_context
+
+from ..extensions import db
+from .date_window import local_tz
+
+CHUNK_ROWS = 1000
+
+
+def _cell(value, tz):
+    # Timestamps UTC mein stored hain; accountants ko local time chahiye
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.astimezone(tz).strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def csv_chunks(header, rows, chunk_rows=CHUNK_ROWS):
+    """Encoded CSV for ``rows``, one bytes chunk per ``chunk_rows`` rows."""
+    tz = local_tz()
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for count, row in enumerate(rows, start=1):
+        writer.writerow([_cell(value, tz) for value in row])
+        if count % chunk_rows == 0:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+def gzip_chunks(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # 31 = gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_name(prefix, window):
+    if window is None:
+        return f'{prefix}_all'
+    if window.is_single_day:
+        return f'{prefix}_{window.start_date}'
+    return f'{prefix}_{window.start_date}_{window.end_date}'
+
+
+def export_response(name, header, statement, compress=False):
+    """Stream ``statement`` (a select of plain columns) as a CSV download."""
+    def rows():
+        result = db.session.execute(statement.execution_options(yield_per=CHUNK_ROWS))
+        try:
+            yield from csv_chunks(header, result)
+        finally:
+            result.close()
+
+    chunks = rows()
+    filename = f'{name}.csv'
+    mimetype = 'text/csv'
+    if compress:
+        chunks = gzip_chunks(chunks)
+        filename += '.gz'
+        mimetype = 'application/gzip'
+
+    return Response(stream_with_context(chunks), mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename="{filename}"',
+                             'X-Accel-Buffering': 'no'})
@@ -0,0 +1,83 @@
+"""Per-day sales rollup (DailySales) used by the dashboards.
+
+record_order / record_bill add to the day's row with an upsert inside the
+caller's transaction, so a dashboard over a month sums ~30 rows instead of
+loading every bill. rebuild() recomputes a date range from the orders and
+bills themselves, for backfill or when something was written around these
+hooks.
+"""
+from collections import namedtuple
+from datetime import timedelta
+
+from ..extensions import db
+from ..models.billing import Bill
+from ..models.daily_sales import DailySales
+from ..models.order import Order
+from .date_window import DateWindow, local_day
+from .sql import dialect_insert
+
+SalesTotals = namedtuple('SalesTotals', 'order_count bill_count total_revenue cash_revenue online_revenue')
+
+_COUNTERS = SalesTotals._fields
+
+
+def _bump(day, **deltas):
+    values = {name: deltas.get(name, 0) for name in _COUNTERS}
+    stmt = dialect_insert(DailySales).values(day=day, **values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DailySales.day],
+        set_={name: getattr(DailySales, name) + stmt.excluded[name] for name in deltas},
+    )
+    db.session.execute(stmt)
+
+
+def record_order(created_at):
+    _bump(local_day(created_at), order_count=1)
+
+
+def record_bill(generated_at, payment_mode, amount):
+    mode_column = 'cash_revenue' if payment_mode == 'Cash' else 'online_revenue'
+    _bump(local_day(generated_at), bill_count=1, total_revenue=amount, **{mode_column: amount})
+
+
+def totals(window):
+    row = db.session.execute(
+        db.select(*(db.func.coalesce(db.func.sum(getattr(DailySales, name)), 0) for name in _COUNTERS))
+        .where(DailySales.day.between(window.start_date, window.end_date))
+    ).one()
+    return SalesTotals(*row)
+
+
+def rebuild(start_date, end_date):
+    """Recompute rows for ``start_date`` .. ``end_date`` and commit. Returns days written."""
+    db.session.execute(db.delete(DailySales).where(DailySales.day.between(start_date, end_date)))
+    written = 0
+    day = start_date
+    while day <= end_date:
+        window = DateWindow.for_day(day)
+        order_count = db.session.execute(
+            db.select(db.func.count(Order.id)).where(window.filter(Order.created_at))
+        ).scalar()
+        bills = {
+            mode: (count, total)
+            for mode, count, total in db.session.execute(
+                db.select(Bill.payment_mode, db.func.count(Bill.id), db.func.coalesce(db.func.sum(Bill.grand_total), 0))
+                .where(window.filter(Bill.generated_at))
+                .group_by(Bill.payment_mode)
+            )
+        }
+        if order_count or bills:
+            cash = bills.get('Cash', (0, 0))[1]
+            online = bills.get('Online', (0, 0))[1]
+            db.session.add(DailySales(
+                day=day,
+                order_count=order_count,
+                bill_count=sum(count for count, _ in bills.values()),
+                cash_revenue=cash,
+                online_revenue=online,
+                total_revenue=sum(total for _, total in bills.values()),
+            ))
+            written += 1
+        day += timedelta(days=1)
+    db.session.commit()
+    return written
@@ -0,0 +1,181 @@
+"""Engine options per config profile, SQLite tuning and pool wait logging.
+
+``engine_options`` builds SQLALCHEMY_ENGINE_OPTIONS from the DB_* settings:
+
+* PostgreSQL: each gunicorn worker gets ``GUNICORN_THREADS`` pooled
+  connections (a thread holds at most one) and may overflow up to its
+  share of ``DB_MAX_CONNECTIONS - DB_RESERVED_CONNECTIONS``, so all the
+  workers together never exceed the server limit. sslmode and the
+  server-side statement / idle-in-transaction timeouts go in as connect
+  args.
+* SQLite file databases: WAL journal (readers don't block the writer),
+  ``synchronous=NORMAL``, a bigger page cache, a busy timeout and foreign
+  keys on, set on every new connection. In-memory databases are left as is.
+
+``init_app`` also times how long a request waits for a pooled
+connection. The pool has no event before a checkout starts waiting, so
+the session marks the moment it starts a transaction
+(``after_transaction_create``) and the pool's ``checkout`` event measures
+from there; the ``connect`` event flags checkouts that had to open a new
+connection. Waits longer than DB_POOL_SLOW_CHECKOUT are logged with the
+pool status, and a request that fails because the pool is exhausted is
+logged too. Other code (the /metrics registry) can subscribe with
+``on_checkout_wait``.
+"""
+import logging
+import threading
+import time
+
+from flask import got_request_exception
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import QueuePool
+
+from ..extensions import db
+
+log = logging.getLogger(__name__)
+
+# Is thread ka session kab connection maangne wala hai (perf_counter)
+_requested = threading.local()
+
+
+def pool_budget(config):
+    """``(pool_size, max_overflow)`` for one worker process."""
+    workers = max(1, config.get('WEB_CONCURRENCY', 1))
+    threads = max(1, config.get('GUNICORN_THREADS', 1))
+    usable = config.get('DB_MAX_CONNECTIONS', 20) - config.get('DB_RESERVED_CONNECTIONS', 3)
+    per_worker = usable // workers
+    if per_worker < 1:
+        log.warning('DB_MAX_CONNECTIONS=%s is too small for %s workers; using 1 connection per worker',
+                    config.get('DB_MAX_CONNECTIONS'), workers)
+        per_worker = 1
+    pool_size = config.get('DB_POOL_SIZE') or min(threads, per_worker)
+    return pool_size, max(0, per_worker - pool_size)
+
+
+def _is_memory_sqlite(url):
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+
+def engine_options(config):
+    uri = config.get('SQLALCHEMY_DATABASE_URI')
+    if not uri:
+        return {}
+    url = make_url(uri)
+    backend = url.get_backend_name()
+    if backend == 'sqlite':
+        if _is_memory_sqlite(url):
+            return {}
+        return {'pool_timeout': config.get('DB_POOL_TIMEOUT', 10)}
+
+    pool_size, max_overflow = pool_budget(config)
+    options = {
+        'pool_pre_ping': True,
+        'pool_recycle': config.get('DB_POOL_RECYCLE', 300),
+        'pool_size': pool_size,
+        'max_overflow': max_overflow,
+        'pool_timeout': config.get('DB_POOL_TIMEOUT', 10),
+    }
+    if backend == 'postgresql':
+        connect_args = {}
+        if config.get('DB_SSLMODE'):
+            connect_args['sslmode'] = config['DB_SSLMODE']
+        settings = []
+        if config.get('DB_STATEMENT_TIMEOUT_MS'):
+            settings.append(f"-c statement_timeout={config['DB_STATEMENT_TIMEOUT_MS']}")
+        if config.get('DB_IDLE_IN_TRANSACTION_TIMEOUT_MS'):
+            settings.append(f"-c idle_in_transaction_session_timeout={config['DB_IDLE_IN_TRANSACTION_TIMEOUT_MS']}")
+        if settings:
+            connect_args['options'] = ' '.join(settings)
+        if connect_args:
+            options['connect_args'] = connect_args
+    return options
+
+
+def _sqlite_pragmas(config):
+    wal = config.get('SQLITE_WAL', True)
+    busy_timeout = int(config.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f'PRAGMA busy_timeout = {busy_timeout}')
+        cursor.execute('PRAGMA foreign_keys = ON')
+        if wal:
+            cursor.execute('PRAGMA journal_mode = WAL')
+            # WAL ke saath NORMAL safe hai (crash pe sirf last commit ja sakta hai, corruption nahi)
+            cursor.execute('PRAGMA synchronous = NORMAL')
+        cursor.execute('PRAGMA cache_size = -20000')  # ~20 MB
+        cursor.execute('PRAGMA temp_store = MEMORY')
+        cursor.execute('PRAGMA mmap_size = 268435456')
+        cursor.close()
+
+    return on_connect
+
+
+def on_checkout_wait(app, callback):
+    """Call ``callback(seconds)`` after every pool checkout of ``app``'s engine."""
+    app.extensions.setdefault('db_checkout_wait', []).append(callback)
+
+
+def _mark_request(session, transaction):
+    if transaction.parent is None:
+        _requested.at = time.perf_counter()
+
+
+def _clear_request(session, transaction):
+    if transaction.parent is None:
+        _requested.at = None
+
+
+def _waited():
+    start = getattr(_requested, 'at', None)
+    return None if start is None else time.perf_counter() - start
+
+
+def time_checkouts(app, engine):
+    """Listen to ``engine``'s pool events; engine-level listeners survive ``dispose()``."""
+    callbacks = app.extensions.setdefault('db_checkout_wait', [])
+    slow = app.config.get('DB_POOL_SLOW_CHECKOUT', 0.5)
+
+    def on_connect(dbapi_connection, connection_record):
+        connection_record.info['new'] = True
+
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        opened = connection_record.info.pop('new', False)
+        wait = _waited()
+        if wait is None:
+            return  # session ke bahar ka checkout (CLI, engine.connect()): start pata nahi
+        _requested.at = None
+        for callback in callbacks:
+            callback(wait)
+        if slow and wait >= slow:
+            app.logger.warning('Slow DB pool checkout: waited %.2fs (%s%s)', wait, engine.pool.status(),
+                               ', opened a new connection' if opened else '')
+
+    def on_exception(sender, exception, **extra):
+        if isinstance(exception, PoolTimeout):
+            app.logger.error('DB pool exhausted: no connection after %.1fs (%s)',
+                             _waited() or 0.0, engine.pool.status())
+
+    event.listen(engine, 'connect', on_connect)
+    event.listen(engine, 'checkout', on_checkout)
+    app.extensions['db_pool_exhausted'] = on_exception  # signal sirf weak reference rakhta hai
+    got_request_exception.connect(on_exception, app)
+
+
+def init_app(app):
+    with app.app_context():
+        engine = db.engine
+    if engine.dialect.name == 'sqlite' and not _is_memory_sqlite(engine.url):
+        event.listen(engine, 'connect', _sqlite_pragmas(app.config))
+
+    if isinstance(engine.pool, QueuePool):
+        app.logger.debug('DB pool: size=%s overflow=%s timeout=%ss',
+                         engine.pool.size(), engine.pool._max_overflow, engine.pool._timeout)
+
+    time_checkouts(app, engine)
+    if not event.contains(Session, 'after_transaction_create', _mark_request):
+        event.listen(Session, 'after_transaction_create', _mark_request)
+        event.listen(Session, 'after_transaction_end', _clear_request)
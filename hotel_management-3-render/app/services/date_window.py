@@ -0,0 +1,100 @@
+"""Shared date filter for list, dashboard and report views.
+
+Every list page accepts either ``?date=YYYY-MM-DD`` or
+``?start_date=...&end_date=...``. DateWindow turns that into a half-open
+``[start, end)`` range of naive UTC timestamps (the way ``created_at``,
+``generated_at`` etc. are stored), so the filter is a plain range on the
+indexed column instead of ``date(column)``, which forces a full scan.
+"""
+from datetime import datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from flask import current_app
+
+from ..extensions import db
+
+
+def local_tz():
+    return ZoneInfo(current_app.config.get('RESTAURANT_TIMEZONE', 'Asia/Kolkata'))
+
+
+def local_today():
+    """Aaj ki date restaurant ke timezone mein (server UTC pe ho tab bhi)."""
+    return datetime.now(local_tz()).date()
+
+
+def to_utc_naive(local_day):
+    """Local midnight of ``local_day`` as naive UTC, matching stored timestamps."""
+    start = datetime.combine(local_day, time.min, tzinfo=local_tz())
+    return start.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def local_day(moment):
+    """Business day (local date) of a UTC timestamp; naive values are taken as UTC."""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(local_tz()).date()
+
+
+def _parse(value):
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+class DateWindow:
+    """Inclusive range of local business days, ``start_date`` .. ``end_date``."""
+
+    def __init__(self, start_date, end_date):
+        self.start_date = start_date
+        self.end_date = end_date
+
+    @classmethod
+    def for_day(cls, day):
+        return cls(day, day)
+
+    @classmethod
+    def today(cls):
+        return cls.for_day(local_today())
+
+    @classmethod
+    def from_args(cls, args, default_today=True):
+        """Build a window from request args.
+
+        Raises ValueError (message flash karne layak) on bad input. With no
+        filter in the args, returns today's window, or None when
+        ``default_today`` is False (e.g. inventory shows everything).
+        """
+        filter_date_str = args.get('date')
+        start_date_str = args.get('start_date')
+        end_date_str = args.get('end_date')
+
+        if filter_date_str:
+            try:
+                return cls.for_day(_parse(filter_date_str))
+            except ValueError:
+                raise ValueError('Invalid date format!')
+
+        if start_date_str and end_date_str:
+            try:
+                start_date = _parse(start_date_str)
+                end_date = _parse(end_date_str)
+            except ValueError:
+                raise ValueError('Invalid date range!')
+            if start_date > end_date:
+                raise ValueError('From date cannot be after To date!')
+            return cls(start_date, end_date)
+
+        return cls.today() if default_today else None
+
+    @property
+    def is_single_day(self):
+        return self.start_date == self.end_date
+
+    @property
+    def bounds(self):
+        """``(start, end)`` naive UTC datetimes; end is exclusive."""
+        return to_utc_naive(self.start_date), to_utc_naive(self.end_date + timedelta(days=1))
+
+    def filter(self, column):
+        """SQL predicate ``start <= column < end`` (index friendly)."""
+        start, end = self.bounds
+        return db.and_(column >= start, column < end)
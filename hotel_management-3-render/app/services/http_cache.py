@@ -0,0 +1,89 @@
+"""Conditional GET for pages whose content has a cheap version.
+
+A settled bill never changes and the menu changes maybe once a week, yet
+every view re-rendered the invoice template, rebuilt the PDF response or
+re-rendered the whole menu. ``conditional`` answers a repeat view with a
+304 before any of that work:
+
+    tag = http_cache.page_etag('invoice', content_hash(invoice_data(bill)))
+    return http_cache.conditional(tag, lambda: render_template(...), last_modified=bill.generated_at)
+
+The ETag covers the content version plus what base.html prints around it
+(the user's name and role, so one browser switching users never gets a 304
+for someone else's page) and the release, so a deploy with new templates
+or assets re-renders everything once. A page with flash messages waiting
+is always rendered, otherwise the 304 would hide them.
+
+Responses are ``private`` (logged-in pages, never in a shared cache) with
+``Vary: Cookie``. Roles on shared tills and tablets (HTTP_CACHE_SHARED_ROLES)
+always revalidate, so logging out or changing role takes effect on the
+next view; the others may keep immutable content (invoices) for
+HTTP_CACHE_MAX_AGE seconds without asking.
+"""
+import hashlib
+import os
+from datetime import timezone
+
+from flask import current_app, make_response, request, session
+from flask_login import current_user
+
+_release = {}
+
+
+def release():
+    """Deploy id: RELEASE_ID, else a hash of the template and static file stamps (once per process)."""
+    configured = current_app.config.get('RELEASE_ID')
+    if configured:
+        return configured
+    root = current_app.root_path
+    if root not in _release:
+        stamps = hashlib.sha256()
+        for folder in (current_app.template_folder, current_app.static_folder):
+            for dirpath, _, names in os.walk(os.path.join(root, folder)):
+                for name in sorted(names):
+                    stat = os.stat(os.path.join(dirpath, name))
+                    stamps.update(f'{dirpath}/{name}:{stat.st_mtime_ns}:{stat.st_size};'.encode())
+        _release[root] = stamps.hexdigest()[:12]
+    return _release[root]
+
+
+def page_etag(*parts):
+    """ETag for a page built from ``parts`` (content versions) for the current user."""
+    viewer = (current_user.get_id(), current_user.username, current_user.role.value) \
+        if current_user.is_authenticated else ('anonymous',)
+    raw = '|'.join(str(part) for part in (release(), *viewer, *parts))
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32]
+
+
+def cache_control(response, immutable=False):
+    shared_roles = {role.upper() for role in current_app.config.get('HTTP_CACHE_SHARED_ROLES', ())}
+    role = current_user.role.value.upper() if current_user.is_authenticated else None
+    max_age = current_app.config.get('HTTP_CACHE_MAX_AGE', 0)
+    if immutable and max_age and role not in shared_roles:
+        response.headers['Cache-Control'] = f'private, max-age={max_age}'
+    else:
+        response.headers['Cache-Control'] = 'private, no-cache'
+    response.vary.add('Cookie')
+    return response
+
+
+def conditional(etag, build, last_modified=None, immutable=False):
+    """``build()`` the response unless the client's copy (If-None-Match / If-Modified-Since) is current."""
+    if last_modified is not None and last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)  # DB mein UTC naive hai
+
+    fresh = False
+    if '_flashes' not in session:
+        if request.if_none_match:
+            fresh = request.if_none_match.contains_weak(etag)
+        elif last_modified is not None and request.if_modified_since:
+            fresh = last_modified.replace(microsecond=0) <= request.if_modified_since
+
+    if fresh:
+        response = current_app.response_class(status=304)
+    else:
+        response = make_response(build())
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    return cache_control(response, immutable)
@@ -0,0 +1,106 @@
+"""Per-worker cache of the logged-in user's identity for Flask-Login.
+
+``load_user`` used to run ``User.query.get`` on every authenticated
+request. Each worker now keeps a small LRU of UserIdentity (id, username,
+role) entries that expire after USER_CACHE_TTL seconds.
+
+Changes reach every worker through the ``users`` CacheVersion, bumped by
+the User mapper events in models/user.py. A worker reads that version at
+most once per USER_CACHE_CHECK_SECONDS and drops its cache when it has
+moved, so a role change is picked up everywhere within that interval
+without a query per request. USER_CACHE_TTL = 0 switches the cache off.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+
+from ..extensions import db
+from ..models.cache_version import CacheVersion
+from ..models.user import IDENTITY_CACHE, User
+
+
+class UserIdentity:
+    """What views need of ``current_user``: id, username and role."""
+
+    __slots__ = ('id', 'username', 'role')
+
+    is_authenticated = True
+    is_active = True
+    is_anonymous = False
+
+    def __init__(self, id, username, role):
+        self.id = id
+        self.username = username
+        self.role = role
+
+    def get_id(self):
+        return str(self.id)
+
+    def __eq__(self, other):
+        return isinstance(other, (UserIdentity, User)) and self.id == other.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+
+_lock = threading.Lock()
+_cache = OrderedDict()  # user_id -> (identity, expires_at)
+_state = {'version': None, 'checked_at': None}
+
+
+def _sync_version(now, interval):
+    with _lock:
+        checked_at = _state['checked_at']
+        if checked_at is not None and now - checked_at < interval:
+            return
+        _state['checked_at'] = now
+
+    version = CacheVersion.current(IDENTITY_CACHE)
+    with _lock:
+        if _state['version'] != version:
+            _cache.clear()
+            _state['version'] = version
+
+
+def _fetch(user_id):
+    row = db.session.execute(
+        db.select(User.id, User.username, User.role).where(User.id == user_id)
+    ).first()
+    return UserIdentity(*row) if row else None
+
+
+def load(user_id):
+    """UserIdentity for ``user_id`` (None if the user no longer exists)."""
+    config = current_app.config
+    ttl = config.get('USER_CACHE_TTL', 300)
+    if not ttl:
+        return _fetch(user_id)
+
+    now = time.monotonic()
+    _sync_version(now, config.get('USER_CACHE_CHECK_SECONDS', 5))
+
+    with _lock:
+        entry = _cache.get(user_id)
+        if entry and entry[1] > now:
+            _cache.move_to_end(user_id)
+            return entry[0]
+
+    found = _fetch(user_id)
+    if found is not None:
+        with _lock:
+            _cache[user_id] = (found, now + ttl)
+            _cache.move_to_end(user_id)
+            while len(_cache) > config.get('USER_CACHE_SIZE', 1024):
+                _cache.popitem(last=False)
+    return found
+
+
+def forget(user_id=None):
+    """Drop one user (or everyone) from this worker's cache."""
+    with _lock:
+        if user_id is None:
+            _cache.clear()
+        else:
+            _cache.pop(user_id, None)
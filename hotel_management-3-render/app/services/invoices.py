@@ -0,0 +1,153 @@
+"""Invoice PDFs: a content-addressed disk cache plus batch rendering.
+
+A bill's PDF is stored as ``<bill_id>-<hash>.pdf`` in INVOICE_CACHE_DIR,
+where the hash covers every field printed on the invoice (and
+RENDER_VERSION, bump it when the layout changes). A settled bill never
+changes, so repeat downloads are served straight from the file; if a bill
+ever is edited its hash changes and it gets re-rendered.
+
+``render_batch`` renders the missing PDFs of a whole date range and
+writes them into one zip for the auditor. ``flask export-invoices`` runs
+it with a process pool (ReportLab is pure Python, so threads would not
+help); the download route renders inline with ``workers=1``, since the
+``invoices.render_pdf`` job has usually cached every PDF already and a
+web worker should not fork a pool per request.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from flask import current_app
+
+from ..extensions import db
+from ..models.billing import Bill
+from . import jobs
+
+RENDER_VERSION = 1
+
+# Itne se kam PDFs ke liye pool start karna render se mehenga padta hai
+POOL_THRESHOLD = 8
+
+
+def invoice_data(bill):
+    """Plain (picklable) values printed on the invoice."""
+    return {
+        'id': bill.id,
+        'order_id': bill.order_id,
+        'generated_at': bill.generated_at.strftime('%Y-%m-%d %H:%M'),
+        'payment_mode': bill.payment_mode,
+        'total_items': str(bill.total_items),
+        'gst': str(bill.gst),
+        'service_charge': str(bill.service_charge),
+        'grand_total': str(bill.grand_total),
+    }
+
+
+def content_hash(data):
+    raw = json.dumps([RENDER_VERSION, data], sort_keys=True).encode('utf-8')
+    return hashlib.sha256(raw).hexdigest()[:16]
+
+
+def render_invoice(data):
+    """PDF bytes for one invoice. Runs in pool workers: no app or DB access here."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    buffer = BytesIO()
+    p = canvas.Canvas(buffer, pagesize=letter)
+    width, height = letter
+
+    p.setFont("Helvetica-Bold", 20)
+    p.drawString(50, height - 50, "Hotel Management Invoice")
+
+    p.setFont("Helvetica", 12)
+    p.drawString(50, height - 100, f"Invoice ID: #{data['id']}")
+    p.drawString(50, height - 120, f"Order ID: #{data['order_id']}")
+    p.drawString(50, height - 140, f"Generated: {data['generated_at']}")
+    p.drawString(50, height - 160, f"Payment Mode: {data['payment_mode']}")
+
+    p.drawString(50, height - 200, "Items Total:")
+    p.drawString(400, height - 200, f"₹{data['total_items']}")
+
+    p.drawString(50, height - 220, "GST (18%):")
+    p.drawString(400, height - 220, f"₹{data['gst']}")
+
+    p.drawString(50, height - 240, "Service Charge (5%):")
+    p.drawString(400, height - 240, f"₹{data['service_charge']}")
+
+    p.setFont("Helvetica-Bold", 16)
+    p.drawString(50, height - 280, "Grand Total:")
+    p.drawString(400, height - 280, f"₹{data['grand_total']}")
+
+    p.save()
+    return buffer.getvalue()
+
+
+def cache_dir():
+    path = current_app.config.get('INVOICE_CACHE_DIR') or os.path.join(current_app.instance_path, 'invoices')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def cache_path(data, directory=None):
+    return os.path.join(directory or cache_dir(), f"{data['id']}-{content_hash(data)}.pdf")
+
+
+def _store(path, pdf):
+    # Temp file + rename, taaki dusra worker kabhi aadhi likhi file na padhe
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(pdf)
+    os.replace(tmp, path)
+
+
+def invoice_pdf(bill):
+    """Path of the bill's PDF, rendering it on a cache miss."""
+    data = invoice_data(bill)
+    path = cache_path(data)
+    if not os.path.exists(path):
+        _store(path, render_invoice(data))
+    return path
+
+
+@jobs.task('invoices.render_pdf')
+def render_pdf_job(bill_id):
+    """Background: put a freshly settled bill's PDF in the cache before anyone downloads it."""
+    bill = db.session.get(Bill, bill_id)
+    if bill is not None:
+        invoice_pdf(bill)
+
+
+def render_batch(bills, workers=None):
+    """Cached PDF paths for ``bills`` (same order); misses are rendered in a pool.
+
+    Returns ``(paths, rendered_count)``.
+    """
+    directory = cache_dir()
+    entries = [(data, cache_path(data, directory)) for data in map(invoice_data, bills)]
+    missing = [(data, path) for data, path in entries if not os.path.exists(path)]
+
+    workers = workers or current_app.config.get('INVOICE_WORKERS') or os.cpu_count() or 1
+    if workers > 1 and len(missing) >= POOL_THRESHOLD:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunksize = max(1, len(missing) // (workers * 4))
+            pdfs = pool.map(render_invoice, [data for data, _ in missing], chunksize=chunksize)
+            for (data, path), pdf in zip(missing, pdfs):
+                _store(path, pdf)
+    else:
+        for data, path in missing:
+            _store(path, render_invoice(data))
+
+    return [path for _, path in entries], len(missing)
+
+
+def write_zip(paths, fileobj):
+    """Write the PDFs into ``fileobj`` as ``invoice_<id>.pdf`` entries."""
+    with zipfile.ZipFile(fileobj, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for path in paths:
+            bill_id = os.path.basename(path).split('-')[0]
+            archive.write(path, f'invoice_{bill_id}.pdf')
@@ -0,0 +1,318 @@
+"""Durable background jobs: a queue table in the app database plus workers.
+
+Slow work that the user doesn't need to wait for goes into the ``job``
+table after the request's own commit, and the handler returns at once::
+
+    @jobs.task('invoices.render_pdf')
+    def render_pdf(bill_id): ...
+
+    jobs.enqueue('invoices.render_pdf', {'bill_id': bill.id}, dedupe_key=f'invoice-pdf:{bill.id}')
+
+A worker claims one due job at a time with a single
+``UPDATE .. WHERE id = (SELECT .. FOR UPDATE SKIP LOCKED) RETURNING`` (on
+SQLite the write lock does the same job), so any number of workers can
+share the table. Workers run either
+
+* on their own: ``flask worker``, the production setup (a separate
+  service; JOB_WORKER_THREADS is 0 on the web service by default, so web
+  workers never poll the queue); or
+* inside the web process: JOB_WORKER_THREADS threads (1 in the local
+  profile, so ``flask run`` alone processes jobs), started on the first
+  request (so CLI commands and the gunicorn master never start them) and
+  woken right away by ``enqueue`` in the same process.
+
+A job that raises is retried JOB_MAX_ATTEMPTS times with exponential
+backoff (JOB_RETRY_BASE_SECONDS doubling, capped at
+JOB_RETRY_MAX_SECONDS, with jitter), then left as ``failed`` with its
+error. A job still ``running`` after JOB_TIMEOUT_SECONDS (its worker
+died) goes back to the queue. ``dedupe_key`` is unique while the job is
+waiting or running: enqueueing the same key again is a no-op. Finished
+jobs are deleted after JOB_RETENTION_HOURS.
+
+Tasks must be idempotent: a job can run again if its worker dies between
+doing the work and marking it done.
+
+Metrics (services/metrics): ``jobs{status,task}`` and
+``jobs_oldest_queued_seconds`` are read from the table on every scrape;
+``job_queue_wait_seconds`` (due -> started) and ``job_duration_seconds``
+are recorded by the worker that ran the job (a separate ``flask worker``
+shows up in /metrics through METRICS_DIR).
+"""
+import atexit
+import logging
+import os
+import random
+import socket
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+
+from ..extensions import db
+from ..models.job import Job, JobStatus
+from . import metrics
+from .sql import dialect_insert
+
+log = logging.getLogger(__name__)
+
+JOB_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 900)
+
+# {name: function}
+TASKS = {}
+
+ClaimedJob = namedtuple('ClaimedJob', 'id task payload attempts max_attempts run_at started_at')
+
+# enqueue() isi process ke saare waiting worker threads ko turant jagata hai (poll ka wait nahi)
+_wake = threading.Condition()
+_start_lock = threading.Lock()
+
+
+def _utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def task(name):
+    """Register the decorated function as task ``name``; payload keys become its keyword arguments."""
+    def register(func):
+        TASKS[name] = func
+        return func
+    return register
+
+
+def enqueue(name, payload=None, dedupe_key=None, delay=0, max_attempts=None, commit=True):
+    """Queue task ``name``; returns the job id, or None if ``dedupe_key`` is already queued.
+
+    Call it after the request's own commit. ``commit=False`` leaves the job
+    in the caller's transaction instead (it then only exists if that commits).
+    """
+    if name not in TASKS:
+        raise LookupError(f'Unknown task {name!r}')
+    now = _utcnow()
+    stmt = dialect_insert(Job).values(
+        task=name,
+        payload=payload or {},
+        status=JobStatus.QUEUED,
+        dedupe_key=dedupe_key,
+        attempts=0,
+        max_attempts=max_attempts or current_app.config.get('JOB_MAX_ATTEMPTS', 5),
+        run_at=now + timedelta(seconds=delay),
+        enqueued_at=now,
+    )
+    if dedupe_key:
+        stmt = stmt.on_conflict_do_nothing(index_elements=['dedupe_key'])
+    job_id = db.session.execute(stmt.returning(Job.id)).scalar()
+    if commit:
+        db.session.commit()
+        if job_id is not None:
+            _notify()
+    return job_id
+
+
+def _notify():
+    with _wake:
+        _wake.notify_all()
+
+
+def claim(worker_id):
+    """Mark the next due job as running for ``worker_id`` and return it (ClaimedJob), or None."""
+    now = _utcnow()
+    due = (
+        db.select(Job.id)
+        .where(Job.status == JobStatus.QUEUED, Job.run_at <= now)
+        .order_by(Job.run_at, Job.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    row = db.session.execute(
+        db.update(Job)
+        .where(Job.id == due, Job.status == JobStatus.QUEUED)
+        .values(status=JobStatus.RUNNING, locked_by=worker_id, started_at=now, attempts=Job.attempts + 1)
+        .returning(Job.id, Job.task, Job.payload, Job.attempts, Job.max_attempts, Job.run_at, Job.started_at)
+        .execution_options(synchronize_session=False)
+    ).first()
+    db.session.commit()
+    return ClaimedJob(*row) if row else None
+
+
+def retry_delay(attempts, config):
+    """Seconds before attempt ``attempts + 1``: base * 2^(attempts-1), capped, +-10% jitter."""
+    base = config.get('JOB_RETRY_BASE_SECONDS', 5)
+    delay = min(base * 2 ** (attempts - 1), config.get('JOB_RETRY_MAX_SECONDS', 3600))
+    return delay * random.uniform(0.9, 1.1)
+
+
+def _finish(job_id, **values):
+    db.session.execute(
+        db.update(Job).where(Job.id == job_id).values(locked_by=None, **values)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+
+
+def execute(job, config):
+    """Run one claimed job and record the outcome; returns 'done', 'retry' or 'failed'."""
+    wait = max(0.0, (job.started_at - job.run_at).total_seconds())
+    metrics.registry.observe('job_queue_wait_seconds', wait, JOB_BUCKETS, task=job.task)
+    start = time.perf_counter()
+    try:
+        func = TASKS.get(job.task)
+        if func is None:
+            raise LookupError(f'Unknown task {job.task!r}')
+        func(**job.payload)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        error = f'{type(e).__name__}: {e}'
+        if job.attempts < job.max_attempts:
+            outcome = 'retry'
+            delay = retry_delay(job.attempts, config)
+            log.warning('Job %s (%s) attempt %d/%d failed, retrying in %.0fs: %s',
+                        job.id, job.task, job.attempts, job.max_attempts, delay, error)
+            _finish(job.id, status=JobStatus.QUEUED, last_error=error,
+                    run_at=_utcnow() + timedelta(seconds=delay))
+        else:
+            outcome = 'failed'
+            log.exception('Job %s (%s) failed after %d attempts', job.id, job.task, job.attempts)
+            _finish(job.id, status=JobStatus.FAILED, last_error=error, finished_at=_utcnow(), dedupe_key=None)
+    else:
+        outcome = 'done'
+        _finish(job.id, status=JobStatus.DONE, finished_at=_utcnow(), dedupe_key=None)
+    metrics.registry.observe('job_duration_seconds', time.perf_counter() - start, JOB_BUCKETS,
+                             task=job.task, outcome=outcome)
+    return outcome
+
+
+def housekeeping(config):
+    """Requeue jobs whose worker died and delete old finished ones."""
+    now = _utcnow()
+    stale = db.and_(
+        Job.status == JobStatus.RUNNING,
+        Job.started_at < now - timedelta(seconds=config.get('JOB_TIMEOUT_SECONDS', 600)),
+    )
+    lost = 'worker lost (no result within JOB_TIMEOUT_SECONDS)'
+    failed = db.session.execute(
+        db.update(Job).where(stale, Job.attempts >= Job.max_attempts)
+        .values(status=JobStatus.FAILED, locked_by=None, finished_at=now, dedupe_key=None, last_error=lost)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    requeued = db.session.execute(
+        db.update(Job).where(stale)
+        .values(status=JobStatus.QUEUED, locked_by=None, run_at=now, last_error=lost)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.execute(
+        db.delete(Job).where(
+            Job.status == JobStatus.DONE,
+            Job.finished_at < now - timedelta(hours=config.get('JOB_RETENTION_HOURS', 24)),
+        ).execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    if failed or requeued:
+        log.warning('Jobs from lost workers: %d requeued, %d failed', requeued, failed)
+
+
+def queue_stats():
+    """``({(status, task): count}, oldest_due_queued_seconds)`` of jobs not done yet."""
+    now = _utcnow()
+    counts = {
+        (status, name): count
+        for status, name, count in db.session.execute(
+            db.select(Job.status, Job.task, db.func.count())
+            .where(Job.status != JobStatus.DONE)
+            .group_by(Job.status, Job.task)
+        )
+    }
+    oldest = db.session.execute(
+        db.select(db.func.min(Job.run_at)).where(Job.status == JobStatus.QUEUED, Job.run_at <= now)
+    ).scalar()
+    if isinstance(oldest, str):  # SQLite func.min() ka result type nahi jaanta
+        oldest = datetime.fromisoformat(oldest)
+    return counts, (now - oldest).total_seconds() if oldest else 0.0
+
+
+def _report_queue(registry):
+    counts, oldest = queue_stats()
+    for (status, name), count in counts.items():
+        registry.set('jobs', count, status=status, task=name)
+    registry.set('jobs_oldest_queued_seconds', oldest)
+
+
+class Worker:
+    """``threads`` polling threads bound to ``app``."""
+
+    def __init__(self, app, threads=1):
+        self.app = app
+        self.threads = threads
+        self.name = f'{socket.gethostname()}:{os.getpid()}'
+        self._stop = threading.Event()
+        self._threads = []
+        self._housekeeping_at = 0.0
+
+    def start(self):
+        for index in range(self.threads):
+            thread = threading.Thread(target=self._loop, args=(f'{self.name}:{index}',),
+                                      name=f'job-worker-{index}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout=None):
+        """Let running jobs finish (up to ``timeout`` seconds) and stop polling."""
+        self._stop.set()
+        _notify()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def run_once(self, worker_id):
+        """Claim and run one job; False when nothing was due."""
+        config = self.app.config
+        with self.app.app_context():
+            try:
+                now = time.monotonic()
+                if now - self._housekeeping_at >= config.get('JOB_POLL_SECONDS', 2) * 30:
+                    self._housekeeping_at = now
+                    housekeeping(config)
+                job = claim(worker_id)
+                if job is None:
+                    return False
+                execute(job, config)
+                metrics.flush()
+                return True
+            except Exception:
+                # DB gaya / lock: log karo, agle poll pe phir try
+                db.session.rollback()
+                log.exception('Job worker %s: poll failed', worker_id)
+                return False
+
+    def _loop(self, worker_id):
+        poll = self.app.config.get('JOB_POLL_SECONDS', 2)
+        while not self._stop.is_set():
+            if self.run_once(worker_id):
+                continue
+            with _wake:
+                if not self._stop.is_set():
+                    _wake.wait(poll)
+
+
+def start_in_process(app):
+    """Start JOB_WORKER_THREADS worker threads in this process (once)."""
+    with _start_lock:
+        worker = app.extensions.get('job_worker')
+        if worker is None:
+            worker = app.extensions['job_worker'] = Worker(app, app.config['JOB_WORKER_THREADS']).start()
+            atexit.register(worker.stop, 5)
+            app.logger.info('Job worker started in process %s with %d thread(s)', os.getpid(), worker.threads)
+    return worker
+
+
+def init_app(app):
+    metrics.on_collect(app, _report_queue)
+    if app.config.get('JOB_WORKER_THREADS'):
+        # Pehli request pe start: gunicorn master / CLI commands mein threads nahi chahiye
+        @app.before_request
+        def _start_worker():
+            if 'job_worker' not in app.extensions:
+                start_in_process(app)
@@ -0,0 +1,277 @@
+"""Per-endpoint request / SQL metrics in Prometheus text format.
+
+``init_app`` hooks the request cycle and the SQLAlchemy engine:
+
+* ``http_request_duration_seconds`` - latency histogram per endpoint,
+  method and status;
+* ``db_queries_per_request`` / ``db_query_duration_seconds`` - how many
+  statements a request ran and how long they took, per endpoint;
+* ``db_pool_checkout_wait_seconds`` - time spent waiting for a pooled
+  connection (timed by services/database), plus a checked-out gauge;
+* ``db_repeated_statements_total`` - the N+1 detector: a request that
+  runs the same statement METRICS_REPEAT_THRESHOLD times or more is
+  counted and logged with its endpoint and the statement;
+* whatever is registered with ``on_collect`` (the background job queue
+  depth), read fresh on every scrape.
+
+Every worker keeps its own registry. With METRICS_DIR set, workers also
+write their numbers to ``<METRICS_DIR>/<pid>.json`` (at most every
+METRICS_FLUSH_SECONDS) and ``/metrics`` sums all of them, so one scrape
+covers every gunicorn worker; ``/metrics?scope=worker`` shows just the
+worker that answered. Files of workers that have exited (restarts,
+max_requests) are removed on the next scrape.
+"""
+import glob
+import json
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+from ..extensions import db
+from . import database
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30)
+
+HELP = {
+    'http_request_duration_seconds': ('histogram', 'Request latency by endpoint'),
+    'db_queries_per_request': ('histogram', 'SQL statements per request by endpoint'),
+    'db_query_duration_seconds': ('counter', 'Total time spent in SQL statements by endpoint'),
+    'db_pool_checkout_wait_seconds': ('histogram', 'Time waiting for a pooled DB connection'),
+    'db_repeated_statements_total': ('counter', 'Requests that repeated one statement past the N+1 threshold'),
+    'db_pool_checked_out': ('gauge', 'DB connections currently checked out, per worker'),
+    'jobs': ('gauge', 'Background jobs not yet done, by status and task'),
+    'jobs_oldest_queued_seconds': ('gauge', 'Age of the oldest due job still waiting in the queue'),
+    'job_queue_wait_seconds': ('histogram', 'Time a background job waited from due to started'),
+    'job_duration_seconds': ('histogram', 'Background job run time by task and outcome'),
+}
+
+
+class Registry:
+    """Counters and histograms keyed by ``(name, sorted label items)``."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = defaultdict(float)
+        self.histograms = {}  # key -> [bucket counts..., sum, count]
+        self.buckets = {}
+        self.gauges = {}
+
+    def inc(self, name, value=1, **labels):
+        with self._lock:
+            self.counters[(name, tuple(sorted(labels.items())))] += value
+
+    def observe(self, name, value, buckets, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.buckets[name] = buckets
+            series = self.histograms.setdefault(key, [0] * (len(buckets) + 2))
+            for index, bound in enumerate(buckets):
+                if value <= bound:
+                    series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def set(self, name, value, **labels):
+        with self._lock:
+            self.gauges[(name, tuple(sorted(labels.items())))] = value
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'counters': [[name, list(labels), value] for (name, labels), value in self.counters.items()],
+                'histograms': [[name, list(labels), list(series)] for (name, labels), series in self.histograms.items()],
+                'buckets': dict(self.buckets),
+                'gauges': [[name, list(labels), value] for (name, labels), value in self.gauges.items()],
+            }
+
+
+registry = Registry()
+_flushed = {'at': 0.0}
+
+
+def _merge(snapshots):
+    counters, histograms, gauges, buckets = defaultdict(float), {}, {}, {}
+    for snap in snapshots:
+        buckets.update(snap['buckets'])
+        for name, labels, value in snap['counters']:
+            counters[(name, tuple(map(tuple, labels)))] += value
+        for name, labels, series in snap['histograms']:
+            key = (name, tuple(map(tuple, labels)))
+            if key in histograms:
+                histograms[key] = [a + b for a, b in zip(histograms[key], series)]
+            else:
+                histograms[key] = list(series)
+        for name, labels, value in snap['gauges']:
+            gauges[(name, tuple(map(tuple, labels)))] = value
+    return counters, histograms, gauges, buckets
+
+
+def _labels(items, extra=()):
+    items = list(items) + list(extra)
+    if not items:
+        return ''
+    body = ','.join('{}="{}"'.format(k, str(v).replace('\\', r'\\').replace('"', r'\"')) for k, v in items)
+    return '{' + body + '}'
+
+
+def render(snapshots):
+    """Prometheus text exposition (format 0.0.4) of the merged snapshots."""
+    counters, histograms, gauges, buckets = _merge(snapshots)
+    by_name = defaultdict(list)
+    for (name, labels), value in sorted(counters.items()):
+        by_name[name].append(f'{name}{_labels(labels)} {value}')
+    for (name, labels), value in sorted(gauges.items()):
+        by_name[name].append(f'{name}{_labels(labels)} {value}')
+    for (name, labels), series in sorted(histograms.items()):
+        # observe() har bucket >= value mein ginta hai, counts already cumulative hain
+        for bound, count in zip(buckets[name], series):
+            by_name[name].append(f'{name}_bucket{_labels(labels, [("le", bound)])} {count}')
+        by_name[name].append(f'{name}_bucket{_labels(labels, [("le", "+Inf")])} {series[-1]}')
+        by_name[name].append(f'{name}_sum{_labels(labels)} {series[-2]}')
+        by_name[name].append(f'{name}_count{_labels(labels)} {series[-1]}')
+
+    lines = []
+    for name in sorted(by_name):
+        kind, text = HELP.get(name, ('untyped', name))
+        lines.append(f'# HELP {name} {text}')
+        lines.append(f'# TYPE {name} {kind}')
+        lines.extend(by_name[name])
+    return '\n'.join(lines) + '\n'
+
+
+def _record_pool(engine):
+    pool = engine.pool
+    if isinstance(pool, QueuePool):
+        registry.set('db_pool_checked_out', pool.checkedout(), worker=os.getpid())
+
+
+def flush(force=False):
+    """Write this worker's snapshot to METRICS_DIR (throttled)."""
+    directory = current_app.config.get('METRICS_DIR')
+    if not directory:
+        return
+    now = time.monotonic()
+    if not force and now - _flushed['at'] < current_app.config.get('METRICS_FLUSH_SECONDS', 5):
+        return
+    _flushed['at'] = now
+    _record_pool(db.engine)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f'{os.getpid()}.json')
+    with open(path + '.tmp', 'w') as f:
+        json.dump(registry.snapshot(), f)
+    os.replace(path + '.tmp', path)
+
+
+def on_collect(app, callback):
+    """Call ``callback(registry)`` on every scrape, for gauges read at scrape time."""
+    app.extensions.setdefault('metrics_collectors', []).append(callback)
+
+
+def _scrape_time():
+    # Alag registry: yeh values files mein nahi jaatin, aur list mein last hain to _merge mein inki chalti hai
+    live = Registry()
+    for callback in current_app.extensions.get('metrics_collectors', ()):
+        callback(live)
+    return live.snapshot()
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # kisi aur user ka process, par zinda hai
+    return True
+
+
+def collect(scope='all'):
+    """Snapshots to render: every worker's file, or just this worker."""
+    _record_pool(db.engine)
+    directory = current_app.config.get('METRICS_DIR')
+    if scope == 'worker' or not directory:
+        return [registry.snapshot(), _scrape_time()]
+    flush(force=True)
+    snapshots = []
+    for path in glob.glob(os.path.join(directory, '*.json')):
+        pid = os.path.splitext(os.path.basename(path))[0]
+        try:
+            if pid.isdigit() and not _alive(int(pid)):
+                os.remove(path)  # worker band ho chuka; uske numbers har scrape mein na jude
+                continue
+            with open(path) as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError):
+            continue  # worker likh raha tha / mar gaya; agle scrape mein
+    snapshots.append(_scrape_time())
+    return snapshots
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('metrics_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get('metrics_started')
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    if not has_request_context() or 'metrics' not in g:
+        return
+    stats = g.metrics
+    stats['queries'] += 1
+    stats['query_time'] += elapsed
+    stats['shapes'][statement] += 1
+
+
+def _handle_error(context):
+    # Statement fail hua to after_cursor_execute nahi chalta; uska start time yahin hatao
+    if context.connection is not None:
+        started = context.connection.info.get('metrics_started')
+        if started:
+            started.pop()
+
+
+def _before_request():
+    g.metrics = {'start': time.perf_counter(), 'queries': 0, 'query_time': 0.0, 'shapes': Counter()}
+
+
+def _after_request(response):
+    stats = g.pop('metrics', None)
+    if stats is None:
+        return response
+    endpoint = request.endpoint or 'unmatched'
+    registry.observe('http_request_duration_seconds', time.perf_counter() - stats['start'], LATENCY_BUCKETS,
+                     endpoint=endpoint, method=request.method, status=response.status_code)
+    registry.observe('db_queries_per_request', stats['queries'], QUERY_COUNT_BUCKETS, endpoint=endpoint)
+    registry.inc('db_query_duration_seconds', stats['query_time'], endpoint=endpoint)
+
+    threshold = current_app.config.get('METRICS_REPEAT_THRESHOLD', 10)
+    if stats['shapes']:
+        statement, repeats = stats['shapes'].most_common(1)[0]
+        if threshold and repeats >= threshold:
+            registry.inc('db_repeated_statements_total', endpoint=endpoint)
+            current_app.logger.warning('Possible N+1 in %s: same statement ran %d times: %s',
+                                       endpoint, repeats, ' '.join(statement.split())[:300])
+    flush()
+    return response
+
+
+def init_app(app):
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    database.on_checkout_wait(
+        app, lambda wait: registry.observe('db_pool_checkout_wait_seconds', wait, WAIT_BUCKETS))
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(db.engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(db.engine, 'handle_error', _handle_error)
@@ -0,0 +1,21 @@
+"""Money handling: every amount column is Numeric(10, 2) and Python sees Decimal."""
+from decimal import Decimal, InvalidOperation
+
+PAISE = Decimal('0.01')
+ZERO = Decimal('0.00')
+# Numeric(10, 2): 8 digits before the decimal point
+MAX_AMOUNT = Decimal(10) ** 8
+
+
+def parse_money(value):
+    """Form string -> Decimal rounded to paise. Raises ValueError like float() did.
+
+    Amounts that don't fit the Numeric(10, 2) columns (``1e100``) are a ValueError too.
+    """
+    try:
+        amount = Decimal(str(value).strip()).quantize(PAISE)
+        if not amount.is_finite() or abs(amount) >= MAX_AMOUNT:
+            raise InvalidOperation
+        return amount
+    except (InvalidOperation, TypeError):
+        raise ValueError(f'Invalid amount: {value!r}')
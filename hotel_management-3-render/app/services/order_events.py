@@ -0,0 +1,280 @@
+"""Push feed of order changes for kitchen / counter screens.
+
+Routes publish an event after committing a change to an order (new order,
+edit, status, payment); ``order.stream`` relays them to connected screens
+as server-sent events, so a screen only receives the orders that changed
+instead of re-rendering the whole day.
+
+The bus talks to a backend with ``publish(payload)`` / ``subscribe(last_id)``.
+The default DatabaseBackend writes each event to the ``order_event`` table
+and one poller thread per process fans new rows out to that process's
+screens, so every gunicorn worker (and box) sees every change, and the
+row id is a Last-Event-ID that stays valid across workers and restarts.
+MemoryBackend fans out inside one process only (single worker setups);
+other backends plug in through ORDER_EVENTS_BACKEND ("package.module:ClassName").
+
+The feed is off unless ORDER_EVENTS_ENABLED: every open stream holds a
+worker thread, so it needs threaded workers (``gunicorn -k gthread
+--threads 50``); under sync workers a few open tabs would take every
+worker. A stream also ends after ORDER_EVENTS_STREAM_SECONDS and the
+browser reconnects (``retry:``) with Last-Event-ID, so no request lives
+forever.
+"""
+import importlib
+import json
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+
+from ..extensions import db
+from ..models.order import Order
+from ..models.order_event import OrderEvent
+
+
+class Subscription:
+    def __init__(self, backend, maxsize):
+        self._backend = backend
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.closed = False
+
+    def get(self, timeout=None):
+        """Next ``(event_id, data)``, or None on timeout."""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self._backend.unsubscribe(self)
+
+
+class MemoryBackend:
+    """In-process fan-out with a small replay buffer for ``Last-Event-ID``."""
+
+    def __init__(self, app=None, replay_size=500, queue_size=200):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._recent = deque(maxlen=replay_size)
+        self._queue_size = queue_size
+        self._last_id = 0
+
+    def publish(self, data):
+        with self._lock:
+            self._last_id += 1
+            event = (self._last_id, data)
+            self._recent.append(event)
+        return self._fan_out(event)
+
+    def _fan_out(self, event, subscribers=None):
+        if subscribers is None:
+            with self._lock:
+                subscribers = list(self._subscribers)
+        for sub in subscribers:
+            try:
+                sub.queue.put_nowait(event)
+            except queue.Full:
+                # Slow screen: drop it, browser reconnects with Last-Event-ID
+                sub.closed = True
+                self.unsubscribe(sub)
+        return event[0]
+
+    def subscribe(self, last_id=None):
+        with self._lock:
+            replay = [] if last_id is None else [event for event in self._recent if event[0] > last_id]
+            # Queue mein poora replay + live events ki jagah, warna replay hi queue.Full de deta
+            sub = Subscription(self, self._queue_size + len(replay))
+            for event in replay:
+                sub.queue.put_nowait(event)
+            self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    @property
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+
+def _utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class DatabaseBackend(MemoryBackend):
+    """Events in the ``order_event`` table; a poller thread per process fans them out.
+
+    Ids come from the database in insert order, but a row can commit after
+    a higher id was already read; the poller therefore re-reads the last
+    ORDER_EVENTS_OVERLAP_SECONDS every time and skips ids it has delivered.
+    """
+
+    def __init__(self, app, replay_size=500, queue_size=200):
+        super().__init__(replay_size=replay_size, queue_size=queue_size)
+        self._app = app
+        self._replay_size = replay_size
+        self._delivered = deque(maxlen=5000)
+        self._delivered_ids = set()
+        self._poller = None
+        self._pruned_at = 0.0
+
+    def publish(self, data):
+        event = OrderEvent(order_id=json.loads(data)['id'], payload=data)
+        db.session.add(event)
+        db.session.commit()
+        return event.id
+
+    def subscribe(self, last_id=None):
+        self._start_poller()
+        replay = []
+        if last_id is not None:
+            replay = [tuple(row) for row in db.session.execute(
+                db.select(OrderEvent.id, OrderEvent.payload)
+                .where(OrderEvent.id > last_id).order_by(OrderEvent.id).limit(self._replay_size)
+            )]
+        sub = Subscription(self, self._queue_size + len(replay))
+        for event in replay:
+            sub.queue.put_nowait(event)
+        with self._lock:
+            # Replay ke jo events poller ne abhi tak nahi bheje, woh yahin baaki screens ko
+            # jaate hain aur delivered mark hote hain, taaki overlap re-read inhe dobara na bheje
+            fresh = self._claim(replay)
+            others = list(self._subscribers)
+            self._subscribers.add(sub)
+        for event in fresh:
+            self._fan_out(event, others)
+        return sub
+
+    def _start_poller(self):
+        with self._lock:
+            if self._poller is None:
+                self._poller = threading.Thread(target=self._poll_loop, name='order-events-poller', daemon=True)
+                self._poller.start()
+
+    def _claim(self, events):
+        """Events not delivered yet, now marked as delivered (call with the lock held)."""
+        fresh = [event for event in events if event[0] not in self._delivered_ids]
+        for event_id, _ in fresh:
+            if len(self._delivered) == self._delivered.maxlen:
+                self._delivered_ids.discard(self._delivered[0])
+            self._delivered.append(event_id)
+            self._delivered_ids.add(event_id)
+        return fresh
+
+    def poll(self):
+        """Fan out events committed since the last poll (needs an app context)."""
+        config = self._app.config
+        since = _utcnow() - timedelta(seconds=config.get('ORDER_EVENTS_OVERLAP_SECONDS', 10))
+        rows = db.session.execute(
+            db.select(OrderEvent.id, OrderEvent.payload)
+            .where(OrderEvent.created_at >= since).order_by(OrderEvent.id)
+        ).all()
+        with self._lock:
+            fresh = self._claim([tuple(row) for row in rows])
+        for event in fresh:
+            self._fan_out(event)
+
+        now = time.monotonic()
+        if now - self._pruned_at >= 60:
+            self._pruned_at = now
+            keep = timedelta(seconds=config.get('ORDER_EVENTS_KEEP_SECONDS', 3600))
+            db.session.execute(db.delete(OrderEvent).where(OrderEvent.created_at < _utcnow() - keep))
+        db.session.commit()
+
+    def _poll_loop(self):
+        interval = self._app.config.get('ORDER_EVENTS_POLL_SECONDS', 1)
+        while True:
+            time.sleep(interval)
+            if not self.subscriber_count:
+                continue  # koi screen khuli nahi: DB ko mat chhedo
+            with self._app.app_context():
+                try:
+                    self.poll()
+                except Exception:
+                    db.session.rollback()
+                    self._app.logger.exception('Order events poll failed')
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                path = current_app.config.get('ORDER_EVENTS_BACKEND')
+                if path:
+                    module_name, class_name = path.split(':')
+                    backend_class = getattr(importlib.import_module(module_name), class_name)
+                else:
+                    backend_class = DatabaseBackend
+                _backend = backend_class(current_app._get_current_object())
+    return _backend
+
+
+def order_payload(order):
+    return {
+        'id': order.id,
+        'type': order.order_type,
+        'customer': order.table_number or order.customer_name or '-',
+        'status': order.status,
+        'is_paid': bool(order.is_paid),
+        'total': float(order.total_amount or 0),
+        'edit_count': order.edit_count,
+        'created_at': order.created_at.isoformat() if order.created_at else None,
+        'updated_at': order.updated_at.isoformat() if order.updated_at else None,
+        'all_items': [
+            {
+                'menu_item_id': item.menu_item_id,
+                'name': item.menu_item.name,
+                'qty': item.quantity,
+                'price': float(item.price_at_time),
+                'subtotal': float(item.quantity * item.price_at_time),
+                'added_in_edit': item.added_after_edit,
+            }
+            for item in order.items
+        ],
+    }
+
+
+def publish_order_changed(order_id):
+    """Call after commit. Errors here must never fail the request itself."""
+    if not current_app.config.get('ORDER_EVENTS_ENABLED'):
+        return
+    try:
+        order = db.session.get(Order, order_id)
+        if order is None:
+            return
+        get_backend().publish(json.dumps(order_payload(order)))
+    except Exception:
+        current_app.logger.exception('Could not publish change for order %s', order_id)
+
+
+def sse_stream(sub, heartbeat=15, lifetime=300):
+    """SSE frames for ``sub`` for up to ``lifetime`` seconds; the subscription is released after.
+
+    Subscribe inside the view (the generator runs after the request context is gone).
+    The browser reconnects on its own after ``retry`` ms, sending Last-Event-ID.
+    """
+    deadline = time.monotonic() + lifetime
+    try:
+        yield 'retry: 3000\n\n'
+        while not sub.closed:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            event = sub.get(timeout=min(heartbeat, remaining))
+            if event is None:
+                yield ': keepalive\n\n'
+                continue
+            event_id, data = event
+            yield f'id: {event_id}\nevent: order\ndata: {data}\n\n'
+    finally:
+        sub.close()
@@ -0,0 +1,79 @@
+"""Order-line ingestion for the order add/edit forms.
+
+The forms post one ``qty_<menu_item_id>`` field per dish. Instead of a
+``MenuItem.query.get`` (and on edit an ``OrderItem`` lookup) per field,
+all requested dishes are resolved in one query, merged with the order's
+existing lines in memory, and written with one bulk INSERT plus one bulk
+UPDATE.
+"""
+from sqlalchemy import insert, update
+
+from ..extensions import db
+from ..models.menu import MenuItem
+from ..models.order import OrderItem
+from .money import ZERO
+
+
+def parse_quantities(form):
+    """``{menu_item_id: qty}`` for every ``qty_*`` field with qty > 0."""
+    quantities = {}
+    for key, value in form.items():
+        if not key.startswith('qty_'):
+            continue
+        try:
+            item_id = int(key.split('_')[1])
+            qty = int(value or 0)
+        except ValueError:
+            continue
+        if qty > 0:
+            quantities[item_id] = quantities.get(item_id, 0) + qty
+    return quantities
+
+
+def available_items(item_ids):
+    """Available menu items among ``item_ids``, keyed by id (one query)."""
+    if not item_ids:
+        return {}
+    items = MenuItem.query.filter(MenuItem.id.in_(item_ids), MenuItem.available.is_(True)).all()
+    return {item.id: item for item in items}
+
+
+def add_lines(order_id, quantities, menu_items, edit_round=0):
+    """Add ``quantities`` to an order and return the amount added.
+
+    On an edit (``edit_round`` > 0) dishes already on the order get their
+    quantity bumped, baaki naye lines banenge with
+    ``added_after_edit=edit_round``. Caller commits.
+    """
+    quantities = {item_id: qty for item_id, qty in quantities.items() if item_id in menu_items}
+    if not quantities:
+        return ZERO
+
+    existing = {}
+    if edit_round:
+        rows = db.session.query(OrderItem.id, OrderItem.menu_item_id, OrderItem.quantity)\
+            .filter(OrderItem.order_id == order_id, OrderItem.menu_item_id.in_(quantities))
+        existing = {menu_item_id: (line_id, qty) for line_id, menu_item_id, qty in rows}
+
+    inserts, updates = [], []
+    added_total = ZERO
+    for item_id, qty in quantities.items():
+        item = menu_items[item_id]
+        if item_id in existing:
+            line_id, current_qty = existing[item_id]
+            updates.append({'id': line_id, 'quantity': current_qty + qty})
+        else:
+            inserts.append({
+                'order_id': order_id,
+                'menu_item_id': item_id,
+                'quantity': qty,
+                'price_at_time': item.price,
+                'added_after_edit': edit_round,
+            })
+        added_total += qty * item.price
+
+    if inserts:
+        db.session.execute(insert(OrderItem), inserts)
+    if updates:
+        db.session.execute(update(OrderItem), updates)
+    return added_total
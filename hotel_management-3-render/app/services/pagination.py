@@ -0,0 +1,82 @@
+"""Keyset (cursor) pagination for the date-filtered list pages.
+
+Pages are read with ``WHERE (sort_col, id) > (last_sort, last_id)`` (or
+``<`` for newest-first lists) and ``LIMIT per_page + 1``, so the cost of a
+page does not depend on how wide the date range is or how deep the page
+is. The cursor also carries the day sequence number of the last row, so
+"Day #" keeps counting across pages without a COUNT query.
+"""
+import base64
+from datetime import datetime
+
+from flask import current_app
+
+from ..extensions import db
+
+MAX_PER_PAGE = 500
+
+
+class KeysetPage:
+    def __init__(self, items, next_cursor, first_sequence):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.first_sequence = first_sequence
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def numbered(self, attr='day_sequence'):
+        """Set ``attr`` on each item (1, 2, 3 ... continuing from earlier pages)."""
+        for index, item in enumerate(self.items, start=self.first_sequence):
+            setattr(item, attr, index)
+        return self.items
+
+
+def encode_cursor(sort_value, row_id, sequence):
+    raw = f'{sort_value.isoformat()}|{row_id}|{sequence}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """``(sort_value, row_id, sequence)``; ValueError on a malformed cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        sort_value, row_id, sequence = raw.split('|')
+        return datetime.fromisoformat(sort_value), int(row_id), int(sequence)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError('Invalid page cursor!') from e
+
+
+def page_size(args):
+    default = current_app.config.get('LIST_PAGE_SIZE', 50)
+    try:
+        per_page = int(args.get('per_page', default))
+    except ValueError:
+        per_page = default
+    return max(1, min(per_page, MAX_PER_PAGE))
+
+
+def keyset_paginate(query, sort_column, id_column, cursor=None, per_page=50, descending=False):
+    """One page of ``query`` ordered by ``(sort_column, id_column)``."""
+    sequence = 0
+    if cursor:
+        sort_value, row_id, sequence = decode_cursor(cursor)
+        key = db.tuple_(sort_column, id_column)
+        after = db.tuple_(sort_value, row_id)
+        query = query.filter(key < after if descending else key > after)
+
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+
+    rows = query.limit(per_page + 1).all()
+    items = rows[:per_page]
+    next_cursor = None
+    if len(rows) > per_page:
+        last = items[-1]
+        next_cursor = encode_cursor(
+            getattr(last, sort_column.key), getattr(last, id_column.key), sequence + len(items)
+        )
+    return KeysetPage(items, next_cursor, sequence + 1)
@@ -0,0 +1,109 @@
+"""Password hashing policy, run off the request thread with bounded concurrency.
+
+scrypt is meant to be expensive. When a dozen staff log in together at
+shift change, each hash would otherwise eat a CPU in its own request
+thread and order entry stalls behind them. So:
+
+* hashes run on a small shared executor (PASSWORD_HASH_WORKERS). A request
+  waits at most PASSWORD_HASH_WAIT seconds for a slot, then gets
+  HashingBusy instead of piling up;
+* each username gets at most PASSWORD_ATTEMPTS_PER_MINUTE failed attempts
+  per worker (``record_failure``), checked before any hashing is done, so
+  a locked-out name costs no CPU and staff logging in normally never hit it;
+* PASSWORD_HASH_METHOD / PASSWORD_SALT_LENGTH set the policy. A stored
+  hash made with other parameters is upgraded on the next successful
+  login (``needs_rehash``).
+"""
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class HashingBusy(Exception):
+    """All hashing slots are taken; ask the user to retry in a moment."""
+
+
+_lock = threading.Lock()
+_pool = {'executor': None, 'slots': None}
+_attempts = defaultdict(deque)  # username -> attempt times (monotonic)
+
+
+def _policy():
+    config = current_app.config
+    return config.get('PASSWORD_HASH_METHOD', 'scrypt'), config.get('PASSWORD_SALT_LENGTH', 16)
+
+
+def _executor():
+    with _lock:
+        if _pool['executor'] is None:
+            workers = current_app.config.get('PASSWORD_HASH_WORKERS', 2)
+            queue = current_app.config.get('PASSWORD_HASH_QUEUE', 8)
+            _pool['executor'] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+            # Chal rahe + queue mein khade hashes ki upper limit
+            _pool['slots'] = threading.BoundedSemaphore(workers + queue)
+        return _pool['executor'], _pool['slots']
+
+
+def _run(fn, *args):
+    executor, slots = _executor()
+    if not slots.acquire(timeout=current_app.config.get('PASSWORD_HASH_WAIT', 2)):
+        raise HashingBusy()
+    try:
+        # hashlib scrypt/pbkdf2 GIL chhod dete hain, isliye thread pool kaafi hai
+        return executor.submit(fn, *args).result()
+    finally:
+        slots.release()
+
+
+def hash_password(password):
+    method, salt_length = _policy()
+    return _run(generate_password_hash, password, method, salt_length)
+
+
+def verify(password_hash, password):
+    return _run(check_password_hash, password_hash, password)
+
+
+@lru_cache(maxsize=8)
+def _method_prefix(method):
+    # "scrypt" -> "scrypt:32768:8:1" etc.; werkzeug hi defaults bharta hai
+    return generate_password_hash('', method, 1).split('$', 1)[0]
+
+
+def needs_rehash(password_hash):
+    """True if ``password_hash`` wasn't made with the current policy."""
+    method, salt_length = _policy()
+    prefix, _, rest = password_hash.partition('$')
+    salt = rest.partition('$')[0]
+    return prefix != _method_prefix(method) or len(salt) != salt_length
+
+
+def allow_attempt(username, now=None):
+    """False once ``username`` has PASSWORD_ATTEMPTS_PER_MINUTE failures in the last minute."""
+    limit = current_app.config.get('PASSWORD_ATTEMPTS_PER_MINUTE', 5)
+    if not limit:
+        return True
+    now = time.monotonic() if now is None else now
+    with _lock:
+        recent = _attempts.get(username.lower())
+        if not recent:
+            return True
+        while recent and now - recent[0] >= 60:
+            recent.popleft()
+        return len(recent) < limit
+
+
+def record_failure(username, now=None):
+    """Count a failed login for ``username`` (successful ones don't count)."""
+    now = time.monotonic() if now is None else now
+    with _lock:
+        _attempts[username.lower()].append(now)
+        # Purane usernames ka kachra saaf
+        if len(_attempts) > 10000:
+            for name in [n for n, times in _attempts.items() if not times or now - times[-1] >= 60]:
+                del _attempts[name]
@@ -0,0 +1,151 @@
+"""Monthly payroll for every employee from one grouped query.
+
+Present / half-day / absent counts come from a single
+``SUM(CASE ...) GROUP BY employee`` over the month's attendance (served by
+the (employee_id, date) index), instead of loading each employee's rows
+and counting in Python. Pay keeps the old rule: salary / 30 per day
+worked, a half day counts as half.
+
+A month that has ended can't gain attendance through normal use, so its
+result is stored in PayrollSnapshot and later runs read it back. Marking
+attendance for a past date calls ``invalidate`` for that month; adding,
+removing or changing the salary / dates of an employee calls
+``invalidate_since`` from their hire date.
+"""
+from collections import namedtuple
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from ..extensions import db
+from ..models.attendance import Attendance, AttendanceStatus
+from ..models.employee import Employee
+from ..models.payroll import PayrollSnapshot
+from .date_window import local_today
+from .money import PAISE
+from .sql import dialect_insert
+
+PayrollLine = namedtuple(
+    'PayrollLine', 'employee_id name role monthly_salary present_days half_days absent_days pay'
+)
+
+DAYS_PER_MONTH = 30  # 30-day month assumption
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def month_end(month):
+    """Last day of the month starting at ``month``."""
+    return (month.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+
+
+def parse_month(value):
+    """``YYYY-MM`` -> first day of that month; current month if blank."""
+    if not value:
+        return month_start(local_today())
+    try:
+        return datetime.strptime(value, '%Y-%m').date()
+    except ValueError:
+        raise ValueError('Invalid month!')
+
+
+def is_closed(month):
+    return month_end(month) < local_today()
+
+
+def calculate_pay(monthly_salary, present_days, half_days):
+    days_worked = present_days + Decimal(half_days) / 2
+    return (days_worked * monthly_salary / DAYS_PER_MONTH).quantize(PAISE)
+
+
+def _count(status):
+    return db.func.coalesce(db.func.sum(db.case((Attendance.status == status, 1), else_=0)), 0)
+
+
+def compute(month, employee_id=None):
+    """PayrollLine per employee on the rolls during ``month`` (one query)."""
+    last_day = month_end(month)
+    query = db.session.query(
+        Employee.id, Employee.name, Employee.role, Employee.salary,
+        _count(AttendanceStatus.PRESENT), _count(AttendanceStatus.HALF_DAY), _count(AttendanceStatus.ABSENT),
+    ).outerjoin(Attendance, db.and_(
+        Attendance.employee_id == Employee.id,
+        Attendance.date >= month,
+        Attendance.date <= last_day,
+    ))
+    if employee_id is not None:
+        query = query.filter(Employee.id == employee_id)
+    else:
+        query = query.filter(
+            Employee.hire_date <= last_day,
+            db.or_(Employee.resign_date.is_(None), Employee.resign_date >= month),
+        )
+    rows = query.group_by(Employee.id, Employee.name, Employee.role, Employee.salary)\
+        .order_by(Employee.name).all()
+
+    return [
+        PayrollLine(emp_id, name, role, salary, present, half, absent, calculate_pay(salary, present, half))
+        for emp_id, name, role, salary, present, half, absent in rows
+    ]
+
+
+def _from_snapshot(month):
+    rows = db.session.query(
+        PayrollSnapshot.employee_id, Employee.name, Employee.role, PayrollSnapshot.monthly_salary,
+        PayrollSnapshot.present_days, PayrollSnapshot.half_days, PayrollSnapshot.absent_days, PayrollSnapshot.pay,
+    ).join(Employee, Employee.id == PayrollSnapshot.employee_id)\
+        .filter(PayrollSnapshot.month == month).order_by(Employee.name).all()
+    return [PayrollLine(*row) for row in rows]
+
+
+def _store_snapshot(month, lines):
+    if not lines:
+        return
+    stmt = dialect_insert(PayrollSnapshot).values([
+        {'month': month, 'employee_id': line.employee_id, 'present_days': line.present_days,
+         'half_days': line.half_days, 'absent_days': line.absent_days,
+         'monthly_salary': line.monthly_salary, 'pay': line.pay}
+        for line in lines
+    ])
+    db.session.execute(stmt.on_conflict_do_nothing())
+
+
+def run(month):
+    """``(lines, from_snapshot)`` for ``month``; closed months are snapshotted."""
+    if not is_closed(month):
+        return compute(month), False
+
+    lines = _from_snapshot(month)
+    if lines:
+        return lines, True
+
+    lines = compute(month)
+    _store_snapshot(month, lines)
+    db.session.commit()
+    return lines, False
+
+
+def invalidate(day):
+    """Drop the snapshot of ``day``'s month (attendance changed). Caller commits."""
+    db.session.query(PayrollSnapshot).filter(PayrollSnapshot.month == month_start(day))\
+        .delete(synchronize_session=False)
+
+
+def invalidate_since(day):
+    """Drop the snapshots of ``day``'s month and every later one (employee changed). Caller commits."""
+    db.session.query(PayrollSnapshot).filter(PayrollSnapshot.month >= month_start(day))\
+        .delete(synchronize_session=False)
+
+
+def line_dict(line):
+    return {
+        'employee_id': line.employee_id,
+        'name': line.name,
+        'role': line.role.value,
+        'monthly_salary': str(line.monthly_salary),
+        'present_days': line.present_days,
+        'half_days': line.half_days,
+        'absent_days': line.absent_days,
+        'pay': str(line.pay),
+    }
@@ -0,0 +1,307 @@
+"""Synthetic restaurant data for local testing and the benchmark suite.
+
+``seed`` fills an empty database with a menu, staff with attendance, pantry
+items with their purchase ledger, and ``days`` of orders with lines, bills
+and finance entries. Orders come in lunch and dinner rushes (restaurant
+local time, stored as naive UTC like the app does) with more covers on
+weekends; everything before today is paid, today's orders are still open.
+The same ``random_seed`` always produces the same data.
+
+Rows go in with bulk INSERTs in batches (ids come back through RETURNING,
+so Postgres sequences stay in step) and the DailySales rollup is rebuilt at
+the end, so dashboards match what the routes would have written.
+"""
+import random
+from datetime import datetime, time, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy import insert
+
+from ..extensions import db
+from ..models.attendance import Attendance, AttendanceStatus
+from ..models.billing import Bill
+from ..models.employee import Employee, EmployeeRole
+from ..models.finance import FinanceTransaction, TransactionType
+from ..models.inventory import Expense, Inventory, InventoryCategory, InventoryStatus, PaymentMode
+from ..models.menu import Category, MenuItem
+from ..models.order import Order, OrderItem, OrderStatus
+from ..models.user import Role, User
+from . import daily_sales
+from .date_window import local_today, local_tz
+from .stock import format_quantity
+
+BATCH = 5000
+
+# category -> (dishes, price range)
+MENU = {
+    'Starters': (['Paneer Tikka', 'Hara Bhara Kabab', 'Chicken 65', 'Veg Manchurian', 'Fish Amritsari',
+                  'Chilli Paneer', 'Tandoori Chicken', 'Aloo Tikki'], (120, 380)),
+    'Main Course': (['Dal Makhani', 'Paneer Butter Masala', 'Butter Chicken', 'Kadai Veg', 'Mutton Rogan Josh',
+                     'Chole Masala', 'Palak Paneer', 'Egg Curry'], (180, 480)),
+    'Breads': (['Tandoori Roti', 'Butter Naan', 'Garlic Naan', 'Lachha Paratha', 'Missi Roti'], (20, 80)),
+    'Rice': (['Jeera Rice', 'Veg Biryani', 'Chicken Biryani', 'Steamed Rice', 'Veg Pulao'], (120, 350)),
+    'Desserts': (['Gulab Jamun', 'Rasmalai', 'Kulfi', 'Gajar Halwa'], (60, 160)),
+    'Beverages': (['Masala Chai', 'Sweet Lassi', 'Fresh Lime Soda', 'Cold Coffee', 'Mineral Water'], (20, 140)),
+}
+
+FIRST_NAMES = ['Ramesh', 'Suresh', 'Anita', 'Pooja', 'Vikram', 'Imran', 'Kavita', 'Rahul', 'Sunita', 'Manoj',
+               'Deepak', 'Neha', 'Arjun', 'Farhan', 'Geeta', 'Harish', 'Lakshmi', 'Mohan', 'Priya', 'Sanjay']
+LAST_NAMES = ['Sharma', 'Verma', 'Khan', 'Patel', 'Singh', 'Yadav', 'Das', 'Nair', 'Gupta', 'Reddy']
+
+# role -> (share of staff, monthly salary range)
+STAFF = {
+    EmployeeRole.MANAGER: (0.08, (35000, 50000)),
+    EmployeeRole.CHEF: (0.25, (22000, 40000)),
+    EmployeeRole.WAITER: (0.35, (12000, 18000)),
+    EmployeeRole.CASHIER: (0.12, (15000, 22000)),
+    EmployeeRole.HOUSEKEEPING: (0.20, (10000, 14000)),
+}
+
+# name, category, unit, (qty range per purchase), price per unit, bought every n days
+PANTRY = [
+    ('Basmati Rice', InventoryCategory.GROCERY, 'kg', (25, 50), 95, 7),
+    ('Atta', InventoryCategory.GROCERY, 'kg', (20, 40), 38, 5),
+    ('Paneer', InventoryCategory.GROCERY, 'kg', (5, 12), 340, 2),
+    ('Chicken', InventoryCategory.GROCERY, 'kg', (8, 20), 220, 1),
+    ('Cooking Oil', InventoryCategory.GROCERY, 'l', (15, 30), 140, 6),
+    ('Milk', InventoryCategory.GROCERY, 'l', (10, 25), 56, 1),
+    ('Onion', InventoryCategory.GROCERY, 'kg', (15, 30), 35, 3),
+    ('Tomato', InventoryCategory.GROCERY, 'kg', (10, 25), 30, 2),
+    ('Spices Mix', InventoryCategory.GROCERY, 'kg', (1, 4), 600, 14),
+    ('Gas Cylinder', InventoryCategory.OTHER, 'pcs', (1, 3), 1900, 10),
+    ('Steel Plates', InventoryCategory.UTENSILS, 'pcs', (12, 36), 120, 60),
+    ('Kadhai', InventoryCategory.UTENSILS, 'pcs', (1, 2), 1500, 120),
+    ('Chairs', InventoryCategory.FURNITURE, 'pcs', (4, 8), 1800, 180),
+    ('Mixer Grinder', InventoryCategory.APPLIANCES, 'pcs', (1, 1), 4500, 240),
+    ('Cleaning Tools', InventoryCategory.TOOLS, 'pcs', (2, 6), 250, 30),
+]
+
+# local hour -> relative weight (lunch and dinner rush)
+HOUR_WEIGHTS = {11: 2, 12: 6, 13: 9, 14: 7, 15: 3, 16: 2, 17: 2, 18: 3, 19: 6, 20: 10, 21: 10, 22: 6, 23: 2}
+
+LOGIN_ROLES = [Role.ADMIN, Role.MANAGER, Role.CHEF, Role.WAITER, Role.CASHIER]
+
+
+def is_empty():
+    return db.session.execute(db.select(Order.id).limit(1)).first() is None
+
+
+def _insert(model, rows, returning=None):
+    """Bulk insert ``rows`` in batches; with ``returning`` give back the new ids in order."""
+    ids = []
+    for start in range(0, len(rows), BATCH):
+        batch = rows[start:start + BATCH]
+        if returning is None:
+            db.session.execute(insert(model), batch)
+        else:
+            stmt = insert(model).returning(returning, sort_by_parameter_order=True)
+            ids.extend(db.session.execute(stmt, batch).scalars())
+    return ids
+
+
+def _utc(local_moment):
+    return local_moment.replace(tzinfo=local_tz()).astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def seed_menu(rnd, menu_items):
+    """Categories and ``menu_items`` dishes; returns ``[(id, price)]`` of available ones."""
+    categories = {name: Category(name=name) for name in MENU}
+    db.session.add_all(categories.values())
+    db.session.flush()
+
+    names = [(category, dish) for category, (dishes, _) in MENU.items() for dish in dishes]
+    rows = []
+    for i in range(menu_items):
+        category, dish = names[i % len(names)]
+        if i >= len(names):
+            dish = f'{dish} ({["Half", "Jumbo", "Special", "Family"][(i // len(names) - 1) % 4]} {i // len(names)})'
+        low, high = MENU[category][1]
+        rows.append({'name': dish, 'category_id': categories[category].id,
+                     'price': Decimal(rnd.randrange(low, high + 1, 10)), 'available': rnd.random() > 0.05})
+    ids = _insert(MenuItem, rows, returning=MenuItem.id)
+    return [(item_id, row['price']) for item_id, row in zip(ids, rows) if row['available']]
+
+
+def seed_staff(rnd, employees, first_day, last_day):
+    """Employees plus one attendance row per working day; returns rows written."""
+    roles, weights = list(STAFF), [share for share, _ in STAFF.values()]
+    staff = []
+    for i in range(employees):
+        role = roles[i] if i < len(roles) else rnd.choices(roles, weights)[0]
+        low, high = STAFF[role][1]
+        hire_date = first_day - timedelta(days=rnd.randint(30, 1500)) if rnd.random() < 0.8 \
+            else first_day + timedelta(days=rnd.randint(0, max(0, (last_day - first_day).days)))
+        resign_date = None
+        if rnd.random() < 0.1 and hire_date < last_day - timedelta(days=30):
+            resign_date = hire_date + timedelta(days=rnd.randint(30, (last_day - hire_date).days))
+        staff.append({
+            'name': f'{rnd.choice(FIRST_NAMES)} {rnd.choice(LAST_NAMES)}',
+            'age': rnd.randint(19, 55),
+            'phone': f'9{rnd.randint(100000000, 999999999)}',
+            'address': f'{rnd.randint(1, 300)}, Sector {rnd.randint(1, 60)}',
+            'aadhaar_no': f'{rnd.randint(2, 9)}{i:011d}',
+            'salary': Decimal(rnd.randrange(low, high + 1, 500)),
+            'role': role,
+            'hire_date': hire_date,
+            'resign_date': resign_date,
+        })
+    ids = _insert(Employee, staff, returning=Employee.id)
+
+    attendance = []
+    for employee_id, row in zip(ids, staff):
+        reliability = rnd.uniform(0.85, 0.98)
+        day = max(first_day, row['hire_date'])
+        end = min(last_day, row['resign_date'] or last_day)
+        while day <= end:
+            roll = rnd.random()
+            if roll < reliability:
+                status = AttendanceStatus.PRESENT
+            elif roll < reliability + (1 - reliability) / 3:
+                status = AttendanceStatus.HALF_DAY
+            else:
+                status = AttendanceStatus.ABSENT
+            attendance.append({'employee_id': employee_id, 'date': day, 'status': status})
+            day += timedelta(days=1)
+    _insert(Attendance, attendance)
+    return len(attendance)
+
+
+def seed_pantry(rnd, items, first_day, last_day):
+    """Inventory items with their purchase ledger (running balances); returns expenses written."""
+    expenses = []
+    for i in range(items):
+        name, category, unit, (low, high), unit_price, every = PANTRY[i % len(PANTRY)]
+        if i >= len(PANTRY):
+            name = f'{name} {i // len(PANTRY) + 1}'
+        item = Inventory(item_name=name, category=category, unit=unit, quantity_with_unit=f'0 {unit}',
+                         status=InventoryStatus.USING)
+        db.session.add(item)
+        db.session.flush()
+
+        balance, spent = Decimal(0), Decimal(0)
+        day = first_day + timedelta(days=rnd.randrange(every))
+        while day <= last_day:
+            qty = Decimal(rnd.randint(low, high))
+            amount = (qty * unit_price * Decimal(rnd.uniform(0.9, 1.15))).quantize(Decimal('1'))
+            balance += qty
+            spent += amount
+            expenses.append({
+                'item_id': item.item_id,
+                'added_quantity_with_unit': format_quantity(qty, unit),
+                'quantity': qty, 'unit': unit,
+                'payment_amount': amount,
+                'payment_mode': rnd.choice([PaymentMode.CASH, PaymentMode.ONLINE]),
+                'date': _utc(datetime.combine(day, time(9, rnd.randint(0, 59)))),
+                'balance_quantity': balance, 'balance_spent': spent,
+            })
+            day += timedelta(days=every)
+        item.quantity = balance
+        item.total_spent = spent
+        item.quantity_with_unit = format_quantity(balance, unit)
+    _insert(Expense, expenses)
+    return len(expenses)
+
+
+def _orders_for_day(rnd, day, orders_per_day):
+    busy = 1.3 if day.weekday() >= 4 else 1.0  # Fri-Sun
+    count = max(0, int(rnd.gauss(orders_per_day * busy, orders_per_day * 0.15)))
+    hours, weights = list(HOUR_WEIGHTS), list(HOUR_WEIGHTS.values())
+    moments = sorted(
+        datetime.combine(day, time(hour, rnd.randint(0, 59), rnd.randint(0, 59)))
+        for hour in rnd.choices(hours, weights, k=count)
+    )
+    return [_utc(moment) for moment in moments]
+
+
+def seed_orders(rnd, menu, first_day, last_day, orders_per_day, tables=20):
+    """Orders with lines, bills and finance entries, one day at a time; returns (orders, lines, bills)."""
+    totals = [0, 0, 0]
+    today = local_today()
+    day = first_day
+    while day <= last_day:
+        moments = _orders_for_day(rnd, day, orders_per_day)
+        orders, lines = [], []
+        for created_at in moments:
+            picks = rnd.sample(menu, k=min(len(menu), rnd.choices([1, 2, 3, 4, 5, 6], [2, 4, 5, 4, 2, 1])[0]))
+            order_lines = [(item_id, price, rnd.choices([1, 2, 3], [6, 3, 1])[0]) for item_id, price in picks]
+            total = sum(price * qty for _, price, qty in order_lines)
+            dine_in = rnd.random() < 0.7
+            paid = day < today
+            paid_at = created_at + timedelta(minutes=rnd.randint(20, 90)) if paid else None
+            orders.append({
+                'order_type': 'Dine-in' if dine_in else 'Parcel',
+                'table_number': str(rnd.randint(1, tables)) if dine_in else None,
+                'customer_name': None if dine_in else f'{rnd.choice(FIRST_NAMES)} {rnd.choice(LAST_NAMES)[0]}.',
+                'status': OrderStatus.PAID if paid else rnd.choice(['Pending', 'Preparing', 'Ready', 'Served']),
+                'created_at': created_at, 'updated_at': paid_at or created_at,
+                'total_amount': total, 'edit_count': 0,
+                'is_paid': paid, 'paid_at': paid_at,
+            })
+            lines.append(order_lines)
+
+        order_ids = _insert(Order, orders, returning=Order.id)
+        line_rows, bills = [], []
+        for order_id, order, order_lines in zip(order_ids, orders, lines):
+            line_rows.extend({'order_id': order_id, 'menu_item_id': item_id, 'quantity': qty,
+                              'price_at_time': price, 'added_after_edit': 0}
+                             for item_id, price, qty in order_lines)
+            if order['is_paid']:
+                bills.append({'order_id': order_id, 'total_items': order['total_amount'], 'gst': Decimal(0),
+                              'service_charge': Decimal(0), 'grand_total': order['total_amount'],
+                              'generated_at': order['paid_at'],
+                              'payment_mode': rnd.choices(['Cash', 'Online'], [4, 6])[0]})
+        _insert(OrderItem, line_rows)
+        bill_ids = _insert(Bill, bills, returning=Bill.id)
+        _insert(FinanceTransaction, [
+            {'type': TransactionType.INFLOW, 'amount': bill['grand_total'], 'bill_id': bill_id,
+             'description': f"{bill['payment_mode']} payment for Order #{bill['order_id']}",
+             'date': bill['generated_at']}
+            for bill_id, bill in zip(bill_ids, bills)
+        ])
+        totals[0] += len(orders)
+        totals[1] += len(line_rows)
+        totals[2] += len(bills)
+        day += timedelta(days=1)
+    return tuple(totals)
+
+
+def seed_logins(password):
+    """One login per role (``admin``, ``manager`` ...), skipping ones that exist."""
+    created = []
+    for role in LOGIN_ROLES:
+        username = role.value.lower()
+        if User.query.filter_by(username=username).first():
+            continue
+        user = User(username=username, role=role)
+        user.set_password(password)
+        db.session.add(user)
+        created.append(username)
+    return created
+
+
+def seed(days=365, orders_per_day=120, menu_items=40, employees=15, inventory_items=12,
+         password='seed123', random_seed=42, progress=None):
+    """Fill an empty database and commit; returns a dict of row counts."""
+    say = progress or (lambda message: None)
+    rnd = random.Random(random_seed)
+    last_day = local_today()
+    first_day = last_day - timedelta(days=days - 1)
+
+    counts = {'logins': len(seed_logins(password))}
+    menu = seed_menu(rnd, menu_items)
+    counts['menu_items'] = menu_items
+    say(f'menu: {menu_items} items')
+    counts['attendance'] = seed_staff(rnd, employees, first_day, last_day)
+    counts['employees'] = employees
+    say(f'staff: {employees} employees, {counts["attendance"]} attendance rows')
+    counts['expenses'] = seed_pantry(rnd, inventory_items, first_day, last_day)
+    counts['inventory_items'] = inventory_items
+    say(f'inventory: {inventory_items} items, {counts["expenses"]} purchases')
+    db.session.flush()
+    counts['orders'], counts['order_lines'], counts['bills'] = seed_orders(
+        rnd, menu, first_day, last_day, orders_per_day)
+    say(f'orders: {counts["orders"]} orders, {counts["order_lines"]} lines, {counts["bills"]} bills')
+    db.session.commit()
+
+    counts['sales_days'] = daily_sales.rebuild(first_day, last_day)
+    return counts
@@ -0,0 +1,90 @@
+"""Order settlement: payment, bill and finance entry in one transaction.
+
+The unique ``Bill.order_id`` decides who wins when the Pay button is
+double-clicked or two cashiers pay the same order: the bill is written
+with INSERT .. ON CONFLICT DO NOTHING, and only the request whose insert
+went through marks the order paid and books the inflow. A request that
+carries the winner's ``idempotency_key`` is a replay and gets the same
+bill back.
+"""
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from ..extensions import db
+from ..models.billing import Bill
+from ..models.finance import FinanceTransaction, TransactionType
+from ..models.order import Order, OrderStatus
+from . import daily_sales
+from .money import ZERO
+from .sql import dialect_insert
+
+PAYMENT_MODES = ('Cash', 'Online')
+
+SettlementResult = namedtuple('SettlementResult', 'bill_id created replayed')
+
+
+class SettlementError(Exception):
+    pass
+
+
+def bill_amounts(total_items):
+    # GST / service charge abhi 0% hain (invoice pe labels purane hain)
+    gst = total_items * 0
+    service_charge = total_items * 0
+    return {
+        'total_items': total_items,
+        'gst': gst,
+        'service_charge': service_charge,
+        'grand_total': total_items + gst + service_charge,
+    }
+
+
+def settle_order(order_id, payment_mode, idempotency_key=None):
+    """Pay ``order_id`` and commit. Returns SettlementResult.
+
+    ``created`` is True for the request that generated the bill,
+    ``replayed`` when the bill already exists under the same key.
+    Both False means the order was already paid by someone else.
+    """
+    if payment_mode not in PAYMENT_MODES:
+        raise SettlementError('Please select a payment mode!')
+
+    total = db.session.execute(db.select(Order.total_amount).where(Order.id == order_id)).first()
+    if total is None:
+        raise SettlementError(f'Order #{order_id} not found')
+
+    now = datetime.now(timezone.utc)
+    amounts = bill_amounts(total[0] or ZERO)
+    stmt = dialect_insert(Bill).values(
+        order_id=order_id,
+        payment_mode=payment_mode,
+        idempotency_key=idempotency_key or None,
+        generated_at=now,
+        **amounts
+    ).on_conflict_do_nothing().returning(Bill.id)
+    bill_id = db.session.execute(stmt).scalar()
+
+    if bill_id is None:
+        db.session.rollback()
+        existing = db.session.execute(
+            db.select(Bill.id, Bill.idempotency_key).where(Bill.order_id == order_id)
+        ).first()
+        if existing is None:
+            raise SettlementError('Payment token already used for another order')
+        replayed = bool(idempotency_key) and existing.idempotency_key == idempotency_key
+        return SettlementResult(existing.id, False, replayed)
+
+    db.session.execute(
+        db.update(Order)
+        .where(Order.id == order_id)
+        .values(is_paid=True, paid_at=now, status=OrderStatus.PAID)
+    )
+    db.session.add(FinanceTransaction(
+        type=TransactionType.INFLOW,
+        amount=amounts['grand_total'],
+        description=f'{payment_mode} payment for Order #{order_id}',
+        bill_id=bill_id,
+    ))
+    daily_sales.record_bill(now, payment_mode, amounts['grand_total'])
+    db.session.commit()
+    return SettlementResult(bill_id, True, False)
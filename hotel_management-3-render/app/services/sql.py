@@ -0,0 +1,16 @@
+"""Small dialect helpers for statements SQLAlchemy core doesn't make portable."""
+from ..extensions import db
+
+
+def dialect_insert(model):
+    """INSERT that supports ``on_conflict_do_*`` on PostgreSQL and SQLite."""
+    # Dialect packages andar import karo: postgresql package (asyncpg waghera
+    # samet) import hone mein ~50ms lagta hai, SQLite pe uski zaroorat hi nahi
+    name = db.engine.dialect.name
+    if name == 'postgresql':
+        from sqlalchemy.dialects import postgresql
+        return postgresql.insert(model)
+    if name == 'sqlite':
+        from sqlalchemy.dialects import sqlite
+        return sqlite.insert(model)
+    raise RuntimeError(f'INSERT .. ON CONFLICT is not available on {name}')
@@ -0,0 +1,134 @@
+"""Inventory stock as numbers: quantity parsing and the purchase ledger.
+
+Quantities are typed as text ("5 kg", "500 g", "2 dozen"). ``parse_quantity``
+turns that into a Decimal in a normalized unit (g -> kg, ml -> l, dozen ->
+pcs), so an item's stock can be added up and summed in SQL.
+
+Every purchase is an Expense ledger entry that carries the item's running
+balance (stock and total spend) after it. The same balance is kept on the
+Inventory row, so current stock and spend are a primary-key read.
+"""
+import re
+from collections import namedtuple
+from decimal import Decimal
+
+from ..extensions import db
+from ..models.inventory import Expense, Inventory
+from .money import ZERO
+
+QTY = Decimal('0.001')
+
+# unit as typed -> (normalized unit, factor)
+UNITS = {
+    'kg': ('kg', 1), 'kgs': ('kg', 1), 'kilo': ('kg', 1), 'kilogram': ('kg', 1), 'kilograms': ('kg', 1),
+    'g': ('kg', Decimal('0.001')), 'gm': ('kg', Decimal('0.001')), 'gms': ('kg', Decimal('0.001')),
+    'gram': ('kg', Decimal('0.001')), 'grams': ('kg', Decimal('0.001')),
+    'l': ('l', 1), 'ltr': ('l', 1), 'ltrs': ('l', 1), 'litre': ('l', 1), 'litres': ('l', 1),
+    'liter': ('l', 1), 'liters': ('l', 1),
+    'ml': ('l', Decimal('0.001')),
+    '': ('pcs', 1), 'pc': ('pcs', 1), 'pcs': ('pcs', 1), 'piece': ('pcs', 1), 'pieces': ('pcs', 1),
+    'no': ('pcs', 1), 'nos': ('pcs', 1), 'unit': ('pcs', 1), 'units': ('pcs', 1),
+    'dozen': ('pcs', 12), 'dz': ('pcs', 12),
+    'pkt': ('pkt', 1), 'pkts': ('pkt', 1), 'packet': ('pkt', 1), 'packets': ('pkt', 1),
+    'box': ('box', 1), 'boxes': ('box', 1),
+    'bottle': ('bottle', 1), 'bottles': ('bottle', 1),
+}
+
+_QUANTITY = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([a-zA-Z]*)\.?\s*$')
+
+
+def parse_quantity(text):
+    """``"500 g"`` -> ``(Decimal('0.5'), 'kg')``. Old ``"5 kg + 2 kg"`` strings are added up.
+
+    Raises ValueError on anything it can't read or on mixed units.
+    """
+    total, unit = None, None
+    for part in (text or '').split('+'):
+        match = _QUANTITY.match(part)
+        if not match:
+            raise ValueError('Invalid quantity!')
+        amount = Decimal(match.group(1))
+        typed = match.group(2).lower()
+        part_unit, factor = UNITS.get(typed, (typed, 1))
+        if len(part_unit) > 10:
+            raise ValueError('Invalid quantity!')
+        if unit is not None and part_unit != unit:
+            raise ValueError('Invalid quantity!')
+        total = (total or 0) + amount * factor
+        unit = part_unit
+    return Decimal(total).quantize(QTY), unit
+
+
+LastExpense = namedtuple('LastExpense', 'expense_id date payment_amount added_quantity_with_unit payment_mode')
+ItemSummary = namedtuple('ItemSummary', 'item expense_count total_expense last_expense')
+
+
+def item_summaries(item_id=None):
+    """ItemSummary per inventory item (newest items first), in one query.
+
+    Expense count, total spend and latest date come from one GROUP BY over
+    the (item_id, date) index; the latest entry itself is joined back on
+    that date.
+    """
+    totals = db.select(
+        Expense.item_id,
+        db.func.count().label('expense_count'),
+        db.func.sum(Expense.payment_amount).label('total_expense'),
+        db.func.max(Expense.date).label('last_date'),
+    ).group_by(Expense.item_id)
+    if item_id is not None:
+        totals = totals.where(Expense.item_id == item_id)
+    totals = totals.subquery()
+    last = db.aliased(Expense)
+
+    query = db.select(
+        Inventory, totals.c.expense_count, totals.c.total_expense,
+        last.expense_id, last.date, last.payment_amount, last.added_quantity_with_unit, last.payment_mode,
+    ).outerjoin(totals, totals.c.item_id == Inventory.item_id)\
+        .outerjoin(last, db.and_(last.item_id == Inventory.item_id, last.date == totals.c.last_date))
+    if item_id is not None:
+        query = query.where(Inventory.item_id == item_id)
+    query = query.order_by(Inventory.created_at.desc(), Inventory.item_id, last.expense_id)
+
+    summaries = {}
+    for item, count, total, *latest in db.session.execute(query):
+        # Same timestamp pe do entries: baad wali (bada expense_id) jeetegi
+        summaries[item.item_id] = ItemSummary(
+            item, count or 0, total or ZERO, LastExpense(*latest) if latest[0] is not None else None
+        )
+    return list(summaries.values())
+
+
+def format_quantity(quantity, unit):
+    text = format(Decimal(quantity).quantize(QTY).normalize(), 'f')
+    return f'{text} {unit}'
+
+
+def record_purchase(item, quantity, unit, payment_amount, payment_mode):
+    """Add a ledger entry for ``item`` and move its balance. Caller commits.
+
+    ValueError if ``unit`` isn't the item's unit.
+
+    Load ``item`` with ``with_for_update()`` so two purchases can't both
+    read the same balance. A new item must be flushed first (it needs its
+    ``item_id``).
+    """
+    if unit != item.unit:
+        raise ValueError(f"Unit must match the item's unit ({item.unit})!")
+    item.quantity = (item.quantity or 0) + quantity
+    item.total_spent = (item.total_spent or ZERO) + payment_amount
+    item.quantity_with_unit = format_quantity(item.quantity, item.unit)
+
+    expense = Expense(
+        item_id=item.item_id,
+        added_quantity_with_unit=format_quantity(quantity, unit),
+        quantity=quantity,
+        unit=unit,
+        payment_amount=payment_amount,
+        payment_mode=payment_mode,
+        balance_quantity=item.quantity,
+        balance_spent=item.total_spent,
+    )
+    # item.expenses.append() poori history load kar leta; seedha add karo
+    db.session.add(expense)
+    return expense
@@ -0,0 +1,69 @@
+"""Optional warm-up before a worker takes traffic (WARMUP_ON_START).
+
+An instance that was spun down pays for the first pool connections
+(TCP + TLS to Postgres), Jinja compiling each template and the first
+menu catalog load on its first customer's requests. ``warm_up`` does that
+work inside ``create_app``, i.e. while gunicorn is still booting the
+worker. Don't combine it with ``gunicorn --preload``: connections opened
+in the master would be shared by every forked worker.
+
+Compiling every template is most of that time. With TEMPLATE_CACHE_DIR
+set, Jinja keeps the compiled code on disk (checked against the template
+source), so a new process loads it instead of compiling; fill it at build
+time with ``flask compile-templates``.
+"""
+import os
+import time
+
+from jinja2 import FileSystemBytecodeCache
+
+from ..extensions import db
+from . import catalog
+
+
+def open_connections(engine, count):
+    """Check out ``count`` connections at once and return them to the pool."""
+    connections = []
+    try:
+        for _ in range(count):
+            connections.append(engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()
+    return len(connections)
+
+
+def use_template_cache(app, directory):
+    os.makedirs(directory, exist_ok=True)
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory)
+
+
+def compile_templates(app):
+    names = [name for name in app.jinja_env.list_templates() if name.endswith('.html')]
+    for name in names:
+        app.jinja_env.get_template(name)
+    return len(names)
+
+
+def warm_up(app):
+    """Returns ``{step: seconds}``; a failing step is logged and skipped."""
+    timings = {}
+    with app.app_context():
+        engine = db.engine
+        pool_size = engine.pool.size() if hasattr(engine.pool, 'size') else 1
+        steps = (
+            ('connections', lambda: open_connections(engine, app.config.get('WARMUP_CONNECTIONS') or pool_size)),
+            ('templates', lambda: compile_templates(app)),
+            ('menu catalog', catalog.get_categories),
+        )
+        for name, step in steps:
+            start = time.perf_counter()
+            try:
+                step()
+            except Exception:
+                app.logger.exception('Warm-up step %r failed', name)
+                continue
+            timings[name] = time.perf_counter() - start
+        db.session.remove()
+    app.logger.info('Warm-up done: %s', ', '.join(f'{name} {secs * 1000:.0f}ms' for name, secs in timings.items()))
+    return timings
@@ -0,0 +1,52 @@
+// Theme Toggle
+function toggleTheme() {
+    const html = document.documentElement;
+    const currentTheme = html.getAttribute('data-theme');
+    const newTheme = currentTheme === 'dark' ? 'light' : 'dark';
+    html.setAttribute('data-theme', newTheme);
+    localStorage.setItem('theme', newTheme);
+}
+
+window.addEventListener('DOMContentLoaded', () => {
+    const savedTheme = localStorage.getItem('theme') || 'light';
+    document.documentElement.setAttribute('data-theme', savedTheme);
+
+    const dateElement = document.getElementById('currentDate');
+    if (dateElement) {
+        const today = new Date();
+        dateElement.textContent = today.toLocaleDateString('en-US', {
+            weekday: 'long', year: 'numeric', month: 'long', day: 'numeric'
+        });
+    }
+});
+
+// Hide loader on page load
+window.addEventListener('load', function() {
+    const loader = document.getElementById('globalLoader');
+    if (loader) {
+        loader.style.opacity = '0';
+        setTimeout(() => { loader.style.display = 'none'; }, 600);
+    }
+});
+
+// Login page: Show Loader on Form Submit
+const loginForm = document.getElementById('loginForm');
+if (loginForm) {
+    loginForm.addEventListener('submit', function() {
+        document.getElementById('loader').style.display = 'flex';
+    });
+}
+
+// Signup page: Password match validation
+const confirmPasswordInput = document.getElementById('confirm_password');
+if (confirmPasswordInput) {
+    confirmPasswordInput.form.addEventListener('submit', function(e) {
+        const password = document.getElementById('password').value;
+        const confirmPassword = confirmPasswordInput.value;
+
+        if (password !== confirmPassword) {
+            e.preventDefault();
+            alert('❌ Passwords do not match!');
+        }
+    });
+}
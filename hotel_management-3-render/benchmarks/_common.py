@@ -0,0 +1,145 @@
+"""Helpers shared by the benchmark scripts.
+
+Run them from the project root, e.g. ``python -m benchmarks.bench_date_window``.
+``BENCH_DATABASE_URL`` picks the database; by default a throwaway SQLite
+file in the temp dir is used, with the local profile's WAL pragmas. The
+schema is dropped and recreated on start, so never point it at a real
+database.
+"""
+import os
+import random
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, insert
+
+from app import create_app
+from app.config import LocalConfig
+from app.extensions import db
+
+
+class BenchConfig(LocalConfig):
+    SQLALCHEMY_DATABASE_URI = os.getenv('BENCH_DATABASE_URL') or \
+        'sqlite:///' + os.path.join(tempfile.gettempdir(), 'hotel_bench.db')
+    TESTING = True
+    AUTO_CREATE_TABLES = False  # make_app() khud drop/create karta hai
+    JOB_WORKER_THREADS = 0  # queued jobs timings mein na aayein; jobs ka alag benchmark nahi
+
+
+def make_app():
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+    return app
+
+
+@contextmanager
+def count_queries():
+    """Count SQL statements sent to the engine inside the block."""
+    counter = {'count': 0}
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        counter['count'] += 1
+
+    event.listen(db.engine, 'before_cursor_execute', _before)
+    try:
+        yield counter
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', _before)
+
+
+def timed(fn, repeat=20):
+    """Run ``fn`` ``repeat`` times, return p50/p95/max in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        'p50': statistics.median(samples),
+        'p95': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        'max': samples[-1],
+    }
+
+
+def fmt(stats):
+    return ' '.join(f"{k}={v:.2f}ms" for k, v in stats.items())
+
+
+def seed_menu(categories=5, items_per_category=10, seed=42):
+    """Insert a menu and return ``(id, price)`` for every item."""
+    from app.models.menu import Category, MenuItem
+
+    rnd = random.Random(seed)
+    items = []
+    for c in range(categories):
+        category = Category(name=f'Category {c + 1}')
+        db.session.add(category)
+        for i in range(items_per_category):
+            item = MenuItem(name=f'Dish {c + 1}.{i + 1}', price=float(rnd.randint(50, 500)), category=category)
+            db.session.add(item)
+            items.append(item)
+    db.session.commit()
+    return [(item.id, item.price) for item in items]
+
+
+def login(app, role='ADMIN', username=None):
+    """Create a user with ``role`` and return a logged-in test client."""
+    from app.models.user import User, Role
+
+    username = username or f'bench_{role.lower()}'
+    with app.app_context():
+        if not User.query.filter_by(username=username).first():
+            user = User(username=username, role=Role[role])
+            user.set_password('bench')
+            db.session.add(user)
+            db.session.commit()
+    client = app.test_client()
+    client.post('/login', data={'username': username, 'password': 'bench'})
+    return client
+
+
+def seed_year(orders_per_day=100, days=365, seed=42):
+    """Bulk insert ``days`` of orders, bills, finance entries and expenses."""
+    from app.models.order import Order
+    from app.models.billing import Bill
+    from app.models.finance import FinanceTransaction
+    from app.models.inventory import Inventory, Expense, InventoryCategory
+
+    rnd = random.Random(seed)
+    start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=days)
+
+    item = Inventory(item_name='Rice', category=InventoryCategory.GROCERY, quantity_with_unit='0 kg', unit='kg')
+    db.session.add(item)
+    db.session.flush()
+
+    orders, bills, finance, expenses = [], [], [], []
+    order_id = 0
+    for day in range(days):
+        day_start = start + timedelta(days=day)
+        for _ in range(orders_per_day):
+            order_id += 1
+            at = day_start + timedelta(seconds=rnd.randint(0, 86399))
+            amount = float(rnd.randint(100, 3000))
+            orders.append({'id': order_id, 'order_type': 'Dine-in', 'table_number': str(rnd.randint(1, 20)),
+                           'status': 'Paid', 'created_at': at, 'total_amount': amount, 'edit_count': 0,
+                           'is_paid': True, 'paid_at': at})
+            bills.append({'id': order_id, 'order_id': order_id, 'total_items': amount, 'gst': 0.0,
+                          'service_charge': 0.0, 'grand_total': amount, 'generated_at': at,
+                          'payment_mode': rnd.choice(['Cash', 'Online'])})
+            finance.append({'type': 'Inflow', 'amount': amount, 'description': f'Order #{order_id}',
+                            'date': at, 'bill_id': order_id})
+        expenses.append({'item_id': item.item_id, 'added_quantity_with_unit': '5 kg',
+                         'payment_amount': rnd.randint(200, 900), 'date': day_start + timedelta(hours=9)})
+
+    db.session.execute(insert(Order), orders)
+    db.session.execute(insert(Bill), bills)
+    db.session.execute(insert(FinanceTransaction), finance)
+    db.session.execute(insert(Expense), expenses)
+    db.session.commit()
+    return len(orders)
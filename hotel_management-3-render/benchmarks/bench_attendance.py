@@ -0,0 +1,62 @@
+"""Morning attendance for 60 staff: one POST per employee vs one bulk POST.
+
+The per-employee form costs a page round trip (and a check-then-insert)
+per person; ``/attendance/day`` writes the whole roster with one upsert.
+Also times the per-employee month query the unique (employee_id, date)
+index serves, after two years of history.
+"""
+from datetime import date, timedelta
+
+from sqlalchemy import insert
+
+from app.extensions import db
+from app.models.attendance import Attendance, AttendanceStatus
+from app.models.employee import Employee, EmployeeRole
+
+from ._common import count_queries, fmt, login, make_app, timed
+
+STAFF = 60
+
+
+def main():
+    app = make_app()
+    with app.app_context():
+        db.session.execute(insert(Employee), [
+            {'name': f'Staff {n:02d}', 'age': 30, 'salary': 18000, 'role': EmployeeRole.WAITER,
+             'hire_date': date(2020, 1, 1)} for n in range(STAFF)
+        ])
+        history_start = date.today() - timedelta(days=730)
+        db.session.execute(insert(Attendance), [
+            {'employee_id': emp, 'date': history_start + timedelta(days=d), 'status': AttendanceStatus.PRESENT}
+            for emp in range(1, STAFF + 1) for d in range(700)
+        ])
+        db.session.commit()
+    client = login(app)
+
+    days = iter(range(1, 10000))
+
+    def one_by_one():
+        day = (date.today() + timedelta(days=next(days))).isoformat()
+        for emp in range(1, STAFF + 1):
+            client.post(f'/attendance/list/{emp}', data={'date': day, 'status': 'Present'})
+
+    def bulk():
+        day = (date.today() + timedelta(days=next(days))).isoformat()
+        form = {f'status_{emp}': 'Present' for emp in range(1, STAFF + 1)}
+        client.post('/attendance/day', data={'date': day, **form})
+
+    with app.app_context():
+        with count_queries() as old_q:
+            one_by_one()
+        with count_queries() as new_q:
+            bulk()
+    print(f'{STAFF} employees: one by one {old_q["count"]} queries, bulk {new_q["count"]} queries')
+    print(f'  one by one  {fmt(timed(one_by_one, repeat=5))}')
+    print(f'  bulk        {fmt(timed(bulk, repeat=5))}')
+
+    month = timed(lambda: client.get('/attendance/list/30'), repeat=20)
+    print(f'  employee page, 700 days history {fmt(month)}')
+
+
+if __name__ == '__main__':
+    main()
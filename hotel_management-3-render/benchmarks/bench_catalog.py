@@ -0,0 +1,35 @@
+"""Order-entry page cost vs menu size, with a warm and a cold catalog cache.
+
+"cold" bumps the menu version before every request, which is what every
+request paid before the cache existed.
+"""
+from app.extensions import db
+from app.services import catalog
+
+from ._common import count_queries, fmt, login, make_app, seed_menu, timed
+
+
+def main():
+    for categories, per_category in ((5, 10), (10, 50), (20, 100)):
+        app = make_app()
+        with app.app_context():
+            seed_menu(categories, per_category)
+        client = login(app)
+
+        def cold():
+            with app.app_context():
+                catalog.invalidate()
+                db.session.commit()
+            client.get('/orders/add')
+
+        client.get('/orders/add')
+        with app.app_context(), count_queries() as counter:
+            client.get('/orders/add')
+        warm_stats = timed(lambda: client.get('/orders/add'))
+        cold_stats = timed(cold)
+        print(f"{categories * per_category:>5} items: warm {counter['count']} queries {fmt(warm_stats)}")
+        print(f"{'':>11} cold {fmt(cold_stats)}")
+
+
+if __name__ == '__main__':
+    main()
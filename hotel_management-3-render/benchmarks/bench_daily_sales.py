@@ -0,0 +1,47 @@
+"""Dashboard revenue: summing every Bill in Python vs the DailySales rollup.
+
+Seeds a year of bills, backfills the rollup with ``flask rebuild-daily-sales``
+and compares a one-day, one-month and one-year window. Also checks the
+two give the same totals.
+"""
+from datetime import timedelta
+
+from app.extensions import db
+from app.models.billing import Bill
+from app.services import daily_sales
+from app.services.date_window import DateWindow, local_today
+
+from ._common import fmt, make_app, seed_year, timed
+
+
+def python_sum(window):
+    bills = Bill.query.filter(window.filter(Bill.generated_at)).all()
+    return (sum(b.grand_total for b in bills),
+            sum(b.grand_total for b in bills if b.payment_mode == 'Cash'),
+            sum(b.grand_total for b in bills if b.payment_mode == 'Online'))
+
+
+def rollup_sum(window):
+    sales = daily_sales.totals(window)
+    return sales.total_revenue, sales.cash_revenue, sales.online_revenue
+
+
+def main():
+    app = make_app()
+    with app.app_context():
+        seed_year()
+    result = app.test_cli_runner().invoke(args=['rebuild-daily-sales'])
+    print(result.output.strip())
+
+    with app.app_context():
+        today = local_today()
+        for label, days in (('day', 0), ('month', 29), ('year', 364)):
+            window = DateWindow(today - timedelta(days=days + 1), today - timedelta(days=1))
+            assert [round(v, 2) for v in python_sum(window)] == [round(v, 2) for v in rollup_sum(window)]
+            old = timed(lambda: (python_sum(window), db.session.expunge_all()), repeat=5)
+            new = timed(lambda: rollup_sum(window), repeat=5)
+            print(f"{label:>5}: bills in python {fmt(old)}\n       rollup          {fmt(new)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""Compare ``date(column)`` filters with DateWindow range filters.
+
+Seeds a year of orders/bills/finance/expenses, prints the query plan for
+both predicate styles and times a one-day and a one-month window.
+"""
+from datetime import timedelta
+
+from sqlalchemy import func, select
+
+from app.extensions import db
+from app.models.billing import Bill
+from app.models.finance import FinanceTransaction
+from app.models.inventory import Expense
+from app.models.order import Order
+from app.services.date_window import DateWindow, local_today
+
+from ._common import fmt, make_app, seed_year, timed
+
+COLUMNS = [Order.created_at, Bill.generated_at, Expense.date, FinanceTransaction.date]
+
+
+def explain(stmt):
+    compiled = stmt.compile(db.engine, compile_kwargs={'literal_binds': True})
+    prefix = 'EXPLAIN QUERY PLAN ' if db.engine.dialect.name == 'sqlite' else 'EXPLAIN '
+    rows = db.session.execute(db.text(prefix + str(compiled))).all()
+    return ' | '.join(str(r[-1]) for r in rows)
+
+
+def main():
+    app = make_app()
+    with app.app_context():
+        total = seed_year()
+        print(f"seeded {total} orders on {db.engine.dialect.name}")
+
+        today = local_today()
+        windows = {
+            'day': DateWindow(today - timedelta(days=30), today - timedelta(days=30)),
+            'month': DateWindow(today - timedelta(days=60), today - timedelta(days=31)),
+        }
+        for column in COLUMNS:
+            name = f"{column.class_.__tablename__}.{column.key}"
+            for label, window in windows.items():
+                old = select(func.count()).where(func.date(column).between(window.start_date, window.end_date))
+                new = select(func.count()).where(window.filter(column))
+                old_stats = timed(lambda: db.session.execute(old).scalar())
+                new_stats = timed(lambda: db.session.execute(new).scalar())
+                print(f"\n{name} [{label}]")
+                print(f"  date(col):  {fmt(old_stats)}\n    plan: {explain(old)}")
+                print(f"  window:     {fmt(new_stats)}\n    plan: {explain(new)}")
+
+
+if __name__ == '__main__':
+    main()
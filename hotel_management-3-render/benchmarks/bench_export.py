@@ -0,0 +1,101 @@
+"""Bills CSV export: rows per second and peak RSS at growing sizes.
+
+For each size a fresh database is seeded, then every export runs in its own
+child process so the peak RSS is the peak of that export alone. "buffered"
+is the obvious alternative (load the bills as ORM objects, build the CSV in
+memory) for comparison. Sizes come from the command line, e.g.
+``python -m benchmarks.bench_export 10000 100000 1000000``.
+"""
+import csv
+import io
+import resource
+import subprocess
+import sys
+import time
+from datetime import timedelta
+
+from app.models.billing import Bill
+from app.services.date_window import DateWindow, local_today
+
+from ._common import BenchConfig, login, make_app, seed_year
+
+DAYS = 365
+
+
+def year_window():
+    today = local_today()
+    return DateWindow(today - timedelta(days=DAYS + 1), today)
+
+
+def streamed(app, gzip):
+    client = login(app)
+    with app.app_context():
+        window = year_window()
+    url = f'/billing/export?start_date={window.start_date}&end_date={window.end_date}'
+    if gzip:
+        url += '&gzip=1'
+    response = client.get(url, buffered=False)
+    size = 0
+    for chunk in response.response:
+        size += len(chunk)
+    response.close()
+    return size
+
+
+def buffered(app, gzip):
+    with app.app_context():
+        bills = Bill.query.filter(year_window().filter(Bill.generated_at)).all()
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for bill in bills:
+            writer.writerow([bill.id, bill.order_id, bill.generated_at, bill.payment_mode,
+                             bill.total_items, bill.gst, bill.service_charge, bill.grand_total])
+        return len(buffer.getvalue().encode('utf-8'))
+
+
+def peak_rss_mb():
+    # ru_maxrss (Linux) keeps the parent's peak across fork+exec; VmHWM doesn't
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def child(mode):
+    """Runs in the subprocess: one export, prints seconds, bytes and peak RSS (MB)."""
+    from app import create_app
+
+    app = create_app(BenchConfig)
+    start = time.perf_counter()
+    size = {'streamed': lambda: streamed(app, False), 'streamed+gzip': lambda: streamed(app, True),
+            'buffered': lambda: buffered(app, False)}[mode]()
+    elapsed = time.perf_counter() - start
+    peak_mb = peak_rss_mb()
+    print(f'{elapsed} {size} {peak_mb}')
+
+
+def main(sizes):
+    for rows in sizes:
+        app = make_app()
+        with app.app_context():
+            seed_year(orders_per_day=max(1, rows // DAYS), days=DAYS)
+        login(app)  # user pehle hi bana lo, child sirf login kare
+        count = max(1, rows // DAYS) * DAYS
+        print(f'{count} bills')
+        for mode in ('streamed', 'streamed+gzip', 'buffered'):
+            out = subprocess.run([sys.executable, '-m', 'benchmarks.bench_export', '--child', mode],
+                                 capture_output=True, text=True, check=True).stdout.split()
+            elapsed, size, peak_mb = float(out[0]), int(out[1]), float(out[2])
+            print(f'  {mode:<14} {count / elapsed:>10,.0f} rows/s  {size / 1e6:7.1f} MB out  '
+                  f'peak RSS {peak_mb:6.1f} MB')
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--child']:
+        child(sys.argv[2])
+    else:
+        main([int(arg) for arg in sys.argv[1:]] or [10000, 100000])
@@ -0,0 +1,61 @@
+"""Queries per authenticated request with and without the identity cache.
+
+Hits a light page (the menu, itself served from the catalog cache) as a
+logged-in user and counts SQL statements per request, first with
+USER_CACHE_TTL = 0 (the old ``User.query.get`` every time), then with the
+cache on. Also checks a role change made through the ORM is picked up.
+"""
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models.user import Role, User
+
+from ._common import fmt, login, make_app, seed_menu, timed
+
+REQUESTS = 200
+
+
+def run(app, client):
+    # Requests app context ke bahar chalao: andar chalein to flask-login ka
+    # g._login_user requests ke beech share ho jata hai aur loader chalta hi nahi
+    with app.app_context():
+        engine = db.engine
+    queries = {'count': 0}
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        queries['count'] += 1
+
+    event.listen(engine, 'before_cursor_execute', _before)
+    try:
+        for _ in range(REQUESTS):
+            client.get('/menu/')
+    finally:
+        event.remove(engine, 'before_cursor_execute', _before)
+    return queries['count'] / REQUESTS
+
+
+def main():
+    app = make_app()
+    with app.app_context():
+        seed_menu()
+    client = login(app, 'MANAGER')
+    client.get('/menu/')
+
+    for label, ttl in (('no cache', 0), ('identity cache', 300)):
+        app.config['USER_CACHE_TTL'] = ttl
+        per_request = run(app, client)
+        stats = timed(lambda: client.get('/menu/'), repeat=REQUESTS)
+        print(f'  {label:<15} {per_request:.2f} queries/request  {fmt(stats)}')
+
+    # Role change -> version bump -> cache dropped on the next check
+    app.config['USER_CACHE_CHECK_SECONDS'] = 0
+    with app.app_context():
+        user = User.query.filter_by(username='bench_manager').one()
+        user.role = Role.WAITER
+        db.session.commit()
+    assert client.get('/menu/add').status_code == 302
+    print('  role change picked up: yes')
+
+
+if __name__ == '__main__':
+    main()
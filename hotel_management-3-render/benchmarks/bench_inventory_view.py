@@ -0,0 +1,86 @@
+"""Inventory overview: query count and latency as the item count grows.
+
+``/inventory/view_all`` used to run a "last expense" query plus a lazy
+load of ``item.expenses`` for every item (2N + 1). It now runs one
+grouped query, so the number of statements must not depend on N. The
+script fails if it does, which makes it usable as a regression check.
+"""
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, insert
+
+from app.extensions import db
+from app.models.inventory import Expense, Inventory, InventoryCategory, PaymentMode
+
+from ._common import fmt, login, make_app, timed
+
+EXPENSES_PER_ITEM = 50
+
+
+def add_items(count, rnd=random.Random(5)):
+    start = datetime.utcnow() - timedelta(days=365)
+    first = (db.session.query(db.func.max(Inventory.item_id)).scalar() or 0) + 1
+    db.session.execute(insert(Inventory), [
+        {'item_id': first + n, 'item_name': f'Item {first + n}', 'category': InventoryCategory.GROCERY,
+         'quantity_with_unit': '0 kg', 'unit': 'kg', 'created_at': start + timedelta(minutes=n)}
+        for n in range(count)
+    ])
+    db.session.execute(insert(Expense), [
+        {'item_id': first + n, 'added_quantity_with_unit': '5 kg', 'quantity': 5, 'unit': 'kg',
+         'payment_amount': rnd.randint(100, 900), 'payment_mode': PaymentMode.CASH,
+         'date': start + timedelta(days=d, minutes=n)}
+        for n in range(count) for d in range(EXPENSES_PER_ITEM)
+    ])
+    db.session.commit()
+
+
+def per_item(app):
+    """The old view_all loop, for comparison."""
+    with app.app_context():
+        items = Inventory.query.order_by(Inventory.created_at.desc()).all()
+        for item in items:
+            item.last_expense = Expense.query.filter_by(item_id=item.item_id).order_by(Expense.date.desc()).first()
+            item.total_expense = sum(e.payment_amount for e in item.expenses)
+
+
+def queries_for(app, client, path):
+    with app.app_context():
+        engine = db.engine
+    counter = {'count': 0}
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        counter['count'] += 1
+
+    client.get(path)  # warm up (user identity, caches)
+    event.listen(engine, 'before_cursor_execute', _before)
+    try:
+        assert client.get(path).status_code == 200
+    finally:
+        event.remove(engine, 'before_cursor_execute', _before)
+    return counter['count']
+
+
+def main():
+    app = make_app()
+    client = login(app)
+    counts = {}
+    total = 0
+    for target in (10, 100, 500):
+        with app.app_context():
+            add_items(target - total)
+        total = target
+        counts[target] = queries_for(app, client, '/inventory/view_all')
+        stats = timed(lambda: client.get('/inventory/view_all'), repeat=10)
+        old = timed(lambda: per_item(app), repeat=3)
+        detail = queries_for(app, client, '/inventory/view/1')
+        print(f'{target:>4} items x {EXPENSES_PER_ITEM} expenses: view_all {counts[target]} queries {fmt(stats)}'
+              f' | view {detail} queries')
+        print(f'{"":>23} old loop {2 * target + 1} queries {fmt(old)}')
+
+    assert len(set(counts.values())) == 1, f'view_all query count grows with items: {counts}'
+    print('query count constant: ok')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""Invoice PDFs: one-by-one rendering vs the process pool vs the disk cache.
+
+Seeds a month of bills, then renders all of them into a zip the old way
+(one ReportLab canvas after another), with ``render_batch`` in a pool, and
+once more with every PDF already cached. Also times a single
+``/billing/download_pdf`` click, cold and cached.
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+from app.models.billing import Bill
+from app.services import invoices
+
+from ._common import BenchConfig, fmt, login, make_app, seed_year, timed
+
+
+def main(orders_per_day=20, days=30):
+    BenchConfig.INVOICE_CACHE_DIR = tempfile.mkdtemp(prefix='hotel_invoices_')
+    app = make_app()
+    try:
+        with app.app_context():
+            seed_year(orders_per_day=orders_per_day, days=days)
+            bills = Bill.query.order_by(Bill.id).all()
+            print(f'{len(bills)} bills, {os.cpu_count()} CPUs')
+
+            start = time.perf_counter()
+            for bill in bills:
+                invoices.render_invoice(invoices.invoice_data(bill))
+            print(f'  one by one        {time.perf_counter() - start:6.2f}s')
+
+            for label in ('pool, cold cache', 'pool, warm cache'):
+                start = time.perf_counter()
+                paths, rendered = invoices.render_batch(bills)
+                invoices.write_zip(paths, BytesIO())
+                print(f'  {label:<17} {time.perf_counter() - start:6.2f}s  ({rendered} rendered)')
+
+        client = login(app)
+        with app.app_context():
+            bill_id = bills[0].id
+        shutil.rmtree(BenchConfig.INVOICE_CACHE_DIR)
+        cold = timed(lambda: client.get(f'/billing/download_pdf/{bill_id}'), repeat=1)
+        warm = timed(lambda: client.get(f'/billing/download_pdf/{bill_id}'), repeat=20)
+        print(f'  single PDF cold   {fmt(cold)}')
+        print(f'  single PDF cached {fmt(warm)}')
+    finally:
+        shutil.rmtree(BenchConfig.INVOICE_CACHE_DIR, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,96 @@
+"""Shift-change login burst next to order entry.
+
+Runs the app on a threaded werkzeug server (like gunicorn gthread). One
+thread keeps entering orders and records their latency, while 12 staff
+log in over and over. This runs first with no logins, then with hashing
+effectively unbounded (every login thread hashes at once), then with the
+default bounded executor (PASSWORD_HASH_WORKERS). The per-username
+throttle is switched off here so every login really hashes.
+"""
+import http.client
+import logging
+import statistics
+import threading
+import time
+from urllib.parse import urlencode
+
+from werkzeug.serving import make_server
+
+from app.extensions import db
+from app.models.user import Role, User
+from app.services import passwords
+
+from ._common import login, make_app, seed_menu
+
+STAFF = 12
+SECONDS = 5
+
+
+def post(port, path, form, cookie=None):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+    if cookie:
+        headers['Cookie'] = f'session={cookie}'
+    start = time.perf_counter()
+    conn.request('POST', path, urlencode(form), headers)
+    status = conn.getresponse().status
+    conn.close()
+    return status, (time.perf_counter() - start) * 1000
+
+
+def scenario(app, port, cookie, dish_id, workers, logins):
+    app.config['PASSWORD_HASH_WORKERS'] = workers
+    passwords._pool['executor'] = None  # naye settings ke saath executor dobara banao
+    stop = time.perf_counter() + SECONDS
+    login_count = [0]
+
+    def staff(n):
+        while time.perf_counter() < stop:
+            post(port, '/login', {'username': f'staff{n}', 'password': 'shift-change'})
+            login_count[0] += 1
+
+    threads = [threading.Thread(target=staff, args=(n,)) for n in range(STAFF if logins else 0)]
+    for thread in threads:
+        thread.start()
+    latencies = []
+    while time.perf_counter() < stop:
+        status, ms = post(port, '/orders/add', {'order_type': 'Dine-in', 'table_number': '3',
+                                                 f'qty_{dish_id}': '2'}, cookie)
+        assert status == 302, status
+        latencies.append(ms)
+    for thread in threads:
+        thread.join()
+    latencies.sort()
+    return (statistics.median(latencies), latencies[int(len(latencies) * 0.95)], len(latencies),
+            login_count[0])
+
+
+def main():
+    app = make_app()
+    app.config['PASSWORD_ATTEMPTS_PER_MINUTE'] = 0
+    app.config['PASSWORD_HASH_QUEUE'] = 100
+    with app.app_context():
+        dish_id = seed_menu(1, 3)[0][0]
+        for n in range(STAFF):
+            user = User(username=f'staff{n}', role=Role.WAITER)
+            user.set_password('shift-change')
+            db.session.add(user)
+        db.session.commit()
+    cookie = login(app).get_cookie('session').value
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    default_workers = app.config['PASSWORD_HASH_WORKERS']
+    for label, workers, logins in (('orders only', default_workers, False),
+                                   ('unbounded hashing', STAFF, True),
+                                   (f'bounded ({default_workers} workers)', default_workers, True)):
+        p50, p95, orders, logins_done = scenario(app, server.port, cookie, dish_id, workers, logins)
+        print(f'  {label:<22} order p50={p50:7.1f}ms p95={p95:7.1f}ms  '
+              f'{orders / SECONDS:5.1f} orders/s  {logins_done / SECONDS:5.1f} logins/s')
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
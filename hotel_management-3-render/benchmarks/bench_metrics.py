@@ -0,0 +1,35 @@
+"""Cost of the request / SQL instrumentation behind ``/metrics``.
+
+Seeds a week of orders, then times the orders list and the dashboard
+with METRICS_ENABLED off and on (two apps on the same database), and
+the ``/metrics`` scrape itself.
+"""
+from app import create_app
+
+from ._common import BenchConfig, fmt, login, make_app, seed_year, timed
+
+PAGES = ('/orders/', '/dashboard')
+REQUESTS = 200
+
+
+class NoMetricsConfig(BenchConfig):
+    METRICS_ENABLED = False
+
+
+def main():
+    app = make_app()
+    with app.app_context():
+        seed_year(orders_per_day=100, days=7)
+
+    for label, config in (('metrics off', NoMetricsConfig), ('metrics on', BenchConfig)):
+        client = login(create_app(config))
+        for page in PAGES:
+            client.get(page)
+            print(f'  {label:<12} {page:<12} {fmt(timed(lambda: client.get(page), repeat=REQUESTS))}')
+
+    scrape = timed(lambda: client.get('/metrics'), repeat=REQUESTS)
+    print(f'  /metrics scrape           {fmt(scrape)}')
+
+
+if __name__ == '__main__':
+    main()
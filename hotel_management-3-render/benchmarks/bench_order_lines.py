@@ -0,0 +1,74 @@
+"""Order-line ingestion: per-key loop (old order_routes code) vs order_lines.
+
+Builds a 15-dish family order, then edits it with 15 more dishes (half of
+them already on the order), and reports statements and orders per second.
+"""
+import random
+import time
+
+from app.extensions import db
+from app.models.menu import MenuItem
+from app.models.order import Order, OrderItem
+from app.services.order_lines import add_lines, available_items, parse_quantities
+
+from ._common import count_queries, make_app, seed_menu
+
+ORDERS = 200
+
+
+def legacy_lines(order, form, edit_round=0):
+    total = 0
+    for key in form:
+        if key.startswith('qty_'):
+            qty = int(form.get(key, 0))
+            if qty > 0:
+                item = db.session.get(MenuItem, key.split('_')[1])
+                if item and item.available:
+                    existing = OrderItem.query.filter_by(order_id=order.id, menu_item_id=item.id).first() \
+                        if edit_round else None
+                    if existing:
+                        existing.quantity += qty
+                    else:
+                        db.session.add(OrderItem(order_id=order.id, menu_item_id=item.id, quantity=qty,
+                                                 price_at_time=item.price, added_after_edit=edit_round))
+                    total += qty * item.price
+    return total
+
+
+def bulk_lines(order, form, edit_round=0):
+    quantities = parse_quantities(form)
+    return add_lines(order.id, quantities, available_items(quantities.keys()), edit_round=edit_round)
+
+
+def run(ingest, menu_ids, rnd):
+    statements = 0
+    start = time.perf_counter()
+    for _ in range(ORDERS):
+        first = {f'qty_{i}': '2' for i in rnd.sample(menu_ids, 15)}
+        second = {f'qty_{i}': '1' for i in rnd.sample(menu_ids[:8], 8) + rnd.sample(menu_ids, 7)}
+        with count_queries() as counter:
+            order = Order(order_type='Dine-in', table_number='1')
+            db.session.add(order)
+            db.session.flush()
+            order.total_amount = ingest(order, first)
+            db.session.commit()
+
+            order.edit_count += 1
+            order.total_amount += ingest(order, second, edit_round=order.edit_count)
+            db.session.commit()
+        statements += counter['count']
+    elapsed = time.perf_counter() - start
+    return statements / ORDERS, ORDERS / elapsed
+
+
+def main():
+    app = make_app()
+    with app.app_context():
+        menu_ids = [item_id for item_id, _ in seed_menu(categories=8, items_per_category=15)]
+        for name, ingest in (('per-key loop', legacy_lines), ('bulk', bulk_lines)):
+            per_order, rate = run(ingest, menu_ids, random.Random(3))
+            print(f"{name:>12}: {per_order:5.1f} statements per add+edit, {rate:7.1f} orders/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Query count and latency of ``order.list`` as the day's orders grow.
+
+Fails (exit code 1) if the number of SQL statements per page load grows
+with the number of orders, i.e. if the N+1 on items/menu items comes back.
+"""
+import random
+import sys
+from datetime import timedelta
+
+from sqlalchemy import insert
+
+from app.extensions import db
+from app.models.order import Order, OrderItem
+from app.services.date_window import DateWindow
+
+from ._common import count_queries, fmt, login, make_app, seed_menu, timed
+
+
+def add_orders(count, menu, lines=4, rnd=random.Random(7)):
+    start, _ = DateWindow.today().bounds
+    rows = Order.query.count()
+    orders, items = [], []
+    for n in range(count):
+        order_id = rows + n + 1
+        orders.append({'id': order_id, 'order_type': 'Dine-in', 'table_number': '4', 'status': 'Pending',
+                       'created_at': start + timedelta(minutes=n % 1400), 'total_amount': 0.0, 'edit_count': 0,
+                       'is_paid': False})
+        for dish_id, price in rnd.sample(menu, lines):
+            items.append({'order_id': order_id, 'menu_item_id': dish_id, 'quantity': 2,
+                          'price_at_time': price, 'added_after_edit': 0})
+    db.session.execute(insert(Order), orders)
+    db.session.execute(insert(OrderItem), items)
+    db.session.commit()
+
+
+def main():
+    app = make_app()
+    with app.app_context():
+        menu = seed_menu()
+    client = login(app)
+
+    counts = {}
+    for target in (10, 100, 300):
+        with app.app_context():
+            add_orders(target - Order.query.count(), menu)
+            with count_queries() as counter:
+                assert client.get('/orders/').status_code == 200
+            counts[target] = counter['count']
+        stats = timed(lambda: client.get('/orders/'), repeat=10)
+        print(f"{target:>4} orders: {counts[target]} queries  {fmt(stats)}")
+
+    if len(set(counts.values())) != 1:
+        print(f"FAIL: query count grows with orders: {counts}")
+        sys.exit(1)
+    print("OK: query count is constant")
+
+
+if __name__ == '__main__':
+    main()
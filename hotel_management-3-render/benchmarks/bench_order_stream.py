@@ -0,0 +1,97 @@
+"""Load test for the order SSE feed: how many screens one worker can hold.
+
+Starts the app on a threaded werkzeug server (one thread per screen, like
+gunicorn's gthread worker), opens N event-stream connections from a
+single selector loop, publishes order changes and measures how long it
+takes until every screen has the event, plus the worker's RSS.
+"""
+import logging
+import selectors
+import socket
+import statistics
+import threading
+import time
+
+from werkzeug.serving import make_server
+
+from app.extensions import db
+from app.models.order import Order, OrderItem
+from app.services.order_events import get_backend, publish_order_changed
+
+from ._common import login, make_app, seed_menu
+
+EVENTS = 20
+
+
+def rss_mb():
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith('VmRSS'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def open_screens(port, cookie, count, sel):
+    request = (f'GET /orders/stream HTTP/1.1\r\nHost: localhost\r\n'
+               f'Cookie: session={cookie}\r\nAccept: text/event-stream\r\n\r\n').encode()
+    for _ in range(count):
+        sock = socket.create_connection(('127.0.0.1', port))
+        sock.sendall(request)
+        sock.setblocking(False)
+        sel.register(sock, selectors.EVENT_READ, data={'buf': b''})
+
+
+def wait_for(sel, marker, count, timeout=30):
+    """Read until ``count`` sockets have seen ``marker``; return elapsed seconds."""
+    start = time.perf_counter()
+    seen = set()
+    while len(seen) < count and time.perf_counter() - start < timeout:
+        for key, _ in sel.select(timeout=1):
+            chunk = key.fileobj.recv(65536)
+            key.data['buf'] += chunk
+            if marker in key.data['buf']:
+                seen.add(key.fileobj)
+                key.data['buf'] = b''
+    return time.perf_counter() - start, len(seen)
+
+
+def main():
+    app = make_app()
+    with app.app_context():
+        dish_id, price = seed_menu(1, 3)[0]
+        order = Order(order_type='Dine-in', table_number='7', total_amount=price)
+        order.items.append(OrderItem(menu_item_id=dish_id, quantity=1, price_at_time=price))
+        db.session.add(order)
+        db.session.commit()
+        order_id = order.id
+    cookie = login(app).get_cookie('session').value
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_rss = rss_mb()
+
+    sel = selectors.DefaultSelector()
+    connected = 0
+    for target in (50, 200, 500, 1000):
+        open_screens(server.port, cookie, target - connected, sel)
+        wait_for(sel, b'retry:', target - connected)
+        connected = target
+        with app.app_context():
+            while get_backend().subscriber_count < connected:
+                time.sleep(0.05)
+            samples = []
+            for n in range(EVENTS):
+                publish_order_changed(order_id)
+                elapsed, got = wait_for(sel, b'event: order', connected)
+                samples.append(elapsed * 1000)
+        samples.sort()
+        print(f"{connected:>5} screens ({got} got last event): "
+              f"fan-out p50={statistics.median(samples):.1f}ms p95={samples[int(len(samples) * 0.95)]:.1f}ms "
+              f"threads={threading.active_count()} rss=+{rss_mb() - base_rss:.1f}MB")
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Bytes on the wire per page view, first visit and repeat visit.
+
+Renders a few pages as a logged-in admin and follows every stylesheet and
+script they reference. Local assets are fetched through the app with
+``Accept-Encoding: br, gzip`` and their Cache-Control is checked: an asset
+marked ``immutable`` costs nothing on a repeat visit, anything else costs a
+revalidation request. Third-party URLs (CDNs) can't be fetched here; they
+are counted as requests and listed, since each one is an extra DNS + TLS
+handshake for a tablet on bad Wi-Fi.
+
+HTML is reported raw and gzipped (what a compressing proxy would send).
+"""
+import gzip
+import re
+
+from ._common import login, make_app, seed_menu
+
+PAGES = ('/login', '/dashboard', '/orders/', '/menu/')
+REFERENCES = re.compile(r'<(?:link[^>]+href|script[^>]+src)="([^"]+)"')
+INLINE = re.compile(r'<(style|script)>(.*?)</\1>', re.S)
+
+
+def asset_info(client, url, cache):
+    """``(bytes, immutable)`` of one referenced asset; third-party ones are ``(None, False)``."""
+    if url not in cache:
+        if url.startswith('http'):
+            cache[url] = (None, False)
+        else:
+            response = client.get(url, headers={'Accept-Encoding': 'br, gzip'})
+            cache[url] = (len(response.data), 'immutable' in response.headers.get('Cache-Control', ''))
+    return cache[url]
+
+
+def main():
+    app = make_app()
+    with app.app_context():
+        seed_menu()
+    client = login(app)
+    anonymous = app.test_client()
+
+    cache = {}
+    print(f'  {"page":<12} {"html":>9} {"gzipped":>9} {"inline css/js":>14} {"new assets":>11} {"reqs":>5}'
+          f' {"3rd-party":>9} {"repeat view":>12}')
+    for page in PAGES:
+        html = (anonymous if page == '/login' else client).get(page).get_data(as_text=True)
+        raw = len(html.encode())
+        zipped = len(gzip.compress(html.encode(), 6))
+        inline = sum(len(body.encode()) for _, body in INLINE.findall(html))
+        urls = REFERENCES.findall(html)
+        new = [url for url in urls if url not in cache]
+        infos = {url: asset_info(client, url, cache) for url in urls}
+        asset_bytes = sum(infos[url][0] or 0 for url in new)
+        local_requests = sum(1 for url in new if infos[url][0] is not None)
+        third_party = [url for url in urls if infos[url][0] is None]
+        # Repeat view: HTML again + a revalidation (304) for every asset that isn't immutable
+        revalidations = sum(1 for url in urls if not infos[url][1])
+        repeat = f'{zipped / 1024:.1f}KB+{revalidations}r'
+        print(f'  {page:<12} {raw / 1024:8.1f}K {zipped / 1024:8.1f}K {inline / 1024:13.1f}K'
+              f' {asset_bytes / 1024:10.1f}K {local_requests:>5} {len(third_party):>9} {repeat:>12}')
+    external = sorted(url for url, (size, _) in cache.items() if size is None)
+    if external:
+        print('  third-party: ' + ', '.join(external))
+
+
+if __name__ == '__main__':
+    main()
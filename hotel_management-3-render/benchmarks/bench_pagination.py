@@ -0,0 +1,40 @@
+"""Bills list over a wide date range: whole range in one page vs keyset pages.
+
+Seeds a year of bills and times ``/billing/`` for a one-year range, first
+with every row on one page (what the list used to do), then the first page
+and a page deep into the range with the default page size.
+"""
+import re
+from datetime import timedelta
+
+from app.services.date_window import local_today
+
+from ._common import fmt, login, make_app, seed_year, timed
+
+
+def main():
+    app = make_app()
+    with app.app_context():
+        rows = seed_year()
+        today = local_today()
+    client = login(app)
+    year = f'/billing/?start_date={today - timedelta(days=365)}&end_date={today}'
+
+    everything = timed(lambda: client.get(f'{year}&per_page=500'), repeat=3)
+    first = timed(lambda: client.get(year), repeat=10)
+
+    # ~100 pages aage chalo, phir wahan ka page time karo
+    url = year
+    for _ in range(100):
+        cursor = re.search(r'cursor=([\w-]+)', client.get(url).get_data(as_text=True)).group(1)
+        url = f'{year}&cursor={cursor}'
+    deep = timed(lambda: client.get(url), repeat=10)
+
+    print(f"{rows} bills in range")
+    print(f"  500 rows/page  {fmt(everything)}")
+    print(f"  first page     {fmt(first)}")
+    print(f"  page 101       {fmt(deep)}")
+
+
+if __name__ == '__main__':
+    main()
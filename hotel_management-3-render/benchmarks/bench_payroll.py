@@ -0,0 +1,73 @@
+"""Payroll for 1,000 employees x 31 days of attendance.
+
+"per employee" is what opening each employee's attendance page did: load
+the month's rows and count statuses in Python, once per employee. The
+payroll module does the whole month in one grouped query, and a closed
+month is read back from its snapshot.
+"""
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import insert
+
+from app.extensions import db
+from app.models.attendance import Attendance, AttendanceStatus
+from app.models.employee import Employee, EmployeeRole
+from app.services import payroll
+from app.services.money import PAISE
+
+from ._common import count_queries, fmt, make_app, timed
+
+EMPLOYEES = 1000
+MONTH = date(2025, 1, 1)  # 31 din, aur closed
+
+
+def per_employee(month):
+    month_end = payroll.month_end(month)
+    result = []
+    for employee in Employee.query.all():
+        rows = Attendance.query.filter_by(employee_id=employee.id)\
+            .filter(Attendance.date.between(month, month_end)).all()
+        present = sum(1 for a in rows if a.status == AttendanceStatus.PRESENT)
+        half = sum(1 for a in rows if a.status == AttendanceStatus.HALF_DAY)
+        days_worked = present + Decimal(half) / 2
+        result.append((employee.id, (days_worked * (employee.salary / 30)).quantize(PAISE)))
+    db.session.expunge_all()
+    return result
+
+
+def main():
+    rnd = random.Random(3)
+    app = make_app()
+    with app.app_context():
+        db.session.execute(insert(Employee), [
+            {'name': f'Staff {n:04d}', 'age': 30, 'salary': rnd.randint(12000, 40000),
+             'role': EmployeeRole.WAITER, 'hire_date': date(2020, 1, 1)} for n in range(EMPLOYEES)
+        ])
+        statuses = list(AttendanceStatus)
+        db.session.execute(insert(Attendance), [
+            {'employee_id': emp, 'date': MONTH + timedelta(days=d), 'status': rnd.choice(statuses)}
+            for emp in range(1, EMPLOYEES + 1) for d in range(31)
+        ])
+        db.session.commit()
+
+        old = dict(per_employee(MONTH))
+        new = {line.employee_id: line.pay for line in payroll.compute(MONTH)}
+        assert old == new
+
+        with count_queries() as old_q:
+            per_employee(MONTH)
+        with count_queries() as new_q:
+            payroll.compute(MONTH)
+        print(f'{EMPLOYEES} employees x 31 days ({EMPLOYEES * 31} rows)')
+        print(f'  per employee  {old_q["count"]:>5} queries  {fmt(timed(lambda: per_employee(MONTH), repeat=3))}')
+        print(f'  grouped query {new_q["count"]:>5} queries  {fmt(timed(lambda: payroll.compute(MONTH), repeat=10))}')
+
+        payroll.run(MONTH)  # snapshot banao
+        snap = timed(lambda: payroll.run(MONTH), repeat=10)
+        print(f'  snapshot read               {fmt(snap)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""Concurrent payments: old three-commit mark_paid vs settle_order.
+
+Fires parallel payments at the same order (double-click / two cashiers)
+and at many different orders, then checks every paid order has exactly
+one bill and one finance inflow.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from sqlalchemy import func, insert
+
+from app.extensions import db
+from app.models.billing import Bill
+from app.models.finance import FinanceTransaction
+from app.models.order import Order
+from app.services.settlement import settle_order
+
+from ._common import make_app
+
+THREADS = 8
+
+
+def legacy_pay(order_id, payment_mode, key=None):
+    """order_routes.mark_paid before settlement.py (minus the HTTP bits)."""
+    order = db.session.get(Order, order_id)
+    if order.is_paid:
+        return
+    order.is_paid = True
+    order.paid_at = datetime.now(timezone.utc)
+    order.status = 'Paid'
+    db.session.commit()
+    bill = Bill.query.filter_by(order_id=order.id).first()
+    if not bill:
+        bill = Bill(order_id=order.id, total_items=order.total_amount, gst=0, service_charge=0,
+                    grand_total=order.total_amount, payment_mode=payment_mode)
+        db.session.add(bill)
+        db.session.commit()
+        db.session.add(FinanceTransaction(type='Inflow', amount=bill.grand_total,
+                                          description=f'{payment_mode} payment for Order #{order.id}'))
+        db.session.commit()
+
+
+def reset(app, orders):
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        db.session.execute(insert(Order), [
+            {'id': i, 'order_type': 'Parcel', 'customer_name': 'x', 'status': 'Served', 'total_amount': 100.0,
+             'edit_count': 0, 'is_paid': False} for i in range(1, orders + 1)
+        ])
+        db.session.commit()
+
+
+def fire(app, pay, jobs):
+    errors = []
+    lock = threading.Lock()
+
+    def run(job):
+        order_id, key = job
+        with app.app_context():
+            try:
+                pay(order_id, 'Cash', key)
+            except Exception as e:
+                db.session.rollback()
+                with lock:
+                    errors.append(type(e).__name__)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(THREADS) as pool:
+        list(pool.map(run, jobs))
+    return time.perf_counter() - start, errors
+
+
+def check(app, orders):
+    with app.app_context():
+        bills = dict(db.session.execute(db.select(Bill.order_id, func.count()).group_by(Bill.order_id)).all())
+        inflows = db.session.execute(db.select(func.count()).select_from(FinanceTransaction)).scalar()
+        paid = db.session.execute(db.select(func.count()).where(Order.is_paid.is_(True))).scalar()
+    paid_without_bill = paid - len(bills)
+    duplicate_bills = sum(n - 1 for n in bills.values())
+    return f"paid={paid}/{orders} bills={sum(bills.values())} inflows={inflows} " \
+           f"paid_without_bill={paid_without_bill} duplicate_bills={duplicate_bills}"
+
+
+def main():
+    app = make_app()
+    for name, pay in (('legacy', legacy_pay), ('settle', settle_order)):
+        reset(app, 1)
+        elapsed, errors = fire(app, pay, [(1, f'click-{n % 2}') for n in range(50)])
+        print(f"{name:>6} same order x50:   {elapsed:.2f}s errors={len(errors)} {check(app, 1)}")
+
+        reset(app, 500)
+        jobs = [(i, f'pay-{i}') for i in range(1, 501)] * 2
+        elapsed, errors = fire(app, pay, jobs)
+        print(f"{name:>6} 500 orders x2:   {len(jobs) / elapsed:.0f} payments/s errors={len(errors)} {check(app, 500)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""SQLite rollback journal vs WAL under concurrent readers and a writer.
+
+Four reader threads load the orders page while one writer thread places
+orders through ``order.add``, for a few seconds each way, and requests/s
+and failed requests are reported for both. Threads share the GIL, so the
+gap here is smaller than between gunicorn processes, where a rollback
+journal write locks every reader out.
+"""
+import threading
+import time
+
+from app import create_app
+from app.extensions import db
+
+from ._common import BenchConfig, login, make_app, seed_menu, seed_year
+
+READERS = 4
+SECONDS = 5
+
+
+class RollbackJournalConfig(BenchConfig):
+    SQLITE_WAL = False
+
+
+def hammer(app, item_ids):
+    counts = {'reads': 0, 'writes': 0, 'errors': 0}
+    lock = threading.Lock()
+
+    def reader(client):
+        while time.perf_counter() < stop:
+            ok = client.get('/orders/').status_code == 200
+            with lock:
+                counts['reads' if ok else 'errors'] += 1
+
+    def writer(client):
+        tick = 0
+        while time.perf_counter() < stop:
+            tick += 1
+            form = {'order_type': 'Dine-in', 'table_number': str(tick % 20 + 1),
+                    f'qty_{item_ids[tick % len(item_ids)]}': '2'}
+            ok = client.post('/orders/add', data=form).status_code == 302
+            with lock:
+                counts['writes' if ok else 'errors'] += 1
+
+    # Users pehle bana lo (threads mein login() race karega); har client ka alag
+    # username, warna per-username login throttle lag jata hai
+    readers = [login(app, 'CASHIER', username=f'bench_reader{i}') for i in range(READERS)]
+    threads = [threading.Thread(target=reader, args=(client,)) for client in readers]
+    threads.append(threading.Thread(target=writer, args=(login(app, 'WAITER'),)))
+    stop = time.perf_counter() + SECONDS
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return counts
+
+
+def main():
+    app = make_app()
+    with app.app_context():
+        seed_year(orders_per_day=100, days=30)
+        item_ids = [item_id for item_id, _ in seed_menu()]
+        engine = db.engine
+    engine.dispose()
+    for label, config in (('rollback journal', RollbackJournalConfig), ('WAL', BenchConfig)):
+        app = create_app(config)
+        with app.app_context():
+            # journal_mode file mein persist hota hai; WAL se wapas aane ke liye explicitly set karo
+            db.session.execute(db.text('PRAGMA journal_mode = ' + ('WAL' if config.SQLITE_WAL else 'DELETE')))
+            db.session.commit()
+            engine = db.engine
+        counts = hammer(app, item_ids)
+        engine.dispose()
+        print(f'  {label:<17} reads {counts["reads"] / SECONDS:7.1f}/s  writes {counts["writes"] / SECONDS:6.1f}/s  '
+              f'errors {counts["errors"]}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""Cold start: import + create_app() + first request, in fresh processes.
+
+Each run is a new ``python -X importtime`` process (local profile, SQLite),
+so nothing is cached in memory. Reports median import / create_app / first
+and second request times cold, with WARMUP_ON_START, and with warm-up plus
+a pre-filled TEMPLATE_CACHE_DIR; the slowest imports from the
+``-X importtime`` log; and whether ReportLab got loaded (it should only be
+imported when a PDF is actually rendered).
+
+``STARTUP_BUDGET_MS`` (default 1500) is the budget for import + create_app;
+the script exits with 1 when the median goes over it.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+
+RUNS = 5
+BUDGET_MS = float(os.getenv('STARTUP_BUDGET_MS', 1500))
+
+CHILD = r'''
+import json, sys, time
+start = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+app = create_app()
+created = time.perf_counter()
+client = app.test_client()
+client.get('/login')
+first = time.perf_counter()
+client.get('/login')
+second = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'create_app_ms': (created - imported) * 1000,
+    'first_request_ms': (first - created) * 1000,
+    'second_request_ms': (second - first) * 1000,
+    'reportlab_loaded': 'reportlab' in sys.modules,
+}))
+'''
+
+
+def parse_importtime(stderr):
+    """``{module: cumulative_us}`` for every module in an ``-X importtime`` log."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = (part.strip() for part in line[len('import time:'):].split('|'))
+        modules[name] = int(cumulative_us)
+    return modules
+
+
+def run_once(env):
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CHILD],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1]), parse_importtime(result.stderr)
+
+
+def main():
+    db_path = os.path.join(tempfile.gettempdir(), 'hotel_startup.db')
+    base_env = dict(os.environ, APP_ENV='local', DATABASE_URL=f'sqlite:///{db_path}')
+    # Tables ek baar bana lo taaki har run mein create_all na gine
+    subprocess.run([sys.executable, '-c', 'from app import create_app; create_app()'],
+                   cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                   env=dict(base_env, AUTO_CREATE_TABLES='1'), check=True)
+
+    over_budget = False
+    slowest = defaultdict(list)
+    template_cache = tempfile.mkdtemp(prefix='hotel_jinja_')
+    variants = (
+        ('cold', {'WARMUP_ON_START': '0'}),
+        ('warm-up on start', {'WARMUP_ON_START': '1'}),
+        ('+ template cache', {'WARMUP_ON_START': '1', 'TEMPLATE_CACHE_DIR': template_cache}),
+    )
+    for label, extra in variants:
+        env = dict(base_env, AUTO_CREATE_TABLES='0', **extra)
+        if 'TEMPLATE_CACHE_DIR' in extra:
+            run_once(env)  # cache bharo, jaise build step mein `flask compile-templates`
+        warmup = extra['WARMUP_ON_START']
+        runs = []
+        for _ in range(RUNS):
+            timings, modules = run_once(env)
+            runs.append(timings)
+            if warmup == '0':
+                for name, cumulative in modules.items():
+                    slowest[name].append(cumulative)
+        median = {key: statistics.median(run[key] for run in runs) for key in runs[0] if key.endswith('_ms')}
+        startup = median['import_ms'] + median['create_app_ms']
+        print(f'  {label:<17} import {median["import_ms"]:6.0f}ms  create_app {median["create_app_ms"]:6.0f}ms  '
+              f'first request {median["first_request_ms"]:5.0f}ms  second {median["second_request_ms"]:4.0f}ms  '
+              f'reportlab loaded: {"yes" if any(run["reportlab_loaded"] for run in runs) else "no"}')
+        if warmup == '0' and startup > BUDGET_MS:
+            over_budget = True
+
+    print('  slowest imports (median cumulative):')
+    top = sorted(((statistics.median(values), name) for name, values in slowest.items()), reverse=True)
+    shown = 0
+    for cumulative, name in top:
+        if '.' in name and not name.startswith('app.'):
+            continue  # submodules are inside their package's number
+        print(f'    {name:<40} {cumulative / 1000:7.1f}ms')
+        shown += 1
+        if shown == 12:
+            break
+
+    print(f'  budget {BUDGET_MS:.0f}ms for import + create_app: {"OVER" if over_budget else "ok"}')
+    return 1 if over_budget else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
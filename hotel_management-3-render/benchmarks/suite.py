@@ -0,0 +1,240 @@
+"""Benchmark suite: the app's hot routes against a seeded restaurant.
+
+Seeds the bench database with ``app.services.seed`` (a year of orders by
+default), then drives real routes through the Flask test client, logged in
+as the seeded users, and reports latency percentiles and SQL statements per
+request for each scenario::
+
+    python -m benchmarks.suite                       # run and print
+    python -m benchmarks.suite --save before         # also write benchmarks/baselines/before.json
+    python -m benchmarks.suite --compare before      # diff against a saved baseline
+    python -m benchmarks.suite --only order. --reuse # some scenarios, keep the seeded DB
+
+Query counts barely move between runs (only the periodic identity cache
+check adds a fraction), so half a query more per request is a regression;
+latencies depend on the machine and are flagged past ``--threshold``
+percent. ``--compare`` exits with 1 when something
+regressed. Baselines are plain sorted JSON so they diff well in git.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import timedelta
+
+from sqlalchemy import event
+
+from app import create_app
+from app.extensions import db
+from app.models.menu import MenuItem
+from app.models.order import Order
+from app.services import seed as seeding
+from app.services.date_window import local_today
+
+from ._common import BenchConfig
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), 'baselines')
+PASSWORD = 'seed123'
+
+
+class Scenario:
+    """``method url`` as ``role``; ``data(ctx)`` builds the form, ``url`` may be callable(ctx)."""
+
+    def __init__(self, name, role, url, method='GET', data=None, repeat=50, expect=(200,)):
+        self.name = name
+        self.role = role
+        self.url = url
+        self.method = method
+        self.data = data
+        self.repeat = repeat
+        self.expect = expect
+
+
+def _new_order(ctx):
+    ids = ctx['menu_ids']
+    ctx['tick'] += 1
+    form = {'order_type': 'Dine-in', 'table_number': str(ctx['tick'] % 20 + 1)}
+    for offset in range(3):
+        form[f'qty_{ids[(ctx["tick"] + offset) % len(ids)]}'] = '1'
+    return form
+
+
+def _next_unpaid(ctx):
+    return f'/orders/mark_paid/{ctx["unpaid"].pop()}'
+
+
+SCENARIOS = [
+    Scenario('auth.login_page', None, '/login'),
+    Scenario('order.list', 'cashier', '/orders/'),
+    Scenario('order.list[month]', 'cashier', lambda ctx: f'/orders/?{ctx["month"]}'),
+    Scenario('order.add[form]', 'waiter', '/orders/add'),
+    Scenario('order.add', 'waiter', '/orders/add', method='POST', data=_new_order, expect=(302,)),
+    Scenario('order.mark_paid', 'cashier', _next_unpaid, method='POST',
+             data=lambda ctx: {'payment_mode': 'Cash'}, expect=(302,)),
+    Scenario('api.orders', 'waiter', '/api/orders'),
+    Scenario('billing.list', 'cashier', '/billing/'),
+    Scenario('billing.list[month]', 'cashier', lambda ctx: f'/billing/?{ctx["month"]}'),
+    Scenario('report.dashboard', 'manager', '/reports/dashboard'),
+    Scenario('report.dashboard[month]', 'manager', lambda ctx: f'/reports/dashboard?{ctx["month"]}'),
+    Scenario('dashboard', 'admin', '/dashboard'),
+    Scenario('menu.list', 'manager', '/menu/'),
+    Scenario('inventory.list', 'manager', '/inventory/'),
+    Scenario('inventory.view_all', 'manager', '/inventory/view_all'),
+    Scenario('employee.list', 'manager', '/employees/'),
+    Scenario('employee.attendance', 'manager', '/employees/attendance'),
+    Scenario('employee.payroll_run', 'manager', '/employees/payroll'),
+    Scenario('attendance.day', 'manager', '/attendance/day'),
+]
+
+
+def percentile(samples, pct):
+    return samples[min(len(samples) - 1, int(round(len(samples) * pct / 100.0)) - 1)]
+
+
+def run_scenario(engine, client, scenario, ctx):
+    queries = {'count': 0}
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        queries['count'] += 1
+
+    def call():
+        url = scenario.url(ctx) if callable(scenario.url) else scenario.url
+        data = scenario.data(ctx) if scenario.data else None
+        response = client.open(url, method=scenario.method, data=data)
+        if response.status_code not in scenario.expect:
+            raise RuntimeError(f'{scenario.name}: {scenario.method} {url} -> {response.status_code}')
+        return response
+
+    call()  # warm-up: caches, templates, first connection
+    samples = []
+    event.listen(engine, 'before_cursor_execute', _count)
+    try:
+        for _ in range(scenario.repeat):
+            start = time.perf_counter()
+            call()
+            samples.append((time.perf_counter() - start) * 1000)
+    finally:
+        event.remove(engine, 'before_cursor_execute', _count)
+    samples.sort()
+    return {
+        'p50_ms': round(statistics.median(samples), 2),
+        'p95_ms': round(percentile(samples, 95), 2),
+        'p99_ms': round(percentile(samples, 99), 2),
+        'max_ms': round(samples[-1], 2),
+        'queries': round(queries['count'] / scenario.repeat, 2),
+    }
+
+
+def prepare(app, args):
+    with app.app_context():
+        if not args.reuse or seeding.is_empty():
+            db.drop_all()
+            db.create_all()
+            print(f'Seeding {args.days} days x ~{args.orders_per_day} orders/day ...', file=sys.stderr)
+            start = time.perf_counter()
+            seeding.seed(days=args.days, orders_per_day=args.orders_per_day, password=PASSWORD,
+                         progress=lambda message: print('  ' + message, file=sys.stderr))
+            print(f'  seeded in {time.perf_counter() - start:.1f}s', file=sys.stderr)
+        menu_ids = [item_id for (item_id,) in db.session.query(MenuItem.id).filter(MenuItem.available.is_(True))]
+        today = local_today()
+        engine = db.engine
+    month = f'start_date={today - timedelta(days=30)}&end_date={today}'
+    return engine, {'menu_ids': menu_ids, 'month': month, 'tick': 0, 'unpaid': []}
+
+
+def run(args):
+    app = create_app(BenchConfig)
+    engine, ctx = prepare(app, args)
+
+    clients = {}
+    results = {}
+    # Requests app context ke bahar: andar chalein to flask-login g._login_user share kar leta hai
+    for scenario in SCENARIOS:
+        if args.only and not any(scenario.name.startswith(prefix) for prefix in args.only):
+            continue
+        if scenario.name == 'order.mark_paid':
+            with app.app_context():
+                ctx['unpaid'] = [order_id for (order_id,) in db.session.query(Order.id)
+                                 .filter(Order.is_paid.is_(False)).order_by(Order.id.desc())
+                                 .limit(scenario.repeat + 1)]
+            if len(ctx['unpaid']) <= scenario.repeat:
+                print(f'  {scenario.name}: skipped, not enough unpaid orders', file=sys.stderr)
+                continue
+        if scenario.role not in clients:
+            client = app.test_client()
+            if scenario.role:
+                response = client.post('/login', data={'username': scenario.role, 'password': PASSWORD})
+                assert response.status_code == 302, f'login as {scenario.role} failed'
+            clients[scenario.role] = client
+        results[scenario.name] = run_scenario(engine, clients[scenario.role], scenario, ctx)
+        print(format_row(scenario.name, results[scenario.name]))
+    return {
+        'dataset': {'days': args.days, 'orders_per_day': args.orders_per_day, 'database': engine.dialect.name},
+        'results': results,
+    }
+
+
+def format_row(name, row):
+    return (f'  {name:<26} p50={row["p50_ms"]:>8.2f}ms p95={row["p95_ms"]:>8.2f}ms '
+            f'p99={row["p99_ms"]:>8.2f}ms  queries={row["queries"]:g}')
+
+
+def compare(current, baseline, threshold):
+    """Print per-scenario deltas; returns the names that regressed."""
+    if current['dataset'] != baseline['dataset']:
+        print(f'  note: dataset differs (baseline {baseline["dataset"]}, now {current["dataset"]})')
+    regressed = []
+    for name, now in current['results'].items():
+        before = baseline['results'].get(name)
+        if before is None:
+            print(f'  {name:<26} new')
+            continue
+        change = (now['p50_ms'] - before['p50_ms']) / before['p50_ms'] * 100 if before['p50_ms'] else 0.0
+        flags = []
+        if now['queries'] - before['queries'] >= 0.5:
+            flags.append(f'queries {before["queries"]:g} -> {now["queries"]:g}')
+        if change > threshold:
+            flags.append(f'p50 +{change:.0f}%')
+        if flags:
+            regressed.append(name)
+        print(f'  {name:<26} p50 {before["p50_ms"]:>8.2f} -> {now["p50_ms"]:>8.2f}ms ({change:+.0f}%)  '
+              f'queries {before["queries"]:g} -> {now["queries"]:g}' + ('  REGRESSED: ' + ', '.join(flags) if flags else ''))
+    return regressed
+
+
+def baseline_path(name):
+    return name if name.endswith('.json') else os.path.join(BASELINE_DIR, f'{name}.json')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--orders-per-day', type=int, default=120)
+    parser.add_argument('--reuse', action='store_true', help='Keep an already seeded bench database')
+    parser.add_argument('--only', action='append', help='Scenario name prefix (repeatable)')
+    parser.add_argument('--save', metavar='NAME', help='Write the results as baseline NAME')
+    parser.add_argument('--compare', metavar='NAME', help='Diff against baseline NAME')
+    parser.add_argument('--threshold', type=float, default=20, help='p50 slowdown %% counted as a regression')
+    args = parser.parse_args(argv)
+
+    current = run(args)
+    if args.save:
+        path = baseline_path(args.save)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f'Baseline written to {path}')
+    if args.compare:
+        with open(baseline_path(args.compare)) as f:
+            baseline = json.load(f)
+        print(f'Compared with {args.compare}:')
+        if compare(current, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,30 @@
+"""date indexes
+
+Index the date columns the list and report filters range-scan
+(services/date_window).
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 12:20:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+DATE_COLUMNS = [('order', 'created_at'), ('bill', 'generated_at'), ('expense', 'date'), ('finance_transaction', 'date')]
+
+
+def upgrade():
+    for table, column in DATE_COLUMNS:
+        op.create_index(op.f(f'ix_{table}_{column}'), table, [column], unique=False)
+
+
+def downgrade():
+    for table, column in reversed(DATE_COLUMNS):
+        op.drop_index(op.f(f'ix_{table}_{column}'), table_name=table)
@@ -0,0 +1,34 @@
+"""order updated_at
+
+order.updated_at drives the API ETags and ?updated_since. Existing orders
+get their created_at (they were never edited after it as far as we know).
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 12:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('order', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_order_updated_at'), ['updated_at'], unique=False)
+
+    order = sa.table('order', sa.column('created_at', sa.DateTime()), sa.column('updated_at', sa.DateTime()))
+    op.execute(order.update().where(order.c.updated_at.is_(None)).values(updated_at=order.c.created_at))
+
+
+def downgrade():
+    with op.batch_alter_table('order', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_order_updated_at'))
+        batch_op.drop_column('updated_at')
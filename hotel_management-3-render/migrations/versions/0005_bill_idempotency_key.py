@@ -0,0 +1,30 @@
+"""bill idempotency key
+
+The Pay button's token: a replayed settlement finds its bill by it.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 12:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('bill', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('idempotency_key', sa.String(length=64), nullable=True))
+        batch_op.create_unique_constraint('uq_bill_idempotency_key', ['idempotency_key'])
+
+
+def downgrade():
+    with op.batch_alter_table('bill', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_bill_idempotency_key', type_='unique')
+        batch_op.drop_column('idempotency_key')
@@ -0,0 +1,35 @@
+"""daily sales rollup
+
+One row per business day for the dashboards. The table starts empty:
+run ``flask rebuild-daily-sales`` once after upgrading to fill past days.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 12:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('daily_sales',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('order_count', sa.Integer(), nullable=False),
+    sa.Column('bill_count', sa.Integer(), nullable=False),
+    sa.Column('cash_revenue', sa.Float(), nullable=False),
+    sa.Column('online_revenue', sa.Float(), nullable=False),
+    sa.Column('total_revenue', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('day')
+    )
+
+
+def downgrade():
+    op.drop_table('daily_sales')
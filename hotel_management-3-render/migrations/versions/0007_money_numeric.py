@@ -0,0 +1,57 @@
+"""money as numeric
+
+Float money columns become NUMERIC(10, 2) (daily totals NUMERIC(12, 2)),
+rounded to paise. SQLite rebuilds the tables (batch mode); PostgreSQL
+converts in place.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 12:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+MONEY_COLUMNS = {
+    'order': ['total_amount'],
+    'order_item': ['price_at_time'],
+    'menu_item': ['price'],
+    'employee': ['salary'],
+    'finance_transaction': ['amount'],
+    'bill': ['total_items', 'gst', 'service_charge', 'grand_total'],
+}
+DAILY_COLUMNS = ['cash_revenue', 'online_revenue', 'total_revenue']
+
+
+def _convert(table, columns, type_, existing_type):
+    with op.batch_alter_table(table, schema=None) as batch_op:
+        for column in columns:
+            batch_op.alter_column(column, type_=type_, existing_type=existing_type,
+                                  postgresql_using=f'round({column}::numeric, 2)')
+    if op.get_bind().dialect.name != 'postgresql':
+        # SQLite purani REAL values hi copy karta hai; paise tak round yahan
+        rows = sa.table(table, *(sa.column(column) for column in columns))
+        op.execute(rows.update().values({column: sa.func.round(rows.c[column], 2) for column in columns}))
+
+
+def upgrade():
+    for table, columns in MONEY_COLUMNS.items():
+        _convert(table, columns, sa.Numeric(precision=10, scale=2), sa.Float())
+    _convert('daily_sales', DAILY_COLUMNS, sa.Numeric(precision=12, scale=2), sa.Float())
+
+
+def downgrade():
+    for table, columns in MONEY_COLUMNS.items():
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            for column in columns:
+                batch_op.alter_column(column, type_=sa.Float(), existing_type=sa.Numeric(precision=10, scale=2))
+    with op.batch_alter_table('daily_sales', schema=None) as batch_op:
+        for column in DAILY_COLUMNS:
+            batch_op.alter_column(column, type_=sa.Float(), existing_type=sa.Numeric(precision=12, scale=2))
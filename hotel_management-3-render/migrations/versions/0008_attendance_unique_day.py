@@ -0,0 +1,30 @@
+"""unique attendance per day
+
+One attendance row per (employee, date). Duplicates from the old form
+are dropped first, keeping the latest entry of each day.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 12:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    attendance = sa.table('attendance', sa.column('id'), sa.column('employee_id'), sa.column('date'))
+    keep = sa.select(sa.func.max(attendance.c.id)).group_by(attendance.c.employee_id, attendance.c.date)
+    op.execute(attendance.delete().where(attendance.c.id.not_in(keep)))
+    op.create_index('ix_attendance_employee_date', 'attendance', ['employee_id', 'date'], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_attendance_employee_date', table_name='attendance')
@@ -0,0 +1,37 @@
+"""payroll snapshots
+
+Computed payroll of closed months, one row per employee.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 12:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('payroll_snapshot',
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('employee_id', sa.Integer(), nullable=False),
+    sa.Column('present_days', sa.Integer(), nullable=False),
+    sa.Column('half_days', sa.Integer(), nullable=False),
+    sa.Column('absent_days', sa.Integer(), nullable=False),
+    sa.Column('monthly_salary', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('pay', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('computed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['employee_id'], ['employee.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('month', 'employee_id')
+    )
+
+
+def downgrade():
+    op.drop_table('payroll_snapshot')
@@ -0,0 +1,112 @@
+"""numeric inventory stock
+
+Stock as numbers (services/stock): the item's balance, unit and total
+spend, and a running balance on every ledger entry. The numbers are
+rebuilt from the old quantity strings; an entry that can't be read in the
+item's unit counts as 0 and is logged.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 12:20:00.000000
+
+"""
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.stock import format_quantity, parse_quantity
+
+log = logging.getLogger('alembic.runtime.migration')
+
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+QUANTITY = sa.Numeric(precision=12, scale=3)
+AMOUNT = sa.Numeric(precision=12, scale=2)
+
+
+def upgrade():
+    with op.batch_alter_table('inventory', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('quantity', QUANTITY, nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('unit', sa.String(length=10), nullable=False, server_default='pcs'))
+        batch_op.add_column(sa.Column('total_spent', AMOUNT, nullable=False, server_default='0'))
+    with op.batch_alter_table('expense', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('quantity', QUANTITY, nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('unit', sa.String(length=10), nullable=False, server_default='pcs'))
+        batch_op.add_column(sa.Column('balance_quantity', QUANTITY, nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('balance_spent', AMOUNT, nullable=False, server_default='0'))
+    rebuild_balances(op.get_bind())
+
+
+def rebuild_balances(connection):
+    inventory = sa.table(
+        'inventory', sa.column('item_id', sa.Integer()), sa.column('item_name', sa.String()),
+        sa.column('quantity_with_unit', sa.String()), sa.column('quantity', QUANTITY),
+        sa.column('unit', sa.String()), sa.column('total_spent', AMOUNT),
+    )
+    expense = sa.table(
+        'expense', sa.column('expense_id', sa.Integer()), sa.column('item_id', sa.Integer()),
+        sa.column('added_quantity_with_unit', sa.String()), sa.column('payment_amount', AMOUNT),
+        sa.column('date', sa.DateTime()), sa.column('quantity', QUANTITY), sa.column('unit', sa.String()),
+        sa.column('balance_quantity', QUANTITY), sa.column('balance_spent', AMOUNT),
+    )
+    items = skipped = 0
+    for item in connection.execute(sa.select(inventory).order_by(inventory.c.item_id)).all():
+        expenses = connection.execute(
+            sa.select(expense).where(expense.c.item_id == item.item_id)
+            .order_by(expense.c.date, expense.c.expense_id)
+        ).all()
+        # Unit: pehli parse hone wali entry se (ya item ki string se)
+        unit = None
+        for text in [e.added_quantity_with_unit for e in expenses] + [item.quantity_with_unit]:
+            try:
+                unit = parse_quantity(text)[1]
+                break
+            except ValueError:
+                continue
+        unit = unit or 'pcs'
+
+        balance, spent = 0, 0
+        for entry in expenses:
+            try:
+                quantity, entry_unit = parse_quantity(entry.added_quantity_with_unit)
+                if entry_unit != unit:
+                    raise ValueError(entry_unit)
+            except ValueError:
+                quantity = 0
+                skipped += 1
+                log.warning('expense #%s (%s): could not read %r as %s, counted as 0',
+                            entry.expense_id, item.item_name, entry.added_quantity_with_unit, unit)
+            balance += quantity
+            spent += entry.payment_amount
+            connection.execute(
+                expense.update().where(expense.c.expense_id == entry.expense_id)
+                .values(quantity=quantity, unit=unit, balance_quantity=balance, balance_spent=spent)
+            )
+
+        if not expenses:
+            try:
+                balance = parse_quantity(item.quantity_with_unit)[0]
+            except ValueError:
+                skipped += 1
+        connection.execute(
+            inventory.update().where(inventory.c.item_id == item.item_id)
+            .values(quantity=balance, unit=unit, total_spent=spent,
+                    quantity_with_unit=format_quantity(balance, unit))
+        )
+        items += 1
+    log.info('%d inventory items migrated, %d quantities could not be read', items, skipped)
+
+
+def downgrade():
+    with op.batch_alter_table('expense', schema=None) as batch_op:
+        for column in ('balance_spent', 'balance_quantity', 'unit', 'quantity'):
+            batch_op.drop_column(column)
+    with op.batch_alter_table('inventory', schema=None) as batch_op:
+        for column in ('total_spent', 'unit', 'quantity'):
+            batch_op.drop_column(column)
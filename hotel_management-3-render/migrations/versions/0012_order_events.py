@@ -0,0 +1,35 @@
+"""order events
+
+Order change feed shared by all workers for the SSE streams
+(services/order_events.DatabaseBackend).
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18 12:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0012'
+down_revision = '0011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('order_event',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_order_event_created_at'), 'order_event', ['created_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_order_event_created_at'), table_name='order_event')
+    op.drop_table('order_event')
@@ -0,0 +1,26 @@
+"""expense item date index
+
+Composite index for the per-item history, latest entry and totals
+(services/stock.item_summaries).
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-18 12:20:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0013'
+down_revision = '0012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_expense_item_date', 'expense', ['item_id', 'date'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_expense_item_date', table_name='expense')